@@ -1,8 +1,26 @@
 import os
 import json
+import gzip
 import Deadline.Events
 
 
+def load_dump(path):
+    """Read publish dump file, see `reveries.filesys.dump`"""
+    if path.endswith(".json.gz"):
+        with gzip.open(path, "rb") as file:
+            return json.loads(file.read().decode("utf-8"))
+
+    elif path.endswith(".msgpack"):
+        import msgpack
+
+        with open(path, "rb") as file:
+            return msgpack.unpack(file, raw=False)
+
+    else:
+        with open(path, "r") as file:
+            return json.load(file)
+
+
 def GetDeadlineEventListener():
     return AvalonJobProgressDelete()
 
@@ -47,16 +65,14 @@ class AvalonJobProgressDelete(Deadline.Events.DeadlineEventListener):
         if not os.path.isfile(dumpfile):
             raise Exception("Instance dump file not found: %s" % dumpfile)
 
-        with open(dumpfile, "r") as file:
-            instance_dump = json.load(file)
+        instance_dump = load_dump(dumpfile)
 
         dumpfile = instance_dump["contextDump"]
 
         if not os.path.isfile(dumpfile):
             raise Exception("Context dump file not found: %s" % dumpfile)
 
-        with open(dumpfile, "r") as file:
-            context_dump = json.load(file)
+        context_dump = load_dump(dumpfile)
 
         for instance in context_dump["instances"]:
             if instance["id"] == instance_dump["id"]:
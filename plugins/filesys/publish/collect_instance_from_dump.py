@@ -1,14 +1,17 @@
 
 import os
-import json
 import pyblish.api
+from reveries.filesys import dump as dumping
 
 
 class CollectInstancesFromDump(pyblish.api.ContextPlugin):
     """Create instances from context/instance dump file
 
-    Update context and create instances from a JSON format dump file which
-    acquired from `sys.argv[1]`.
+    Update context and create instances from a dump file which acquired
+    from `sys.argv[1]`.
+
+    If given an instance dump, only that instance and its children will be
+    loaded from the context dump index, other instance dumps are not read.
 
     """
 
@@ -24,7 +27,7 @@ class CollectInstancesFromDump(pyblish.api.ContextPlugin):
 
         dump_file = os.path.basename(dump_path)
 
-        if not dump_file.endswith(".json"):
+        if not dumping.is_dump(dump_file):
             raise Exception("Invalid file extension: %s" % dump_path)
 
         if dump_file.startswith(".instance."):
@@ -38,61 +41,70 @@ class CollectInstancesFromDump(pyblish.api.ContextPlugin):
 
     def parse_instance(self, context, dump_path):
 
-        with open(dump_path, "r") as file:
-            dump = json.load(file)
-        context = self.parse_context(context, dump["contextDump"])
+        dump = dumping.load(dump_path)
+        context = self.parse_context(context,
+                                     dump["contextDump"],
+                                     instance_id=dump["id"])
 
         instance = next(i for i in context if i.data["dumpId"] == dump["id"])
-        children = instance.data["childInstances"]
-        instance_to_keep = [instance] + children[:]
-
-        for other in list(context):
-            if other not in instance_to_keep:
-                context.remove(other)
 
         for key in ["_progressiveStep",
                     "_progressiveOutput",
+                    "_progressiveTasks",
                     "deadlineJobId"]:
             if key in context.data:
                 # Pass progressive publishing args from context to
                 # main instance.
                 instance.data[key] = context.data.pop(key)
 
-    def parse_context(self, context, dump_path):
+    def parse_context(self, context, dump_path, instance_id=None):
+        """Create instances from context dump
+
+        Arguments:
+            context (pyblish.api.Context): Context to update
+            dump_path (str): Context dump file path
+            instance_id (str, optional): Only load this instance and its
+                child instances if given
+
+        """
+        context_dump = dumping.load(dump_path)
 
-        with open(dump_path, "r") as file:
-            context_dump = json.load(file)
+        context.data.update({
+            "user": context_dump["by"],
+            "date": context_dump["date"],
+            "currentMaking": context_dump["from"],
+            "comment": context_dump["comment"],
+        })
 
-            context.data.update({
-                "user": context_dump["by"],
-                "date": context_dump["date"],
-                "currentMaking": context_dump["from"],
-                "comment": context_dump["comment"],
-            })
+        indexed = context_dump["instances"]
+        if instance_id is not None:
+            index = next(dump for dump in indexed if dump["id"] == instance_id)
+            to_load = set([instance_id] + index["childInstances"])
+            indexed = [dump for dump in indexed if dump["id"] in to_load]
 
         instance_by_id = dict()
 
-        for dump in context_dump["instances"]:
-            with open(dump["dump"], "r") as file:
-                dump.update(json.load(file))
+        for dump in indexed:
+            dump.update(dumping.load(dump["dump"]))
 
-                previous_id = dump.pop("id")
-                child_ids = dump.pop("childInstances")
-                version_num = dump.pop("version")
+            previous_id = dump.pop("id")
+            child_ids = dump.pop("childInstances")
+            version_num = dump.pop("version")
 
-                instance = context.create_instance(dump["name"])
-                instance_by_id[previous_id] = instance
+            instance = context.create_instance(dump["name"])
+            instance_by_id[previous_id] = instance
 
-                instance.data.update(dump)
+            instance.data.update(dump)
 
-                instance.data["versionPin"] = version_num
-                instance.data["dumpId"] = previous_id
-                instance.data["childIds"] = child_ids
-                instance.data["childInstances"] = list()
+            instance.data["versionPin"] = version_num
+            instance.data["dumpId"] = previous_id
+            instance.data["childIds"] = child_ids
+            instance.data["childInstances"] = list()
 
         for instance in context:
             children = instance.data["childInstances"]
             for child_id in instance.data["childIds"]:
-                children.append(instance_by_id[child_id])
+                if child_id in instance_by_id:
+                    children.append(instance_by_id[child_id])
 
         return context
@@ -1,6 +1,7 @@
 
 import os
 import pyblish.api
+from reveries import sequence
 
 
 class ExtractRender(pyblish.api.InstancePlugin):
@@ -22,8 +23,8 @@ class ExtractRender(pyblish.api.InstancePlugin):
         sequence_data = instance.data["sequences"]
         is_stereo = instance.data["isStereo"]
 
-        sequence = dict()
-        patterns = list()
+        aov_sequence = dict()
+        outputs = list()  # (aov name, stereo side, file pattern)
         start = None
         end = None
         for aov_name, data in sequence_data.items():
@@ -32,29 +33,56 @@ class ExtractRender(pyblish.api.InstancePlugin):
 
             pattern = data["fpattern"]
 
-            sequence[aov_name] = {
+            aov_sequence[aov_name] = {
                 "imageFormat": os.path.splitext(pattern)[-1],
                 "fpattern": pattern,
             }
 
             if is_stereo:
-                patterns.append(pattern.format(stereo="Left"))
-                patterns.append(pattern.format(stereo="Right"))
+                for side in ("Left", "Right"):
+                    outputs.append((aov_name,
+                                    side,
+                                    pattern.format(stereo=side)))
             else:
-                patterns.append(pattern)
+                outputs.append((aov_name, None, pattern))
 
+        # Each directory is listed once and frames are matched in memory,
+        # instead of checking file existence per frame on file server.
+        # Files are described by pattern and frame set, see
+        # `reveries.sequence`
+        listing = dict()
         hardlinks = list()
-        missing = False
-        for fname in patterns:
+        missing_frames = list()
+        for aov_name, side, fname in outputs:
+            frames = list()
+            missing = list()
             for frame_num in range(start, end + 1):
-                full_path = os.path.join(staging_dir, fname % frame_num)
-                if os.path.isfile(full_path):
-                    hardlinks.append(fname % frame_num)
+                dir_name, file_name = os.path.split(fname % frame_num)
+                if dir_name not in listing:
+                    listing[dir_name] = self.list_files(staging_dir,
+                                                        dir_name)
+                if file_name in listing[dir_name]:
+                    frames.append(frame_num)
                 else:
-                    print("%s not exists, skip." % full_path)
-                    missing = True
+                    missing.append(frame_num)
 
-        if missing:
+            if frames:
+                hardlinks.append(sequence.descriptor(fname, frames))
+
+            if missing:
+                missing_frames.append({
+                    "aov": aov_name,
+                    "stereo": side,
+                    "fpattern": fname,
+                    "frames": sequence.compress(missing),
+                })
+                self.log.warning("Missing frames of %s: %s"
+                                 % (fname, missing_frames[-1]["frames"]))
+
+        # For validators and Deadline re-submission
+        instance.data["missingFrames"] = missing_frames
+
+        if missing_frames:
             self.log.warning("Some files missing, sequence may incomplete. "
                              "See log..")
 
@@ -64,8 +92,15 @@ class ExtractRender(pyblish.api.InstancePlugin):
         instance.data["startFrame"] = start
         instance.data["endFrame"] = end
 
-        instance.data["repr.renderLayer.sequence"] = sequence
+        instance.data["repr.renderLayer.sequence"] = aov_sequence
         instance.data["repr.renderLayer.stereo"] = is_stereo
 
         instance.data["repr.renderLayer._stage"] = staging_dir
         instance.data["repr.renderLayer._hardlinks"] = hardlinks
+
+    def list_files(self, staging_dir, dir_name):
+        """Return names in directory as a set, empty if not exists"""
+        try:
+            return set(os.listdir(os.path.join(staging_dir, dir_name)))
+        except OSError:
+            return set()
@@ -40,24 +40,33 @@ class RemoveOutdatedProgress(pyblish.api.InstancePlugin):
 
         repr_dirs = parse_src_dst_dirs(instance)
 
-        outdated = set()
+        # Index stage dirs for longest-prefix lookup, each file only needs
+        # to look up its parent dirs.
+        index = dict()
+        for src, dst in repr_dirs.values():
+            index[src.rstrip("/")] = dst.rstrip("/")
+
+        outdated = dict()  # {dst dir: [file names]}
+        published = dict()  # {progress file: published file}
         not_matched = set()
 
         for file in progress:
             file = file.replace("\\", "/")
-            for _, (src, dst) in repr_dirs.items():
-                if not file.startswith(src):
-                    continue
 
-                tail = os.path.relpath(file, src)
-                old = os.path.join(dst, tail).replace("\\", "/")
-                if os.path.isfile(old):
-                    outdated.add(old)
-
-                break
-
-            else:
-                not_matched.add(file)
+            parent = file
+            while True:
+                head = parent.rsplit("/", 1)[0]
+                if head == parent:
+                    not_matched.add(file)
+                    break
+                parent = head
+
+                if parent in index:
+                    old = index[parent] + file[len(parent):]
+                    dir_name, file_name = old.rsplit("/", 1)
+                    outdated.setdefault(dir_name, list()).append(file_name)
+                    published[file] = old
+                    break
 
         if not_matched:
             self.log.error("! " * 30)
@@ -70,23 +79,68 @@ class RemoveOutdatedProgress(pyblish.api.InstancePlugin):
 
             raise FileNotFoundError("Progress output file not matched.")
 
-        if outdated:
+        # Check existence by listing each destination dir once
+        existed = list()
+        for dir_name, file_names in sorted(outdated.items()):
+            try:
+                listed = set(os.listdir(dir_name))
+            except OSError:
+                continue
+
+            existed += ["%s/%s" % (dir_name, file_name)
+                        for file_name in sorted(set(file_names))
+                        if file_name in listed]
+
+        tasks = instance.data.get("_progressiveTasks")
+        if tasks is not None:
+            instance.data["_progressiveStep"] = self.count_progress(
+                tasks, published, existed)
+        elif existed:
             instance.data["_progressiveStep"] = 0
 
         # Try Remove
 
         removed = list()
 
-        for file in outdated:
-            if os.path.isfile(file):
-                self.log.debug("Removing outdated file: %s" % file)
-                try:
-                    os.remove(file)
-                except Exception as e:
-                    self.log.error("Failed to remove: %s" % file)
-                    raise e
-                else:
-                    removed.append(file)
+        for file in existed:
+            self.log.debug("Removing outdated file: %s" % file)
+            try:
+                os.remove(file)
+            except Exception as e:
+                self.log.error("Failed to remove: %s" % file)
+                raise e
+            else:
+                removed.append(file)
 
         self.log.info("Assume %d outdated, removed %d."
-                      % (len(outdated), len(removed)))
+                      % (len(existed), len(removed)))
+
+    def count_progress(self, tasks, published, existed):
+        """Sum up progress of tasks batched by publish worker
+
+        Only those tasks which outputs were not yet published count, so a
+        re-rendered or requeued task does not wipe progress of fresh tasks
+        published along with it, and duplicated tasks count once.
+
+        Args:
+            tasks (list): Task dicts, {"progress": int, "files": [str]}
+            published (dict): Progress file to published file path
+            existed (list): Published file paths that already existed
+
+        Returns:
+            int: Progress step of this publish
+
+        """
+        seen = set(existed)
+        progress = 0
+        for task in tasks:
+            files = set(published.get(file.replace("\\", "/"))
+                        for file in task["files"])
+            if files.isdisjoint(seen):
+                progress += task["progress"]
+            else:
+                self.log.info("Outdated task, progress not counted: %s"
+                              % ", ".join(sorted(task["files"])))
+            seen.update(files)
+
+        return progress
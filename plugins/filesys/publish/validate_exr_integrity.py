@@ -0,0 +1,257 @@
+
+import os
+import struct
+import pyblish.api
+
+
+# Scanlines per chunk of each compression
+LINES_PER_BLOCK = {
+    "NO_COMPRESSION": 1,
+    "RLE_COMPRESSION": 1,
+    "ZIPS_COMPRESSION": 1,
+    "ZIP_COMPRESSION": 16,
+    "PIZ_COMPRESSION": 32,
+    "PXR24_COMPRESSION": 16,
+    "B44_COMPRESSION": 32,
+    "B44A_COMPRESSION": 32,
+    "DWAA_COMPRESSION": 32,
+    "DWAB_COMPRESSION": 256,
+}
+
+
+def _ceil_div(a, b):
+    return -(-a // b)
+
+
+def _level_count(size, rounding):
+    count = 1
+    while size > 1:
+        size = _ceil_div(size, 2) if rounding else size // 2
+        count += 1
+    return count
+
+
+def _level_size(size, level, rounding):
+    size = _ceil_div(size, 2 ** level) if rounding else size // 2 ** level
+    return max(size, 1)
+
+
+def chunk_count(header, part):
+    """Return chunk count of one part, from header attributes"""
+    if "chunkCount" in part:
+        return part["chunkCount"]
+
+    window = part["dataWindow"]
+    width = window["xMax"] - window["xMin"] + 1
+    height = window["yMax"] - window["yMin"] + 1
+
+    if not header["tiled"]:
+        return _ceil_div(height, LINES_PER_BLOCK[part["compression"]])
+
+    tiles = part["tiles"]
+    level_mode = tiles["levelMode"]
+    rounding = tiles["roundingMode"]
+
+    def tile_count(x_level, y_level):
+        w = _level_size(width, x_level, rounding)
+        h = _level_size(height, y_level, rounding)
+        return _ceil_div(w, tiles["xSize"]) * _ceil_div(h, tiles["ySize"])
+
+    if level_mode == 0:  # ONE_LEVEL
+        return tile_count(0, 0)
+
+    if level_mode == 1:  # MIPMAP_LEVELS
+        levels = _level_count(max(width, height), rounding)
+        return sum(tile_count(level, level) for level in range(levels))
+
+    # RIPMAP_LEVELS
+    x_levels = _level_count(width, rounding)
+    y_levels = _level_count(height, rounding)
+    return sum(tile_count(x, y)
+               for x in range(x_levels) for y in range(y_levels))
+
+
+def _read(file, fmt):
+    size = struct.calcsize(fmt)
+    data = file.read(size)
+    if len(data) < size:
+        raise Exception("Truncated chunk")
+    return struct.unpack(fmt, data)
+
+
+def _chunk_size(file, header):
+    """Read chunk header at current position, return whole chunk size"""
+    size = 0
+    tiled = header["tiled"]
+    deep = header["deep"]
+
+    if header["multipart"]:
+        number, = _read(file, "<i")
+        size += 4
+        part_type = header["parts"][number].get("type", "")
+        tiled = "tile" in part_type
+        deep = "deep" in part_type
+
+    coords = 16 if tiled else 4  # Tile coordinates and levels, or y
+    file.seek(coords, 1)
+    size += coords
+
+    if deep:
+        # Offset table size, sample data size, unpacked sample data size
+        table_size, data_size, _ = _read(file, "<qqq")
+        return size + 24 + table_size + data_size
+
+    data_size, = _read(file, "<i")
+    return size + 4 + data_size
+
+
+def check_exr(path):
+    """Check EXR header and chunk offset tables against file size
+
+    Returns:
+        dict: Header of first part, for comparing between frames
+
+    Raises:
+        Exception: If the file is invalid or incomplete
+
+    """
+    from reveries.vendor import parse_exr_header
+
+    header = parse_exr_header.read_file_header(path)
+    file_size = header["fileSize"]
+    parts = header["parts"]
+
+    counts = [chunk_count(header, part) for part in parts]
+    table_end = header["headerSize"] + 8 * sum(counts)
+    if table_end > file_size:
+        raise Exception("Truncated offset table")
+
+    with open(path, "rb") as file:
+        file.seek(header["headerSize"])
+        offsets = struct.unpack("<%dQ" % sum(counts),
+                                file.read(8 * sum(counts)))
+
+        for offset in offsets:
+            if not table_end <= offset < file_size:
+                # Unwritten chunk has zero offset
+                raise Exception("Invalid chunk offset: %d" % offset)
+
+        # The last chunk should end at end of file
+        last = max(offsets)
+        file.seek(last)
+        chunk_end = last + _chunk_size(file, header)
+
+    if chunk_end != file_size:
+        raise Exception("File size %d not matching the chunk table, "
+                        "expected %d" % (file_size, chunk_end))
+
+    return parts[0]
+
+
+class ValidateEXRIntegrity(pyblish.api.InstancePlugin):
+    """Validate EXR sequences are complete and consistent
+
+    Every frame is checked concurrently that header can be parsed, chunk
+    offset table is consistent with file size (not truncated or half
+    written), and channels, dataWindow and compression are the same as
+    the first frame of the sequence.
+
+    """
+
+    label = "Validate EXR Integrity"
+    order = pyblish.api.ValidatorOrder
+    hosts = ["filesys"]
+    targets = [
+        "seqparser",
+    ]
+    families = [
+        "reveries.renderlayer",
+    ]
+
+    WORKERS = 16
+    COMPARE = ["channels", "dataWindow", "compression"]
+
+    def process(self, instance):
+        import multiprocessing.pool
+        from reveries import sequence as seqlib
+
+        staging_dir = instance.data["stagingDir"]
+        is_stereo = instance.data["isStereo"]
+
+        sequences = list()
+        for aov_name, data in instance.data["sequences"].items():
+            pattern = data["fpattern"]
+            if os.path.splitext(pattern)[-1].lower() != ".exr":
+                continue
+
+            sides = ["Left", "Right"] if is_stereo else [None]
+            for side in sides:
+                fname = pattern.format(stereo=side) if side else pattern
+                frames = self.existing_frames(staging_dir,
+                                              fname,
+                                              data["start"],
+                                              data["end"])
+                sequences.append((fname, frames))
+
+        jobs = [(fname, frame, os.path.join(staging_dir, fname % frame))
+                for fname, frames in sequences for frame in frames]
+        if not jobs:
+            return
+
+        def check(job):
+            fname, frame, path = job
+            try:
+                return fname, frame, check_exr(path), None
+            except Exception as e:
+                return fname, frame, None, e
+
+        self.log.info("Checking %d EXR files.." % len(jobs))
+
+        pool = multiprocessing.pool.ThreadPool(min(self.WORKERS, len(jobs)))
+        try:
+            results = pool.map(check, jobs, chunksize=4)
+        finally:
+            pool.close()
+            pool.join()
+
+        # Compare with first valid frame of each sequence
+        first = dict()
+        bad = dict()
+        for fname, frame, part, error in results:
+            if error is None:
+                reference = first.setdefault(fname, part)
+                for key in self.COMPARE:
+                    if part.get(key) != reference.get(key):
+                        error = "%s differs from first frame" % key
+                        break
+
+            if error is not None:
+                self.log.debug("%s: %s" % (fname % frame, error))
+                bad.setdefault(fname, dict())[frame] = str(error)
+
+        if not bad:
+            self.log.info("All EXR files are good.")
+            return
+
+        for fname, frames in sorted(bad.items()):
+            self.log.error("Bad frames of %s: %s"
+                           % (fname, seqlib.compress(frames)))
+            errors = dict()
+            for frame, error in sorted(frames.items()):
+                errors.setdefault(error, list()).append(frame)
+            for error, frames in errors.items():
+                self.log.error("    %s: %s"
+                               % (seqlib.compress(frames), error))
+
+        raise Exception("Found incomplete or inconsistent EXR files, "
+                        "see log..")
+
+    def existing_frames(self, staging_dir, fname, start, end):
+        dir_name = os.path.dirname(os.path.join(staging_dir, fname % start))
+        try:
+            listed = set(os.listdir(dir_name))
+        except OSError:
+            return []
+
+        return [frame for frame in range(start, end + 1)
+                if os.path.basename(fname % frame) in listed]
@@ -9,10 +9,7 @@ class CollectAssetDocument(pyblish.api.ContextPlugin):
     order = pyblish.api.CollectorOrder + 0.499
 
     def process(self, context):
-        from avalon import io
-
-        project = context.data["projectDoc"]
-        project_id = project["_id"]
+        from reveries import doccache
 
         _cache = dict()
         _missing = False
@@ -22,9 +19,7 @@ class CollectAssetDocument(pyblish.api.ContextPlugin):
             if name in _cache:
                 asset = _cache[name]
             else:
-                asset = io.find_one({"type": "asset",
-                                     "name": name,
-                                     "parent": project_id})
+                asset = doccache.asset(name)
                 _cache[name] = asset
 
             if asset is None:
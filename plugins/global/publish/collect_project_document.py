@@ -1,7 +1,6 @@
 
 import pyblish.api
-import avalon.api
-import avalon.io
+from reveries import doccache
 
 
 class CollectProjectDocument(pyblish.api.ContextPlugin):
@@ -19,7 +18,7 @@ class CollectProjectDocument(pyblish.api.ContextPlugin):
 
     def process(self, context):
 
-        project = avalon.io.find_one({"type": "project"})
+        project = doccache.project()
         assert project is not None, "Could not find project document."
 
         context.data["projectDoc"] = project
@@ -1,25 +1,10 @@
 import os
 import re
-import json
 import pyblish.api
 import avalon.api
 from avalon import io
 from reveries import lib, filesys
-
-
-class PyblishEncoder(json.JSONEncoder):
-
-    def default(self, obj):
-        if isinstance(obj, set):
-            return list(obj)
-        try:
-            return json.JSONEncoder.default(self, obj)
-        except TypeError:
-            return str(obj)
-
-
-def json_dump(dump, file):
-    json.dump(dump, file, indent=4, sort_keys=True, cls=PyblishEncoder)
+from reveries.filesys import dump as dumping
 
 
 class DelayedDumpToRemote(pyblish.api.ContextPlugin):
@@ -36,14 +21,19 @@ class DelayedDumpToRemote(pyblish.api.ContextPlugin):
     context dump file (JSON) and start validating extracted files and publish
     them.
 
+    Dump files are written in compact JSON by default, or in the format
+    of project data `dumpFormat`, which could be ".json", ".json.gz" or
+    ".msgpack" (see `reveries.filesys.dump`). The context dump indexes
+    instance dumps, so *filesys* publish only loads the instances it needs.
+
     """
 
     order = pyblish.api.ExtractorOrder + 0.491
     label = "Delayed Dump To Remote"
 
-    EXTRACTOR_DUMP = "{stage}/.extractor.json"
-    INSTANCE_DUMP = "{version}/.instance.json"
-    CONTEXT_DUMP = "{filesys}/dumps/.context.{user}.{oid}.json"
+    EXTRACTOR_DUMP = "{stage}/.extractor{ext}"
+    INSTANCE_DUMP = "{version}/.instance{ext}"
+    CONTEXT_DUMP = "{filesys}/dumps/.context.{user}.{oid}{ext}"
 
     def process(self, context):
         # Skip if any error occurred
@@ -61,6 +51,9 @@ class DelayedDumpToRemote(pyblish.api.ContextPlugin):
         if not instances:
             return
 
+        project = context.data["projectDoc"]
+        self.ext = project["data"].get("dumpFormat") or dumping.JSON
+
         dump_id = str(io.ObjectId())
         dump_user = context.data["user"]
 
@@ -90,13 +83,13 @@ class DelayedDumpToRemote(pyblish.api.ContextPlugin):
         root = self.get_filesys_dir(context)
         outpath = self.CONTEXT_DUMP.format(filesys=root,
                                            user=dump_user,
-                                           oid=dump_id)
+                                           oid=dump_id,
+                                           ext=self.ext)
 
         for name, (dump_path, dump) in dumps.items():
             dump["contextDump"] = outpath
 
-            with open(dump_path, "w") as file:
-                json_dump(dump, file)
+            dumping.dump(dump, dump_path)
             self.log.debug("Instance %s dumped to '%s'" % (name, dump_path))
 
         # Dump context
@@ -130,8 +123,7 @@ class DelayedDumpToRemote(pyblish.api.ContextPlugin):
         if not os.path.isdir(outdir):
             os.makedirs(outdir)
 
-        with open(outpath, "w") as file:
-            json_dump(dump, file)
+        dumping.dump(dump, outpath)
         self.log.debug("Context dumped to '%s'" % outpath)
 
     def instance_dump(self, instance, extractors):
@@ -153,13 +145,13 @@ class DelayedDumpToRemote(pyblish.api.ContextPlugin):
             }
 
             stage_dir = instance.data["repr.%s._stage" % repr_name]
-            outpath = self.EXTRACTOR_DUMP.format(stage=stage_dir)
+            outpath = self.EXTRACTOR_DUMP.format(stage=stage_dir,
+                                                 ext=self.ext)
 
             if not os.path.isdir(stage_dir):
                 os.makedirs(stage_dir)
 
-            with open(outpath, "w") as file:
-                json_dump(dump, file)
+            dumping.dump(dump, outpath)
 
             instance.data["dumpedExtractors"].append(outpath)
 
@@ -193,7 +185,8 @@ class DelayedDumpToRemote(pyblish.api.ContextPlugin):
             dump[key] = instance.data[key]
 
         version_dir = instance.data["versionDir"]
-        outpath = self.INSTANCE_DUMP.format(version=version_dir)
+        outpath = self.INSTANCE_DUMP.format(version=version_dir,
+                                            ext=self.ext)
         outpath = outpath.replace("\\", "/")
 
         return outpath, dump
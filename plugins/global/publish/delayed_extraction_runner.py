@@ -1,12 +1,38 @@
 
 import sys
 import re
+import logging
+import itertools
+import threading
 import traceback
+import multiprocessing.pool
 import pyblish.api
 
 
 class DelayedExtractionRunner(pyblish.api.InstancePlugin):
     """Consume and execute delayed extractors
+
+    Extractors are run in `order`, and extractors of the same order could
+    be run concurrently if project data `delayedExtractionWorkers` is set
+    to more than one, and the extractor has declared `threadSafe`:
+
+        instance.data["repr.Foo._delayRun"] = {
+            "func": self.export_foo,
+            "args": [...],
+            "order": 10,
+            "threadSafe": True,  # Doesn't need host's main thread
+        }
+
+    Extractors which are not thread-safe still run one after another in
+    current thread, while the thread-safe ones running in pool. Next order
+    will not start until all extractors of current order finished.
+
+    Trailing thread-safe extractors of an instance (no extractor which
+    needs main thread runs after them) are run in a context wide pool
+    instead, concurrently with other instances' extraction, and joined
+    by `WaitDelayedExtraction` which reports their logs and errors on the
+    instance.
+
     """
 
     order = pyblish.api.ExtractorOrder + 0.49
@@ -17,7 +43,8 @@ class DelayedExtractionRunner(pyblish.api.InstancePlugin):
     def process(self, instance):
         context = instance.context
         # Skip if any error occurred
-        if not all(result["success"] for result in context.data["results"]):
+        if (not all(result["success"] for result in context.data["results"])
+                or self.aborted(context)):
             self.log.warning("Atomicity not held, aborting.")
             return
 
@@ -26,29 +53,153 @@ class DelayedExtractionRunner(pyblish.api.InstancePlugin):
                       if re.match(r"repr\.[a-zA-Z_]*\._delayRun", key)]
         extractors.sort(key=lambda t: t[1].get("order", -1))
 
-        for repr_name, extractor in extractors:
+        project = context.data["projectDoc"]
+        workers = project["data"].get("delayedExtractionWorkers") or 1
+
+        groups = [list(group) for _, group in itertools.groupby(
+            extractors, key=lambda t: t[1].get("order", -1))]
+
+        deferred = list()
+        while (workers > 1 and groups and
+               all(extractor.get("threadSafe")
+                   for _, extractor in groups[-1])):
+            deferred.insert(0, groups.pop())
+
+        for group in groups:
+            self.run_group(instance, group, workers)
+
+        if deferred:
+            self.defer(instance, deferred, workers)
+
+    def run_group(self, instance, group, workers):
+        """Run extractors of the same order"""
+        concurrent = [(repr_name, extractor)
+                      for repr_name, extractor in group
+                      if extractor.get("threadSafe")]
+
+        if workers <= 1 or len(concurrent) <= 1:
+            for repr_name, extractor in group:
+                self.run_extractor(instance, repr_name, extractor)
+        else:
+            serial = [(repr_name, extractor)
+                      for repr_name, extractor in group
+                      if not extractor.get("threadSafe")]
+            self.run_concurrent(instance, concurrent, serial, workers)
+
+    def aborted(self, context):
+        """Return True if any background extraction failed"""
+        aborted = context.data.get("_delayedExtractionAborted")
+        return aborted is not None and aborted.is_set()
+
+    def defer(self, instance, groups, workers):
+        """Run thread-safe extractor groups in context's pool, in order
+
+        Logs are recorded in job and the job returns them with the error
+        if any, `WaitDelayedExtraction` emits them for the instance.
+
+        """
+        context = instance.context
+        pool = context.data.get("_delayedExtractionPool")
+        if pool is None:
+            pool = multiprocessing.pool.ThreadPool(workers)
+            context.data["_delayedExtractionPool"] = pool
+            context.data["_delayedExtractionJobs"] = list()
+            context.data["_delayedExtractionAborted"] = threading.Event()
+
+        aborted = context.data["_delayedExtractionAborted"]
 
-            func = extractor["func"]
-            args = extractor.get("args", list())
-            kwargs = extractor.get("kwargs", dict())
+        def run():
+            log = JobLog()
+            for group in groups:
+                for repr_name, extractor in group:
+                    if aborted.is_set():
+                        log.warning("Atomicity not held, aborting.")
+                        return log.records, None
+                    try:
+                        self.run_extractor(instance,
+                                           repr_name,
+                                           extractor,
+                                           log=log)
+                    except Exception as e:
+                        aborted.set()
+                        return log.records, e
 
-            self.log.info("Running extractor [%s] for [%s] to [%s]..."
-                          % (func.__name__, instance, repr_name))
+            return log.records, None
 
+        self.log.info("Extracting %s in background.." % instance)
+        job = pool.apply_async(run)
+        context.data["_delayedExtractionJobs"].append((instance, job))
+
+    def run_concurrent(self, instance, concurrent, serial, workers):
+        """Run thread-safe extractors in pool, others in current thread"""
+        lock = threading.Lock()
+        errors = list()
+
+        def run(job):
             try:
-                func(*args, **kwargs)
+                self.run_extractor(instance, *job)
             except Exception as e:
-                err_msg = "{file}, line {line}, in {func}: {err}"
-
-                _, _, tb = sys.exc_info()
-                last_callstack = traceback.extract_tb(tb)[-1]
-                lineno = last_callstack[1]
-
-                errMsg = err_msg.format(file=func.im_class.__module__,
-                                        line=lineno,
-                                        func=func.__name__,
-                                        err=str(e))
-                self.log.critical(errMsg)
-                raise Exception("Extraction failed, see log for deatil.")
-            else:
-                extractor["done"] = True
+                with lock:
+                    errors.append(e)
+
+        self.log.info("Running %d extractors concurrently.." % len(concurrent))
+
+        pool = multiprocessing.pool.ThreadPool(min(workers, len(concurrent)))
+        try:
+            result = pool.map_async(run, concurrent, chunksize=1)
+            # Host's main thread bounded extractors
+            for job in serial:
+                run(job)
+            result.wait()
+        finally:
+            pool.close()
+            pool.join()
+
+        if errors:
+            raise errors[0]
+
+    def run_extractor(self, instance, repr_name, extractor, log=None):
+        log = log or self.log
+        func = extractor["func"]
+        args = extractor.get("args", list())
+        kwargs = extractor.get("kwargs", dict())
+
+        log.info("Running extractor [%s] for [%s] to [%s]..."
+                 % (func.__name__, instance, repr_name))
+
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            err_msg = "{file}, line {line}, in {func}: {err}"
+
+            _, _, tb = sys.exc_info()
+            last_callstack = traceback.extract_tb(tb)[-1]
+            lineno = last_callstack[1]
+
+            errMsg = err_msg.format(file=func.__module__,
+                                    line=lineno,
+                                    func=func.__name__,
+                                    err=str(e))
+            log.critical(errMsg)
+            raise Exception("Extraction failed, see log for deatil.")
+        else:
+            extractor["done"] = True
+
+
+class JobLog(object):
+    """Record log messages of background job, to be emitted later"""
+
+    def __init__(self):
+        self.records = list()
+
+    def log(self, level, msg):
+        self.records.append((level, msg))
+
+    def info(self, msg):
+        self.log(logging.INFO, msg)
+
+    def warning(self, msg):
+        self.log(logging.WARNING, msg)
+
+    def critical(self, msg):
+        self.log(logging.CRITICAL, msg)
@@ -0,0 +1,41 @@
+
+import pyblish.api
+
+
+class WaitDelayedExtraction(pyblish.api.InstancePlugin):
+    """Wait for delayed extractors running in background
+
+    Thread-safe extractors deferred by `DelayedExtractionRunner` are run in
+    a context wide pool, this waits for the instance's extraction to finish
+    before dumping or integrating, and reports its logs and error.
+
+    """
+
+    order = pyblish.api.ExtractorOrder + 0.4905
+    label = "Wait Delayed Extractions"
+
+    targets = ["localhost"]
+
+    def process(self, instance):
+        context = instance.context
+        jobs = context.data.get("_delayedExtractionJobs")
+        if not jobs:
+            return
+
+        index = next((i for i, (owner, _) in enumerate(jobs)
+                      if owner is instance), None)
+        if index is None:
+            return
+
+        _, job = jobs.pop(index)
+        records, error = job.get()
+        if not jobs:
+            pool = context.data.pop("_delayedExtractionPool")
+            pool.close()
+            pool.join()
+
+        for level, msg in records:
+            self.log.log(level, msg)
+
+        if error is not None:
+            raise error
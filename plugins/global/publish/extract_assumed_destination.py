@@ -4,6 +4,7 @@ import shutil
 import pyblish.api
 import avalon.api
 import avalon.io
+from reveries import versionlock
 
 
 class ExtractAssumedDestination(pyblish.api.InstancePlugin):
@@ -12,7 +13,7 @@ class ExtractAssumedDestination(pyblish.api.InstancePlugin):
     label = "Assumed Destination"
     order = pyblish.api.ExtractorOrder - 0.4
 
-    LOCK = ".publish.lock"
+    LOCK = versionlock.LOCK
 
     def process(self, instance):
 
@@ -62,18 +63,23 @@ class ExtractAssumedDestination(pyblish.api.InstancePlugin):
 
         version_template = os.path.dirname(template_publish)
 
-        # Probe version
+        # Reserve version
+        #
+        # Version dir is locked atomically, and versions that are locked by
+        # other live publishes are skipped in one go, so concurrent publishes
+        # of the same subset will not race on the same version.
 
-        def is_version_locked(lock):
-            """Is version locked by other ?"""
-            if os.path.isfile(lock):
-                with open(lock, "r") as f:
-                    return f.read().strip() != context.data["user"]
-            return False
+        user = context.data["user"]
+        expiry = (project["data"].get("versionLockExpiry") or
+                  versionlock.EXPIRY)
+        token = None
 
-        def lock_version(lock):
-            with open(lock, "w") as f:
-                f.write(context.data["user"])
+        if not version_pinned:
+            locked = versionlock.locked_versions(version_template,
+                                                 template_data,
+                                                 user,
+                                                 expiry)
+            version_num = max([version_num] + [v + 1 for v in locked])
 
         while True:
             # Format dir
@@ -82,43 +88,53 @@ class ExtractAssumedDestination(pyblish.api.InstancePlugin):
             version_dir = os.path.abspath(os.path.normpath(version_dir))
 
             lockfile = version_dir + "/" + self.LOCK
-            if not version_pinned and is_version_locked(lockfile):
-                # Bump version
-                version_num += 1
-                continue
 
-            elif is_progressive:
+            if is_progressive:
                 # In progressive publish mode, publish will be triggered
                 # multiple times with files that only be part of sequence,
                 # so we wouldn't want nor need to clear the version every
                 # time it runs.
+                lock = versionlock.read(lockfile)
+                if (not version_pinned and lock is not None
+                        and not versionlock.is_mine(lock, user)
+                        and not versionlock.is_stale(lock, expiry)):
+                    # Bump version
+                    version_num += 1
+                    continue
+
                 self.log.info("Progressive publishing, skip cleanup.")
                 break
 
-            else:
-                if not os.path.isdir(version_dir):
-                    os.makedirs(version_dir)
-
-                lock_version(lockfile)
-
-                success = self.clean_dir(version_dir)
-                if not success:
-                    if version_pinned:
-                        raise Exception("Version dir cleanup failed: %s"
-                                        % version_dir)
-                    else:
-                        self.log.warning("Version dir cleanup failed, "
-                                         "try next..")
-                        continue
+            token = versionlock.acquire(lockfile,
+                                        user,
+                                        expiry=expiry,
+                                        force=version_pinned)
+            if token is None:
+                # Just been taken by other publish, bump version
+                version_num += 1
+                continue
 
-                self.log.info("Version %03d will be created for %s" %
-                              (version_num, instance))
-                break
+            success = self.clean_dir(version_dir)
+            if not success:
+                if version_pinned:
+                    raise Exception("Version dir cleanup failed: %s"
+                                    % version_dir)
+                else:
+                    self.log.warning("Version dir cleanup failed, "
+                                     "try next..")
+                    versionlock.release(lockfile, token)
+                    version_num += 1
+                    continue
+
+            self.log.info("Version %03d will be created for %s" %
+                          (version_num, instance))
+            break
 
         instance.data["publishPathTemplateData"] = template_data
         instance.data["publishPathTemplate"] = template_publish
 
         instance.data["_versionlock"] = lockfile
+        instance.data["_versionlockToken"] = token
         instance.data["versionNext"] = version_num
         instance.data["versionDir"] = version_dir
 
@@ -133,12 +149,13 @@ class ExtractAssumedDestination(pyblish.api.InstancePlugin):
 
         keep = [
             self.LOCK,
-            ".instance.json",  # Instance dump file
         ]
 
         for item in os.listdir(path):
             if item in keep:
                 continue
+            if item.startswith(".instance."):
+                continue  # Instance dump file
 
             item_path = os.path.join(path, item)
 
@@ -1,6 +1,7 @@
 
 import pyblish.api
 from avalon import io
+from reveries import lib, utils
 
 # Below family will publish after this plugin
 SKIP_FAMILY = [
@@ -36,49 +37,70 @@ class IntegrateAvalonDatabase(pyblish.api.InstancePlugin):
         asset = instance.data["assetDoc"]
         subset, version, representations = instance.data["toDatabase"]
 
+        collection = lib.project_collection()
+        utils.ensure_source_key_index(collection)
+        # Subset and version documents are written in one ordered batch,
+        # representations and dependents must not exist without them.
+        writer = lib.BulkWriter(collection, ordered=True)
+
+        # Find subset and version in one query
+        subset_filter = {
+            "type": "subset",
+            "parent": asset["_id"],
+            "name": subset["name"],
+        }
+        version_filter = {
+            "type": "version",
+            "parent": subset["_id"],
+            "name": version["name"],
+        }
+        existed_subset = None
+        existed_version = None
+        for doc in collection.find({"$or": [subset_filter, version_filter]},
+                                   projection={"type": True}):
+            if doc["type"] == "subset":
+                existed_subset = doc
+            else:
+                existed_version = doc
+
         # Write subset if not exists
-        filter = {"parent": asset["_id"], "name": subset["name"]}
-        if io.find_one(filter) is None:
-            io.insert_one(subset)
+        if existed_subset is None:
+            writer.insert_one(subset)
 
-        # Write version if not exists
-        filter = {"parent": subset["_id"], "name": version["name"]}
-        existed_version = io.find_one(filter)
         if existed_version is None:
             # Write version and representations to database
-            version_id = self.write_database(instance,
+            version_id = self.write_database(writer,
+                                             instance,
                                              version,
                                              representations)
             instance.data["insertedVersionId"] = version_id
 
             # Update dependent
-            self.update_dependent(instance, version_id)
+            self.update_dependent(writer, instance, version_id)
 
         else:
+            writer.flush()  # Subset may need to be written
+
             if context.data.get("_progressivePublishing"):
                 if instance.data.get("_progressiveOutput") is None:
                     pass  # Not given any output, no progress change
 
                 else:
                     self.log.info("Update version publish progress.")
-                    # Update version document "data.time"
-                    filter_ = {"_id": existed_version["_id"]}
-                    update = {"$set": {"data.time": context.data["time"]}}
-                    if "progress" in version["data"]:
-                        # Update version document "progress.current"
-                        progress = version["data"]["progress"]["current"]
-                        update["$inc"] = {"data.progress.current": progress}
-                    else:
-                        pass  # progress == -1, no progress update needed.
-                    io.update_many(filter_, update)
+                    self.update_progress(instance,
+                                         existed_version["_id"],
+                                         version)
 
             else:
                 self.log.info("Version existed, representation file has been "
                               "overwritten.")
+                # Documents updated here are independent to each other
+                writer.ordered = False
+
                 # Update version document "data.time"
                 filter_ = {"_id": existed_version["_id"]}
                 update = {"$set": {"data.time": context.data["time"]}}
-                io.update_many(filter_, update)
+                writer.update_many(filter_, update)
 
                 # Update representation documents "data"
                 for representation in representations:
@@ -87,14 +109,48 @@ class IntegrateAvalonDatabase(pyblish.api.InstancePlugin):
                         "parent": existed_version["_id"],
                     }
                     update = {"$set": {"data": representation["data"]}}
-                    io.update_many(filter_, update)
+                    writer.update_many(filter_, update)
+
+        writer.flush()
+
+        saved = writer.saved + 1  # Subset and version found in one query
+        instance.data["databaseRoundTripsSaved"] = saved
+        self.log.info("Batched database writes, %d round-trips saved." % saved)
+
+    def update_progress(self, instance, version_id, version):
+        """Update version document "data.time" and "progress.current"
+
+        Progress is buffered in process wide `reveries.lib.ProgressCounter`
+        and merged with other progressive publishes of the same version.
+        The buffer is flushed right away unless the publish is served by
+        a long running worker (`_progressiveBuffered`), which flushes it
+        periodically and on exit.
 
-    def write_database(self, instance, version, representations):
+        """
+        context = instance.context
+        project = context.data["projectDoc"]
+        interval = project["data"].get("progressFlushInterval", 30)
+
+        if "progress" in version["data"]:
+            progress = version["data"]["progress"]["current"]
+        else:
+            progress = 0  # progress == -1, no progress update needed.
+
+        counter = lib.progress_counter(interval=interval)
+        counter.add(version_id, progress, time=context.data["time"])
+
+        if not context.data.get("_progressiveBuffered"):
+            counter.flush()
+
+    def write_database(self, writer, instance, version, representations):
         """Write version and representations to database
 
         Should write version documents until files collecting passed
         without error.
 
+        Documents are queued into `writer`, the version id is generated
+        here if not pre-generated.
+
         """
         # Write version
         #
@@ -103,8 +159,11 @@ class IntegrateAvalonDatabase(pyblish.api.InstancePlugin):
 
         if "pregeneratedVersionId" in instance.data:
             version["_id"] = instance.data["pregeneratedVersionId"]
+        elif "_id" not in version:
+            version["_id"] = io.ObjectId()
 
-        version_id = io.insert_one(version).inserted_id
+        version_id = version["_id"]
+        writer.insert_one(version)
 
         # Write representations
         #
@@ -113,11 +172,11 @@ class IntegrateAvalonDatabase(pyblish.api.InstancePlugin):
         for representation in representations:
             representation["parent"] = version_id
 
-        io.insert_many(representations)
+        writer.insert_many(representations)
 
         return version_id
 
-    def update_dependent(self, instance, version_id):
+    def update_dependent(self, writer, instance, version_id):
 
         version_id = str(version_id)
         field = "data.dependents." + version_id
@@ -125,4 +184,4 @@ class IntegrateAvalonDatabase(pyblish.api.InstancePlugin):
         for version_id_, data in instance.data["dependencies"].items():
             filter_ = {"_id": io.ObjectId(version_id_)}
             update = {"$set": {field: {"count": data["count"]}}}
-            io.update_many(filter_, update)
+            writer.update_many(filter_, update)
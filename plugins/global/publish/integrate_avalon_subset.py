@@ -1,11 +1,21 @@
 
 import os
-import shutil
+import itertools
 
-import errno
 import pyblish.api
 from avalon import api, io
-from avalon.vendor import filelink
+from reveries import transfer, sequence, statcache
+
+
+def iter_transfers(src_dir, dst_dir, entries):
+    """Iterate source and destination file paths of transfer entries
+
+    Entries could be file names or sequence descriptors, which will only
+    be expanded when iterating.
+
+    """
+    for tail in sequence.iter_files(entries):
+        yield "%s/%s" % (src_dir, tail), "%s/%s" % (dst_dir, tail)
 
 
 class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
@@ -37,6 +47,7 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
         self.is_progressive = None
         self.progress = 0
         self.progress_output = None
+        self.stat_cache = None
         self.transfers = dict(files=list(),
                               hardlinks=list())
 
@@ -69,7 +80,19 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
 
         # Integrate representations' files to shareable space
         self.log.info("Integrating representations to shareable space ...")
-        self.integrate()
+        report = self.integrate()
+
+        # Only totals, per file timings could be huge for sequences
+        report.pop("perFile")
+        instance.data["transferReport"] = report
+        self.log.info("Transfered %d files in %.2f sec, copied %.1f MB "
+                      "(%.1f MB/s), hardlinked %d files (%.1f MB)"
+                      % (report["files"],
+                         report["seconds"],
+                         report["bytes"] / 1048576.0,
+                         report["bytesPerSec"] / 1048576.0,
+                         report["linkedFiles"],
+                         report["linkedBytes"] / 1048576.0))
 
     def register(self, instance):
         context = instance.context
@@ -77,6 +100,7 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
         self.is_progressive = context.data.get("_progressivePublishing")
         self.progress = instance.data.get("_progressiveStep", -1)
         self.progress_output = instance.data.get("_progressiveOutput")
+        self.stat_cache = statcache.get(context)
 
         # Assemble
         #
@@ -146,14 +170,18 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
                 dst = template_publish.format(representation=repr_name,
                                               **template_data)
 
-                self.transfers["files"] += [
-                    ("%s/%s" % (src, tail), "%s/%s" % (dst, tail)) for tail in
-                    instance.data.get("repr.%s._files" % repr_name, [])
-                ]
-                self.transfers["hardlinks"] += [
-                    ("%s/%s" % (src, tail), "%s/%s" % (dst, tail)) for tail in
-                    instance.data.get("repr.%s._hardlinks" % repr_name, [])
-                ]
+                files = instance.data.get("repr.%s._files" % repr_name, [])
+                hardlinks = instance.data.get("repr.%s._hardlinks"
+                                              % repr_name, [])
+
+                self.transfers["files"].append(iter_transfers(
+                    src, dst, files))
+                self.transfers["hardlinks"].append(iter_transfers(
+                    src, dst, hardlinks))
+
+                # File manifest, so published files could be found without
+                # listing the dir. See `reveries.common.get_publish_files`
+                repr_data["fileManifest"] = list(files) + list(hardlinks)
 
             # Filtering representation data
             if not entry.startswith("_"):
@@ -164,17 +192,21 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
     def integrate(self):
         """Move the files
 
-        Through `self.transfers`
+        Through `self.transfers`, files are copied and hardlinked
+        concurrently by `reveries.transfer.FileTransfer`.
+
+        Returns:
+            dict: Transfer report, see `FileTransfer.run`
 
         """
         if self.progress_output is None:
             progress_output = None
         else:
-            progress_output = [
+            progress_output = set(
                 os.path.abspath(
                     os.path.normpath(os.path.expandvars(file)))
                 for file in self.progress_output
-            ]
+            )
 
         # Write to disk
         #          _
@@ -187,23 +219,23 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
         #     \|________|
         #
 
-        transfered = list()
+        methods = {
+            "files": transfer.COPY,
+            "hardlinks": transfer.HARDLINK,
+        }
+        engine = transfer.FileTransfer()
 
         for job in self.transfers:
-            transfers = self.transfers[job]
+            transfers = itertools.chain.from_iterable(self.transfers[job])
 
             for src, dst in transfers:
-                # normpath
-                # self.log.debug("Src. Before: {!r}".format(src))
-                # self.log.debug("Dst. Before: {!r}".format(dst))
-
                 src = os.path.abspath(
                     os.path.normpath(os.path.expandvars(src)))
                 dst = os.path.abspath(
                     os.path.normpath(os.path.expandvars(dst)))
 
                 if self.is_progressive:
-                    if os.path.isfile(dst):
+                    if self.stat_cache.isfile(dst):
                         continue
                     if (progress_output is not None
                             and src not in progress_output):
@@ -217,53 +249,9 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
                                    "will not copy.")
                     continue
 
-                if dst in transfered:
-                    # (TODO) Should not implement like this. This is a hot-fix.
-                    self.log.warning("File transfered: %s" % dst)
-                    continue
-
-                if job == "files":
-                    self.copy_file(src, dst)
-                if job == "hardlinks":
-                    self.hardlink_file(src, dst)
-
-                transfered.append(dst)
-
-    def copy_file(self, src, dst):
-        file_dir = os.path.dirname(dst)
-        if not os.path.isdir(file_dir):
-            try:
-                os.makedirs(file_dir)
-            except Exception as e:
-                self.log.warning("Makedir error: %s" % e)
-        try:
-            shutil.copy2(src, dst)
-        except OSError:
-            msg = "An unexpected error occurred."
-            self.log.critical(msg)
-            raise OSError(msg)
-
-    def hardlink_file(self, src, dst):
-        if os.path.isfile(dst):
-            self.log.warning("File exists, skip creating hardlink: %s" % dst)
-            return
+                engine.add(src, dst, methods[job])
 
-        dirname = os.path.dirname(dst)
-        try:
-            os.makedirs(dirname)
-        except OSError as e:
-            if e.errno == errno.EEXIST:
-                pass
-            else:
-                self.log.critical("An unexpected error occurred.")
-                raise
-
-        try:
-            filelink.create(src, dst, filelink.HARDLINK)
-        except OSError:
-            msg = "An unexpected error occurred."
-            self.log.critical(msg)
-            raise OSError(msg)
+        return engine.run()
 
     def get_subset(self, instance, families):
 
@@ -362,6 +350,8 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
         Returns:
             dict: the required information with instance.data as key
         """
+        from reveries import utils
+
         # create relative source path for DB
         source = context.data["currentMaking"]
         source = source.replace(api.registered_root(), "{root}")
@@ -376,6 +366,8 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
             "author": context.data["user"],
             "task": api.Session.get("AVALON_TASK"),
             "source": source,
+            "sourceKey": utils.source_key(source,
+                                          api.Session["AVALON_PROJECT"]),
             "workDir": work_dir,
             "comment": context.data.get("comment"),
             "dependencies": instance.data.get("dependencies", dict()),
@@ -1,5 +1,4 @@
 
-import os
 import pyblish.api
 
 
@@ -11,6 +10,8 @@ class RemoveVersionLock(pyblish.api.ContextPlugin):
     order = pyblish.api.IntegratorOrder + 0.1
 
     def process(self, context):
+        from reveries import versionlock
+
         if context.data.get("_progressivePublishing", False):
             self.log.info("Progressive publishing, skip version unlock.")
             return
@@ -20,8 +21,12 @@ class RemoveVersionLock(pyblish.api.ContextPlugin):
                 continue
 
             lockfile = instance.data["_versionlock"]
-            os.remove(lockfile)
+            token = instance.data.get("_versionlockToken")
+            if not versionlock.release(lockfile, token):
+                self.log.warning("Version lock has been taken over or "
+                                 "removed: %s" % lockfile)
             # (TODO) If publish process stopped by user, version dir will
-            #        remain locked since this plugin may not be executed.
+            #        remain locked until the lock expired since this plugin
+            #        may not be executed.
             #        To solve this, may require pyblish/pyblish-base#352
             #        be implemented.
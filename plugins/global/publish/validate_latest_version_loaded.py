@@ -14,44 +14,24 @@ class ValidateLatestVersionLoaded(pyblish.api.ContextPlugin):
     label = "Latest Version Loaded"
 
     def process(self, context):
-        host = avalon.api.registered_host()
+        from reveries import lib
 
-        checked = set()
-        outdated = dict()
+        host = avalon.api.registered_host()
 
         # We may have missing representation due to the limited
         # environment. E.g. When Out sourcing the rendering job
         # and the database overthere is incomplete.
-        missing = dict()
 
+        nodes_by_id = dict()
         for container in host.ls():
-            container_node = container["objectName"]
             representation_id = io.ObjectId(container["representation"])
+            nodes_by_id.setdefault(representation_id,
+                                   []).append(container["objectName"])
 
-            if representation_id in checked:
-                if representation_id in outdated:
-                    outdated[representation_id].append(container_node)
-
-                if representation_id in missing:
-                    missing[representation_id].append(container_node)
-
-                continue
-
-            checked.add(representation_id)
-
-            representation = io.find_one({"_id": representation_id})
-            if representation is None:
-                missing[representation_id] = [container_node]
-
-                continue
-
-            version = io.find_one({"_id": representation["parent"]})
-            highest_version = io.find_one({"type": "version",
-                                           "parent": version["parent"]},
-                                          sort=[("name", -1)])
+        outdated_ids, missing_ids = lib.find_outdated(nodes_by_id)
 
-            if version["name"] < highest_version["name"]:
-                outdated[representation_id] = [container_node]
+        outdated = {_id: nodes_by_id[_id] for _id in outdated_ids}
+        missing = {_id: nodes_by_id[_id] for _id in missing_ids}
 
         if outdated:
             nodes = "\n".join(n for x in outdated.values() for n in x)
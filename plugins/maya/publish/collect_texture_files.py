@@ -1,4 +1,5 @@
 
+import os
 import pyblish.api
 
 
@@ -21,6 +22,7 @@ class CollectTextureFiles(pyblish.api.InstancePlugin):
 
     def process(self, instance):
         from maya import cmds
+        from reveries import statcache
         from reveries.maya import lib
 
         file_nodes = instance.data.get("fileNodes",
@@ -29,5 +31,12 @@ class CollectTextureFiles(pyblish.api.InstancePlugin):
 
         instance.data["fileData"] = file_data
 
+        # List texture dirs in one go for later validations and extraction
+        dirs = set()
+        for data in file_data:
+            for fname in data["fnames"]:
+                dirs.add(os.path.dirname(os.path.join(data["dir"], fname)))
+        statcache.get(instance.context).prefetch(dirs)
+
         self.log.info("Collected %d texture files from %s file node."
                       "" % (file_count, len(file_data)))
@@ -11,6 +11,12 @@ def to_tx(path):
 
 class ExtractTexture(pyblish.api.InstancePlugin):
     """Export texture files
+
+    If project data `textureStore` is enabled, texture files are compared
+    by content hash instead of size and modification time, and staged by
+    hardlinking from a content-addressed store under the project root, so
+    identical files are stored only once.
+
     """
 
     label = "Extract Texture"
@@ -21,11 +27,13 @@ class ExtractTexture(pyblish.api.InstancePlugin):
     def process(self, instance):
         import avalon.api
         import avalon.io
-        from reveries import lib, utils
+        from reveries import lib, utils, statcache
         from reveries.maya import plugins, lib as maya_lib
 
         staging_dir = utils.stage_dir(dir=instance.data["_sharedStage"])
         published_dir = self.published_dir(instance)
+        store = self.texture_store(instance)
+        stat_cache = statcache.get(instance.context)
 
         file_inventory = list()
         NEW_OR_CHANGED = list()
@@ -69,6 +77,23 @@ class ExtractTexture(pyblish.api.InstancePlugin):
                 "pathMap": {fn: dir_name + "/" + fn for fn in fnames},
             }
 
+        # List previous and current texture dirs in one go
+        stat_cache.prefetch(
+            os.path.dirname(path)
+            for data in list(CURRENT.values()) + [
+                tmp_data for versioned in PREVIOUS.values()
+                for _, tmp_data in versioned
+            ]
+            for path in data["pathMap"].values()
+        )
+
+        hashes = dict()
+        if store is not None:
+            hashes = utils.hash_files([
+                path for data in CURRENT.values()
+                for path in data["pathMap"].values()
+            ])
+
         # Extract textures
         #
         self.log.info("Extracting textures..")
@@ -98,6 +123,8 @@ class ExtractTexture(pyblish.api.InstancePlugin):
             for ver_data, tmp_data in versioned_data:
 
                 previous_files = tmp_data["pathMap"]
+                previous_hashes = dict(zip(ver_data["fnames"],
+                                           ver_data.get("hashes", [])))
 
                 all_files = list()
                 for file, abs_path in data["pathMap"].items():
@@ -107,12 +134,18 @@ class ExtractTexture(pyblish.api.InstancePlugin):
 
                     abs_previous = previous_files.get(file, "")
 
-                    if not os.path.isfile(abs_previous):
+                    if not stat_cache.isfile(abs_previous):
                         # Previous file not exists (should not happen)
                         break  # Try previous version
 
-                    # Checking on file size and modification time
-                    same_file = lib.file_cmp(abs_path, abs_previous)
+                    if store is not None and file in previous_hashes:
+                        # Checking on file content
+                        same_file = previous_hashes[file] == hashes[abs_path]
+                    else:
+                        # Checking on file size and modification time
+                        same_file = lib.file_cmp(abs_path,
+                                                 abs_previous,
+                                                 stat_cache)
                     if not same_file:
                         # Possible new files
                         break  # Try previous version
@@ -143,12 +176,19 @@ class ExtractTexture(pyblish.api.InstancePlugin):
                 self.log.info("New texture collected from '%s': %s"
                               "" % (data["node"], fpattern))
 
-                NEW_OR_CHANGED.append({
+                inventory = {
                     "fpattern": fpattern,
                     "version": new_version,
                     "colorSpace": current_color_space,
                     "fnames": data["fnames"],
-                })
+                }
+                if store is not None:
+                    # (NOTE) Stored as list in the same order of "fnames",
+                    #   file names can't be document keys because of dots.
+                    inventory["hashes"] = [
+                        hashes[data["pathMap"][fn]] for fn in data["fnames"]
+                    ]
+                NEW_OR_CHANGED.append(inventory)
 
                 all_files = list()
                 for file, abs_path in data["pathMap"].items():
@@ -198,10 +238,21 @@ class ExtractTexture(pyblish.api.InstancePlugin):
         #   will do nothing when the Deadline extraction script runs in
         #   each tasks.
         #
-        instance.data["repr.TexturePack._delayRun"] = {
-            "func": self.mock_stage,
-        }
-        self.stage_textures(staging_dir, files_to_copy)
+        #   When publishing in local, staging is run by
+        #   `DelayedExtractionRunner` off the main thread, concurrently
+        #   with other instances' extraction.
+        #
+        if "deadline" in pyblish.api.registered_targets():
+            instance.data["repr.TexturePack._delayRun"] = {
+                "func": self.mock_stage,
+            }
+            self.stage(staging_dir, files_to_copy, store, hashes)
+        else:
+            instance.data["repr.TexturePack._delayRun"] = {
+                "func": self.stage,
+                "args": [staging_dir, files_to_copy, store, hashes],
+                "threadSafe": True,
+            }
 
     def update_file_node_attrs(self, instance, file_nodes, path, color_space):
         # (NOTE) All input `file_nodes` will be set to same `color_space`
@@ -240,7 +291,46 @@ class ExtractTexture(pyblish.api.InstancePlugin):
 
         return plugins.env_embedded_path(published_dir)
 
+    def texture_store(self, instance):
+        """Return project's texture `ContentStore` or None if not enabled"""
+        from reveries.transfer import ContentStore
+
+        project = instance.context.data["projectDoc"]
+        if not project["data"].get("textureStore"):
+            return None
+
+        root = instance.data["publishPathTemplateData"]["root"]
+        store_root = "/".join([root, project["name"], ".textureStore"])
+
+        return ContentStore(store_root)
+
+    def stage(self, staging_dir, files_to_copy, store=None, hashes=None):
+        """Stage texture files, from content store if provided"""
+        if store is None:
+            self.stage_textures(staging_dir, files_to_copy)
+        else:
+            self.stage_from_store(staging_dir, files_to_copy, store, hashes)
+
+    def stage_from_store(self, staging_dir, files_to_copy, store, hashes):
+        """Store new textures by content and hardlink them into stage"""
+        from reveries import utils
+
+        missing = [src for src in files_to_copy.values() if src not in hashes]
+        hashes.update(utils.hash_files(missing))
+
+        for file, src in files_to_copy.items():
+            c4id = hashes[src]
+            if store.has(c4id):
+                self.log.info("Stored %s" % src)
+            else:
+                self.log.info("Storing %s" % src)
+                store.add(src, c4id)
+
+            store.link(c4id, staging_dir + "/" + file)
+
     def stage_textures(self, staging_dir, files_to_copy):
+        from reveries import statcache
+
         for file, src in files_to_copy.items():
 
             dst = staging_dir + "/" + file
@@ -252,6 +342,7 @@ class ExtractTexture(pyblish.api.InstancePlugin):
             try:
                 self.log.info("Staging %s" % src)
                 shutil.copy2(src, dst)
+                statcache.invalidate(dst)
             except OSError:
                 msg = "An unexpected error occurred."
                 self.log.critical(msg)
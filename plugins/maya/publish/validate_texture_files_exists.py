@@ -1,7 +1,7 @@
 
 import os
 import pyblish.api
-from reveries import plugins
+from reveries import plugins, statcache
 
 
 class OpenFilePathEditor(pyblish.api.Action):
@@ -34,13 +34,14 @@ class ValidateTextureFilesExists(pyblish.api.InstancePlugin):
     @classmethod
     def get_invalid(cls, instance):
         invalid = dict()
+        stat_cache = statcache.get(instance.context)
 
         for data in instance.data.get("fileData", []):
             node = data["node"]
             for file in data["fnames"]:
                 file_path = os.path.join(data["dir"], file)
 
-                if not os.path.isfile(file_path):
+                if not stat_cache.isfile(file_path):
                     if node not in invalid:
                         invalid[node] = [file_path]
                     else:
@@ -1,12 +1,13 @@
 
 import os
 import pyblish.api
-from reveries import plugins
+from reveries import plugins, statcache
 
 
-def tx_updated(source, tx):
+def tx_updated(source, tx, stat_cache=None):
     # TX map's modification time takes no decimal places.
-    int_mtime = (lambda f: int(os.path.getmtime(f)))
+    getmtime = (stat_cache or os.path).getmtime
+    int_mtime = (lambda f: int(getmtime(f)))
     return int_mtime(source) == int_mtime(tx)
 
 
@@ -45,23 +46,24 @@ class ValidateTextureTxMapUpdated(pyblish.api.InstancePlugin):
     @classmethod
     def get_invalid(cls, instance):
         invalid = list()
+        stat_cache = statcache.get(instance.context)
         for data in instance.data.get("fileData", []):
             node = data["node"]
             for file in data["fnames"]:
                 file_path = os.path.join(data["dir"], file)
-                if not os.path.isfile(file_path):
+                if not stat_cache.isfile(file_path):
                     cls.log.warning("File node '%s' map not exists, "
                                     "TX validation skip." % node)
                     continue
 
                 tx_path = os.path.splitext(file_path)[0] + ".tx"
-                if not os.path.isfile(tx_path):
+                if not stat_cache.isfile(tx_path):
                     cls.log.error("<%s> has no existing TX map: %s"
                                   % (node, tx_path))
                     invalid.append(node)
                     break
 
-                if not tx_updated(file_path, tx_path):
+                if not tx_updated(file_path, tx_path, stat_cache):
                     cls.log.error("<%s> has no modification time matched "
                                   "TX map: %s" % (node, tx_path))
                     invalid.append(node)
@@ -1,6 +1,105 @@
 import os
 from avalon import io, api
 
+from reveries import lib, doccache, sequence
+
+
+# Representation data key of published file names, written by
+# `IntegrateAvalonSubset`. Entries are file names relative to the
+# representation dir, or sequence descriptors (see `reveries.sequence`).
+MANIFEST = "fileManifest"
+
+
+def _in_progress(version):
+    """Return True if progressive publish of the version not yet complete"""
+    progress = version.get('data', {}).get('progress')
+    if not progress:
+        return False
+    return progress.get('current', 0) < progress.get('total', 0)
+
+
+def _existing(paths):
+    """Return paths that exist, listing each parent dir once"""
+    listed = dict()
+    existing = []
+    for path in paths:
+        dir_name, file_name = path.rsplit('/', 1)
+        if dir_name not in listed:
+            try:
+                listed[dir_name] = set(os.listdir(dir_name))
+            except OSError:
+                listed[dir_name] = set()
+        if file_name in listed[dir_name]:
+            existing.append(path)
+    return existing
+
+
+def _representation_files(publish_dir, representation, key='',
+                          in_progress=False):
+    """
+    Get publish files of one representation.
+
+    :param publish_dir: (str) Representation publish dir
+    :param representation: (dict) Representation document
+    :param key: (str) Get publish file from key value.
+    :param in_progress: (bool) Version is being progressively published,
+        manifest files not yet integrated are excluded.
+    :return: (list or str) File paths, str if key value is not a list
+    """
+    join = (lambda name: os.path.join(publish_dir, name).replace('\\', '/'))
+    repr_data = representation.get('data', {})
+
+    if key:
+        files_data = repr_data.get(key, '')
+        if not files_data:
+            return []
+        if isinstance(files_data, list):
+            return [join(_path) for _path in files_data]
+        return join(files_data)
+
+    if MANIFEST in repr_data:
+        files = [join(_file)
+                 for _file in sequence.iter_files(repr_data[MANIFEST])]
+        if in_progress:
+            # Manifest lists all expected files
+            files = _existing(files)
+        return files
+
+    # Published before manifest exists
+    files = os.listdir(publish_dir) if os.path.exists(publish_dir) else None
+    if not files:
+        print('No files found in publish dir: {}.'.format(publish_dir))
+        # TODO: Texture publish files has different format,
+        #  will add it later
+        return []
+
+    return [join(_file) for _file in files]
+
+
+def _publish_files(project, asset, subset, version, representations,
+                   key=''):
+    publish_template = project["config"]["template"]["publish"]
+    in_progress = _in_progress(version)
+
+    _pub_file = {}
+    for _rep in representations:
+        representation_name = _rep['name']
+
+        _dir = publish_template.format(**{
+            "root": api.registered_root(),
+            "project": project["name"],
+            "asset": asset["name"],
+            "silo": asset["silo"],
+            "subset": subset["name"],
+            "version": version["name"],
+            "representation": representation_name,
+        })
+
+        _pub_file[representation_name] = _representation_files(
+            _dir, _rep, key, in_progress=in_progress)
+
+    return _pub_file
+
 
 def get_files(subset_id, version=None, key=''):
     """
@@ -41,48 +140,77 @@ def get_files(subset_id, version=None, key=''):
     _filter = {"type": "asset", "_id": subset_data['parent']}
     asset_data = io.find_one(_filter)
 
-    #
-    project = io.find_one({"name": api.Session["AVALON_PROJECT"],
-                           "type": "project"})
-    publish_template = project["config"]["template"]["publish"]
+    project = doccache.project()
 
-    _pub_file = {}
-    for _rep in representation_data:
-        representation_name = _rep['name']
+    return _publish_files(project,
+                          asset_data,
+                          subset_data,
+                          version_data,
+                          representation_data,
+                          key)
 
-        _dir = publish_template.format(**{
-            "root": api.registered_root(),
-            "project": project["name"],
-            "asset": asset_data["name"],
-            "silo": asset_data["silo"],
-            "subset": subset_data["name"],
-            "version": version_data["name"],
-            "representation": representation_name,
-        })
 
-        _pub_file[representation_name] = []
-
-        if key:
-            files_data = _rep.get('data', {}).get(key, '')
-            if files_data:
-                if isinstance(files_data, list):
-                    for _path in files_data:
-                        _pub_file[representation_name].append(
-                            os.path.join(_dir, _path).replace('\\', '/'))
-                else:  # if isinstance(files_data, (str, unicode)):  # unicode
-                    _pub_file[representation_name] = \
-                        os.path.join(_dir, files_data).replace('\\', '/')
-
-            return _pub_file
-
-        files = os.listdir(_dir) if os.path.exists(_dir) else None
-        if files:
-            for _file in files:
-                _file_path = os.path.join(_dir, _file).replace('\\', '/')
-                _pub_file[representation_name].append(_file_path)
-        else:
-            print('No files found in publish dir: {}.'.format(_dir))
-            # TODO: Texture publish files has different format,
-            #  will add it later
+def get_files_many(subset_ids, key=''):
+    """
+    Get latest publish files of many subsets.
 
-    return _pub_file
+    Latest versions of all subsets are found in one aggregation, then
+    subsets, assets and representations are fetched with one `$in` query
+    each. Files are listed from representation's file manifest, publish
+    dir is only listed if the representation has no manifest, or the
+    version is still being progressively published.
+
+    :param subset_ids: (list) Subset ids
+    :param key: (str) Get publish file from key value. eg. key='entryFileName'
+    :return: (dict) {subset id (str): {representation name: files}},
+        subset that has no version will not be included.
+    """
+    subset_ids = list(set(io.ObjectId(str(_id)) for _id in subset_ids))
+    if not subset_ids:
+        return {}
+
+    collection = lib.project_collection()
+    pipeline = [
+        {"$match": {"type": "version", "parent": {"$in": subset_ids}}},
+        {"$sort": {"name": -1}},
+        {"$group": {"_id": "$parent", "version": {"$first": "$$ROOT"}}},
+    ]
+    versions = {doc["_id"]: doc["version"]
+                for doc in collection.aggregate(pipeline)}
+    if not versions:
+        print('No version data found.')
+        return {}
+
+    subsets = {
+        doc["_id"]: doc for doc in
+        io.find({"type": "subset", "_id": {"$in": list(versions)}},
+                projection={"name": True, "parent": True})
+    }
+    assets = {
+        doc["_id"]: doc for doc in
+        io.find({"type": "asset",
+                 "_id": {"$in": list(set(s["parent"]
+                                         for s in subsets.values()))}},
+                projection={"name": True, "silo": True})
+    }
+
+    representations = dict()
+    for _rep in io.find({"type": "representation",
+                         "parent": {"$in": [v["_id"]
+                                            for v in versions.values()]}}):
+        representations.setdefault(_rep["parent"], []).append(_rep)
+
+    project = doccache.project()
+
+    _pub_files = {}
+    for subset_id, version_data in versions.items():
+        subset_data = subsets[subset_id]
+        _pub_files[str(subset_id)] = _publish_files(
+            project,
+            assets[subset_data["parent"]],
+            subset_data,
+            version_data,
+            representations.get(version_data["_id"], []),
+            key)
+
+    return _pub_files
@@ -1,6 +1,175 @@
+import copy
+import time
+import threading
+
 from avalon import io, api
 
-import get_publish_files
+from reveries import lib, doccache
+from reveries.common import get_publish_files
+
+
+_resolved = dict()  # {(project name, path): (expire time, PathResolver)}
+_lock = threading.Lock()
+
+
+def _project_root(project):
+    project_template_path = r'{root}/{project}/Avalon/'
+    return project_template_path.format(**{
+        "root": api.registered_root(),
+        "project": project["name"]
+    })
+
+
+def resolve_many(paths, ttl=doccache.TTL):
+    """Resolve many file paths with batched queries
+
+    All paths are parsed first, then asset, subset, version (current and
+    latest) and representation documents of all of them are fetched with
+    a few `$in` queries and one aggregation, instead of one chain of
+    `find_one` per path.
+
+    Resolved paths are memoized per project for `ttl` seconds, so paths
+    resolved by previous calls are not queried again. Published paths
+    which documents are not found are not memoized. Returned resolvers
+    are copies, resolving more on them won't affect the memo.
+
+    :param paths: (list) File paths
+    :param ttl: (float) Seconds to memoize resolved paths, 0 to disable
+    :return: (dict) {path: PathResolver}, same path is only resolved once
+    """
+    project = doccache.project()
+    now = time.time()
+
+    resolvers = dict()
+    resolving = dict()
+    for path in paths:
+        if path in resolvers or path in resolving:
+            continue
+
+        with _lock:
+            cached = _resolved.get((project["name"], path))
+        if cached is not None and cached[0] > now:
+            resolvers[path] = copy.copy(cached[1])
+            continue
+
+        resolver = PathResolver()
+        resolver.analysis_path(path, project=project)
+        resolving[path] = resolver
+
+    _resolve(list(resolving.values()))
+
+    if ttl > 0:
+        with _lock:
+            for key in [key for key, (expire, _) in _resolved.items()
+                        if expire <= now]:
+                del _resolved[key]
+            for path, resolver in resolving.items():
+                if (resolver.is_publish
+                        and not resolver.current_representation_id):
+                    # Not found, it may be published soon.
+                    continue
+                _resolved[(project["name"], path)] = (now + ttl,
+                                                      copy.copy(resolver))
+
+    resolvers.update(resolving)
+    return resolvers
+
+
+def _resolve(resolvers):
+    """Fetch documents of parsed resolvers with batched queries"""
+    published = [r for r in resolvers if r.is_publish]
+    if not published:
+        return
+
+    # Assets
+    names = set(r.asset_name for r in published)
+    assets = {
+        doc["name"]: doc for doc in
+        io.find({"type": "asset", "name": {"$in": list(names)}},
+                projection={"name": True})
+    }
+
+    # Subsets
+    names = set(r.subset_name for r in published)
+    parents = [doc["_id"] for doc in assets.values()]
+    subsets = {
+        (doc["parent"], doc["name"]): doc for doc in
+        io.find({"type": "subset",
+                 "name": {"$in": list(names)},
+                 "parent": {"$in": parents}})
+    }
+
+    for resolver in published:
+        asset = assets.get(resolver.asset_name)
+        if asset is None:
+            continue
+        resolver.asset_id = asset["_id"]
+
+        subset = subsets.get((asset["_id"], resolver.subset_name))
+        if subset is None:
+            continue
+        resolver.subset_data = subset
+        resolver.subset_id = subset["_id"]
+
+    # Versions
+    resolved = [r for r in published if r.subset_id]
+    if not resolved:
+        return
+
+    subset_ids = list(set(r.subset_id for r in resolved))
+    names = set()
+    for resolver in resolved:
+        try:
+            names.add(resolver._version_num())
+        except ValueError:
+            pass
+    versions = {
+        (doc["parent"], doc["name"]): doc for doc in
+        io.find({"type": "version",
+                 "name": {"$in": list(names)},
+                 "parent": {"$in": subset_ids}})
+    }
+
+    collection = lib.project_collection()
+    pipeline = [
+        {"$match": {"type": "version", "parent": {"$in": subset_ids}}},
+        {"$sort": {"name": -1}},
+        {"$group": {"_id": "$parent", "latest": {"$first": "$$ROOT"}}},
+    ]
+    latest = {doc["_id"]: doc["latest"]
+              for doc in collection.aggregate(pipeline)}
+
+    for resolver in resolved:
+        if resolver.subset_id in latest:
+            resolver._set_latest(latest[resolver.subset_id])
+        try:
+            version = versions.get((resolver.subset_id,
+                                    resolver._version_num()))
+        except ValueError:
+            version = None
+        if version is not None:
+            resolver.version_data = version
+            resolver.current_version_id = version["_id"]
+
+    # Representations
+    resolved = [r for r in resolved if r.current_version_id]
+    if not resolved:
+        return
+
+    names = set(r.representation_name for r in resolved)
+    version_ids = list(set(r.current_version_id for r in resolved))
+    representations = {
+        (doc["parent"], doc["name"]): doc for doc in
+        io.find({"type": "representation",
+                 "name": {"$in": list(names)},
+                 "parent": {"$in": version_ids}},
+                projection={"name": True, "parent": True})
+    }
+    for resolver in resolved:
+        representation = representations.get(
+            (resolver.current_version_id, resolver.representation_name))
+        if representation is not None:
+            resolver.current_representation_id = representation["_id"]
 
 
 class PathResolver(object):
@@ -18,25 +187,31 @@ class PathResolver(object):
 
         self.subset_data = {}
         self.version_data = {}
+        self.latest_version_data = {}
         self.latest_version_name = ''
 
         if file_path:
             self.file_path = file_path.replace('\\', '/')
             self.analysis_path()
 
-    def analysis_path(self, file_path=None):
+    def _reset(self):
+        # Documents resolved from previous path
+        self.asset_id = ''
+        self.subset_id = ''
+        self.current_version_id = ''
+        self.current_representation_id = ''
+        self.subset_data = {}
+        self.version_data = {}
+        self.latest_version_data = {}
+        self.latest_version_name = ''
+
+    def analysis_path(self, file_path=None, project=None):
         if file_path:
             self.file_path = file_path.replace('\\', '/')
+        self._reset()
 
-        project = io.find_one({"name": api.Session["AVALON_PROJECT"],
-                               "type": "project"})
-        publish_template_path = project["config"]["template"]["publish"]
-
-        project_template_path = r'{root}/{project}/Avalon/'
-        project_root = project_template_path.format(**{
-            "root": api.registered_root(),
-            "project": project["name"]
-        })
+        project = project or doccache.project()
+        project_root = _project_root(project)
         # print('project_root: ', project_root)
 
         # Get silo name
@@ -58,7 +233,17 @@ class PathResolver(object):
     def is_publish_file(self):
         return self.is_publish
 
+    def _version_num(self):
+        return int(self.current_version_name.replace("v", ""))
+
+    def _set_latest(self, version_data):
+        self.latest_version_data = version_data
+        self.latest_version_name = "v{:03}".format(version_data["name"])
+
     def get_asset_id(self):
+        if self.asset_id:
+            return self.asset_id
+
         _filter = {"type": "asset",
                    "name": self.asset_name}
         asset_data = io.find_one(_filter)
@@ -67,6 +252,9 @@ class PathResolver(object):
         return self.asset_id
 
     def get_subset_id(self):
+        if self.subset_id:
+            return self.subset_id
+
         self.get_asset_id()
 
         _filter = {"type": "subset",
@@ -77,9 +265,12 @@ class PathResolver(object):
         return self.subset_id
 
     def get_version_id(self):
+        if self.current_version_id:
+            return self.current_version_id
+
         self.get_subset_id()
 
-        version_num = int(self.current_version_name.replace("v", ""))
+        version_num = self._version_num()
 
         _filter = {
             "type": "version",
@@ -92,6 +283,9 @@ class PathResolver(object):
         return self.current_version_id
 
     def get_representation_id(self):
+        if self.current_representation_id:
+            return self.current_representation_id
+
         current_version_id = self.get_version_id()
 
         _filter = {
@@ -105,6 +299,9 @@ class PathResolver(object):
         return self.current_representation_id
 
     def _get_latest_version_id(self):
+        if self.latest_version_data:
+            return self.latest_version_data
+
         self.get_subset_id()
 
         _filter = {
@@ -112,7 +309,7 @@ class PathResolver(object):
             "parent": self.subset_id
         }
         version_data = io.find_one(_filter, sort=[("name", -1)])
-        self.latest_version_name = "v{:03}".format(version_data["name"])
+        self._set_latest(version_data)
 
         return version_data
 
@@ -5,6 +5,7 @@ import errno
 from avalon import api, io
 from avalon.vendor import filelink
 
+from reveries import sequence
 from reveries.common import str_to_objectid
 
 
@@ -91,6 +92,10 @@ class PublishInstance(object):
         without error.
 
         """
+        from reveries import lib, utils
+
+        utils.ensure_source_key_index(lib.project_collection())
+
         # Write version
         #
         print("Registering version {} to database ...".format(version["name"]))
@@ -235,15 +240,22 @@ class IntegrateAvalonSubset(object):
                 dst = template_publish.format(representation=repr_name,
                                               **template_data)
 
+                files = instance.data.get("repr.%s._files" % repr_name, [])
+                hardlinks = instance.data.get("repr.%s._hardlinks"
+                                              % repr_name, [])
+
                 self.transfers["files"] += [
                     ("%s/%s" % (src, tail), "%s/%s" % (dst, tail)) for tail in
-                    instance.data.get("repr.%s._files" % repr_name, [])
+                    sequence.iter_files(files)
                 ]
                 self.transfers["hardlinks"] += [
                     ("%s/%s" % (src, tail), "%s/%s" % (dst, tail)) for tail in
-                    instance.data.get("repr.%s._hardlinks" % repr_name, [])
+                    sequence.iter_files(hardlinks)
                 ]
 
+                # File manifest, see `reveries.common.get_publish_files`
+                repr_data["fileManifest"] = list(files) + list(hardlinks)
+
             # Filtering representation data
             if not entry.startswith("_"):
                 _repr_data[repr_name][entry] = instance.data[key]
@@ -444,6 +456,8 @@ class IntegrateAvalonSubset(object):
         Returns:
             dict: the required information with instance.data as key
         """
+        from reveries import utils
+
         # create relative source path for DB
         source = context.data["currentMaking"]
         source = source.replace(api.registered_root(), "{root}")
@@ -458,6 +472,8 @@ class IntegrateAvalonSubset(object):
             "author": context.data["user"],
             "task": api.Session.get("AVALON_TASK"),
             "source": source,
+            "sourceKey": utils.source_key(source,
+                                          api.Session["AVALON_PROJECT"]),
             "workDir": work_dir,
             "comment": context.data.get("comment"),
             "dependencies": instance.data.get("dependencies", dict()),
@@ -1,6 +1,6 @@
 from pxr import Usd
 
-from reveries.common.path_resolver import PathResolver
+from reveries.common.path_resolver import resolve_many
 
 
 class CheckPath(object):
@@ -19,9 +19,10 @@ class CheckPath(object):
         layers = [s.replace('\\', '/')
                   for s in root_layer.GetExternalReferences() if s]
 
+        resolvers = resolve_many(layers)
         for _path in layers:
             if _path:
-                _path_resolver = PathResolver(file_path=_path)
+                _path_resolver = resolvers[_path]
                 if not _path_resolver.is_publish_file():
                     self.not_publish.append(_path)
                     self.all_from_pub = False
@@ -26,9 +26,11 @@ class SetDressPrimExport(object):
 
         setdress_usd_files = []
         if setdress_datas:
+            publish_files = get_publish_files.get_files_many(
+                [_setdress_data['_id'] for _setdress_data in setdress_datas])
             for _setdress_data in setdress_datas:
-                publish_files = get_publish_files.get_files(_setdress_data['_id'])
-                setdress_usd_files += publish_files.get('USD', [])
+                setdress_usd_files += publish_files.get(
+                    str(_setdress_data['_id']), {}).get('USD', [])
 
         return setdress_usd_files
 
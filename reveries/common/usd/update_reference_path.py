@@ -1,5 +1,5 @@
 from pxr import Usd, Sdf
-from reveries.common.path_resolver import PathResolver
+from reveries.common.path_resolver import resolve_many
 
 
 def update(usd_file=None, output_path=None):
@@ -7,6 +7,7 @@ def update(usd_file=None, output_path=None):
     root_layer = source_stage.GetRootLayer()
     layers = [s.replace('\\', '/')
               for s in root_layer.GetExternalReferences() if s]
+    resolvers = resolve_many(layers)
 
     for prim in source_stage.Traverse():
 
@@ -23,7 +24,7 @@ def update(usd_file=None, output_path=None):
                 current_path = _layer.realPath.replace('\\', '/')
 
                 if current_path in layers:
-                    _path_resolver = PathResolver(file_path=current_path)
+                    _path_resolver = resolvers[current_path]
                     latest_file_path = _path_resolver.get_latest_file()
                     if latest_file_path != current_path:
                         if isinstance(latest_file_path, list):
@@ -0,0 +1,106 @@
+"""Session scoped cache of project and asset documents
+
+Project and asset documents are read over and over by scene setup
+helpers (timeline, resolution, linear unit) and publish collectors, and
+they rarely change within a session. Documents are cached here for `TTL`
+seconds, per project:
+
+    >>> from reveries import doccache
+    >>> project = doccache.project()
+    >>> asset = doccache.asset("sh0100")
+    >>> doccache.stats()
+    {'hits': 0, 'misses': 2}
+
+Call `invalidate` after documents being modified, cache will also be
+dropped when the task changed in host.
+
+Returned documents are copies, modifying them won't affect the cache.
+
+"""
+import copy
+import time
+import threading
+
+import avalon.io
+import avalon.api
+
+
+TTL = 60  # Seconds
+
+_cache = dict()  # {key: (expire time, document)}
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _project_name():
+    return avalon.api.Session.get("AVALON_PROJECT")
+
+
+def _get(key, filter, ttl):
+    now = time.time()
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] > now:
+            _stats["hits"] += 1
+            return copy.deepcopy(cached[1])
+        _stats["misses"] += 1
+
+    document = avalon.io.find_one(filter)
+    if document is not None:
+        # Missing document is not cached, it may be created soon.
+        with _lock:
+            _cache[key] = (now + ttl, document)
+
+    return copy.deepcopy(document)
+
+
+def project(ttl=TTL):
+    """Return current project document
+
+    Args:
+        ttl (int, optional): Seconds to keep the document, default `TTL`
+
+    Returns:
+        dict: Project document or None if not found
+
+    """
+    return _get(("project", _project_name()), {"type": "project"}, ttl)
+
+
+def asset(name=None, ttl=TTL):
+    """Return asset document of current project
+
+    Args:
+        name (str, optional): Asset name, get from `avalon.Session` if
+            not provided.
+        ttl (int, optional): Seconds to keep the document, default `TTL`
+
+    Returns:
+        dict: Asset document or None if not found
+
+    """
+    name = name or avalon.api.Session["AVALON_ASSET"]
+    return _get(("asset", _project_name(), name),
+                {"name": name, "type": "asset"},
+                ttl)
+
+
+def invalidate(asset_name=None):
+    """Drop cached documents
+
+    Args:
+        asset_name (str, optional): Only drop this asset of current
+            project, drop all documents if not given.
+
+    """
+    with _lock:
+        if asset_name is None:
+            _cache.clear()
+        else:
+            _cache.pop(("asset", _project_name(), asset_name), None)
+
+
+def stats():
+    """Return cache hit and miss counts"""
+    with _lock:
+        return dict(_stats)
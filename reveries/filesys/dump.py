@@ -0,0 +1,95 @@
+"""Read and write publish dump files
+
+Dump format is chosen by file extension:
+
+    .json       Compact JSON
+    .json.gz    Gzip compressed JSON
+    .msgpack    MessagePack, requires `msgpack` module
+
+Sets are dumped as lists, and other objects that couldn't be serialized
+are dumped as string.
+
+"""
+import gzip
+import json
+
+
+JSON = ".json"
+GZIP = ".json.gz"
+MSGPACK = ".msgpack"
+
+EXTENSIONS = (GZIP, JSON, MSGPACK)
+
+
+class PyblishEncoder(json.JSONEncoder):
+
+    def default(self, obj):
+        if isinstance(obj, set):
+            return list(obj)
+        try:
+            return json.JSONEncoder.default(self, obj)
+        except TypeError:
+            return str(obj)
+
+
+def ext_of(path):
+    """Return dump format extension of the file path, or None if unknown"""
+    for ext in EXTENSIONS:
+        if path.endswith(ext):
+            return ext
+    return None
+
+
+def is_dump(path):
+    return ext_of(path) is not None
+
+
+def _json_encode(data):
+    return json.dumps(data, separators=(",", ":"), cls=PyblishEncoder)
+
+
+def dump(data, path):
+    """Write data into dump file, format chosen by file extension"""
+    ext = ext_of(path)
+
+    if ext == JSON:
+        with open(path, "w") as file:
+            file.write(_json_encode(data))
+
+    elif ext == GZIP:
+        with gzip.open(path, "wb") as file:
+            file.write(_json_encode(data).encode("utf-8"))
+
+    elif ext == MSGPACK:
+        import msgpack
+
+        with open(path, "wb") as file:
+            msgpack.pack(data,
+                         file,
+                         default=PyblishEncoder().default,
+                         use_bin_type=True)
+
+    else:
+        raise ValueError("Unknown dump format: %s" % path)
+
+
+def load(path):
+    """Read data from dump file, format chosen by file extension"""
+    ext = ext_of(path)
+
+    if ext == JSON:
+        with open(path, "r") as file:
+            return json.load(file)
+
+    elif ext == GZIP:
+        with gzip.open(path, "rb") as file:
+            return json.loads(file.read().decode("utf-8"))
+
+    elif ext == MSGPACK:
+        import msgpack
+
+        with open(path, "rb") as file:
+            return msgpack.unpack(file, raw=False)
+
+    else:
+        raise ValueError("Unknown dump format: %s" % path)
@@ -0,0 +1,486 @@
+"""Long-lived progressive publish worker
+
+Instead of starting a new interpreter to publish every finished Deadline
+task, post task script `publish_by_task` puts the task's output into a
+queue directory next to the dump file, and one worker per dump keeps
+Avalon installed and plugins discovered, publishing queued tasks in
+batches.
+
+Queue directory layout (`<dump file>.queue`):
+
+    worker.lock         JSON, {"token": str, "beat": int, "host": str,
+                        "pid": int}. Created exclusively by whom starts
+                        the worker, the worker increases "beat" as
+                        heartbeat.
+    <name>.task         JSON, {"progress": int, "files": [str]}
+    <name>.task.taken.<token>
+                        Task claimed by the worker which holds the token.
+    <name>.result       JSON, {"returncode": int, "log": str}, written by
+                        worker once the task has been published.
+    progress.journal    JSON, version progress buffered by the worker but
+                        not yet written to database, see
+                        `reveries.lib.ProgressCounter`.
+
+Buffered progress is saved to journal before task result is written, and
+loaded by next worker if this one got killed, so no published task loses
+its progress.
+
+Task and result files are written to a temporary name then renamed, so
+they are never read half-written. Tasks are claimed by renaming, so one
+task is published by one worker only.
+
+Worker's liveness is judged by whether the lock's token or beat changes
+within `STALE` seconds of the observer's own clock, so nodes' clocks do
+not have to agree. Stale lock is taken over by renaming it away, the same
+way as `reveries.versionlock`.
+
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import logging
+import threading
+import contextlib
+
+from ..vendor import six
+
+
+log = logging.getLogger("reveries.filesys.worker")
+
+
+LOCK = "worker.lock"
+TASK_EXT = ".task"
+TAKEN = ".taken."
+RESULT_EXT = ".result"
+JOURNAL = "progress.journal"
+
+HEARTBEAT = 5  # Seconds between heartbeat
+STALE = 60  # Seconds without heartbeat before a worker considered dead
+IDLE_TIMEOUT = 120  # Seconds without task before worker quits
+RESULT_TIMEOUT = 3600
+POLL_INTERVAL = 1
+
+_clock = getattr(time, "monotonic", time.time)
+
+
+def queue_dir(dump_file):
+    """Return worker queue directory path of the dump file"""
+    return dump_file + ".queue"
+
+
+def write_json(path, data):
+    """Write JSON file atomically"""
+    tmp = "%s.%s.tmp" % (path, uuid.uuid4().hex)
+    with open(tmp, "w") as file:
+        json.dump(data, file)
+    try:
+        os.rename(tmp, path)
+    except OSError:
+        # Windows can not rename onto existing file
+        os.remove(path)
+        os.rename(tmp, path)
+
+
+def read_json(path):
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def result_path(task_file):
+    """Return result file path of the task file"""
+    return task_file[:-len(TASK_EXT)] + RESULT_EXT
+
+
+def enqueue(queue, progress, files):
+    """Put task output into worker queue, return task file path"""
+    if not os.path.isdir(queue):
+        try:
+            os.makedirs(queue)
+        except OSError:
+            if not os.path.isdir(queue):
+                raise
+
+    task_file = os.path.join(queue, "%s%s" % (uuid.uuid4().hex, TASK_EXT))
+    write_json(task_file, {"progress": progress, "files": files})
+
+    return task_file
+
+
+def read_lock(lock):
+    """Return worker lock data, or None if not locked"""
+    try:
+        data = read_json(lock)
+    except (IOError, OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def create_lock(lock):
+    """Create worker lock exclusively, return token or None if locked"""
+    token = uuid.uuid4().hex
+    try:
+        fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except OSError:
+        return None
+
+    data = {
+        "token": token,
+        "beat": 0,
+        "host": socket.gethostname(),
+        "pid": os.getpid(),
+    }
+    try:
+        os.write(fd, json.dumps(data).encode("utf-8"))
+    finally:
+        os.close(fd)
+    return token
+
+
+def takeover_lock(lock, stale):
+    """Remove stale lock, return False if it has changed or been taken
+
+    Arguments:
+        lock (str): Lock file path
+        stale (dict): Lock data which has been observed as stale
+
+    """
+    moved = "%s.%s.stale" % (lock, uuid.uuid4().hex)
+    try:
+        os.rename(lock, moved)
+    except OSError:
+        return False  # Other waiter took it first
+
+    data = read_lock(moved)
+    if data is not None and (data.get("token"), data.get("beat")) != (
+            stale.get("token"), stale.get("beat")):
+        # Worker beat or other has taken over right before we renamed,
+        # give it back.
+        try:
+            os.rename(moved, lock)
+        except OSError:
+            pass
+        return False
+
+    try:
+        os.remove(moved)
+    except OSError:
+        pass
+    return True
+
+
+def release_lock(lock, token):
+    """Remove lock if it is still owned by the token"""
+    data = read_lock(lock)
+    if data is None or data.get("token") != token:
+        return False
+    try:
+        os.remove(lock)
+    except OSError:
+        return False
+    return True
+
+
+class LockWatch(object):
+    """Observe worker lock and tell whether the worker is alive
+
+    The lock is stale if its token and beat have not been changed for
+    `stale` seconds, measured by observer's clock.
+
+    """
+
+    def __init__(self, lock, stale=STALE):
+        self.lock = lock
+        self.stale = stale
+        self._seen = None
+        self._since = None
+
+    def observe(self):
+        """Read lock, return (data, is_stale), data is None if no lock"""
+        data = read_lock(self.lock)
+        if data is None:
+            if not os.path.exists(self.lock):
+                self._seen = None
+                return None, False
+            data = dict()  # Being written or corrupted
+
+        now = _clock()
+        state = (data.get("token"), data.get("beat"))
+        if state != self._seen:
+            self._seen = state
+            self._since = now
+
+        return data, now - self._since > self.stale
+
+    def acquire(self):
+        """Return new lock token if no live worker is holding the lock
+
+        Returns:
+            str: Token for new worker, or None if worker alive or other
+                waiter has started one.
+
+        """
+        data, stale = self.observe()
+        if data is not None:
+            if not stale:
+                return None  # Worker alive
+            log.warning("Publish worker stopped responding, restarting..")
+            if not takeover_lock(self.lock, data):
+                return None
+
+        return create_lock(self.lock)
+
+
+class PublishWorker(object):
+    """Publish queued progressive outputs with one warm pyblish session
+
+    Arguments:
+        dump_file (str): Context or Instance dump file path
+        job_id (str, optional): Deadline job id to be registered with
+        token (str, optional): Worker lock token given by whom created the
+            lock, lock will be created if not provided.
+        idle_timeout (int, optional): Seconds without task before quit
+
+    """
+
+    def __init__(self,
+                 dump_file,
+                 job_id=None,
+                 token=None,
+                 idle_timeout=IDLE_TIMEOUT):
+        self.dump_file = dump_file
+        self.job_id = job_id
+        self.token = token
+        self.idle_timeout = idle_timeout
+        self.queue = queue_dir(dump_file)
+        self.lock = os.path.join(self.queue, LOCK)
+        self.plugins = None
+
+        self._beat = 0
+        self._stop = threading.Event()
+        self._lost = threading.Event()
+
+    def install(self):
+        """Install Avalon and discover plugins, only once"""
+        import avalon.api
+        import pyblish.api
+        from reveries import filesys, lib
+
+        avalon.api.install(filesys)
+        pyblish.api.register_target("localhost")
+
+        lib.progress_counter(journal=os.path.join(self.queue, JOURNAL))
+
+        self.plugins = pyblish.api.discover()
+        log.info("%d plugins discovered." % len(self.plugins))
+
+    def claim(self, path):
+        """Claim task by renaming, return claimed path or None if taken"""
+        name = os.path.basename(path).split(TAKEN, 1)[0]
+        claimed = os.path.join(self.queue, name + TAKEN + self.token)
+        try:
+            os.rename(path, claimed)
+        except OSError:
+            return None  # Taken by other worker
+        return claimed
+
+    def take(self, orphans=False):
+        """Claim and return all queued tasks that have no result yet
+
+        Arguments:
+            orphans (bool, optional): Also claim tasks which were taken by
+                other workers, only when this worker just took over the
+                lock from a dead one.
+
+        Returns:
+            list: Tuples of claimed task path and task data
+
+        """
+        tasks = list()
+        for name in sorted(os.listdir(self.queue)):
+            if not name.endswith(TASK_EXT):
+                if not orphans or TAKEN not in name:
+                    continue
+                if name.rsplit(TAKEN, 1)[-1] == self.token:
+                    continue
+
+            task_name = name.split(TAKEN, 1)[0]
+            path = os.path.join(self.queue, name)
+            if os.path.isfile(result_path(os.path.join(self.queue,
+                                                       task_name))):
+                continue
+
+            claimed = self.claim(path)
+            if claimed is None:
+                continue
+
+            try:
+                tasks.append((claimed, read_json(claimed)))
+            except (IOError, OSError, ValueError) as e:
+                log.warning("Invalid task %s: %s" % (name, e))
+
+        return tasks
+
+    def done(self, tasks, returncode, output):
+        """Write result of claimed tasks"""
+        for path, _ in tasks:
+            task_file = path.split(TAKEN, 1)[0]
+            write_json(result_path(task_file), {"returncode": returncode,
+                                                "log": output})
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def publish(self, tasks):
+        """Publish coalesced tasks in one pyblish context
+
+        Tasks are passed as `_progressiveTasks` so `RemoveOutdatedProgress`
+        could count progress per task, only tasks which outputs were not
+        yet published count.
+
+        Returns:
+            int: Return code of `reveries.lib.publish_remote`
+            str: Publish log
+
+        """
+        import pyblish.api
+        from reveries import lib
+
+        files = list()
+        seen = set()
+        progress = 0
+        for _, task in tasks:
+            progress += task["progress"]
+            for file in task["files"]:
+                if file not in seen:
+                    seen.add(file)
+                    files.append(file)
+
+        context = pyblish.api.Context()
+        context.data.update({
+            "_pyblishDumpFile": self.dump_file,
+            "_progressivePublishing": True,
+            "_progressiveBuffered": True,
+            "_progressiveStep": progress,
+            "_progressiveOutput": files,
+            "_progressiveTasks": [task for _, task in tasks],
+        })
+        if self.job_id:
+            context.data["deadlineJobId"] = self.job_id
+
+        log.info("Publishing %d tasks, %d files.." % (len(tasks), len(files)))
+
+        with capture_output() as output:
+            try:
+                returncode = lib.publish_remote(context,
+                                                plugins=self.plugins)
+            except Exception as e:
+                log.exception(e)
+                returncode = -1
+
+        return returncode, output.getvalue()
+
+    def run(self):
+        """Serve queued tasks until idle timeout or lock lost"""
+        if not os.path.isdir(self.queue):
+            os.makedirs(self.queue)
+
+        if self.token is None:
+            # Not started by post task script
+            self.token = create_lock(self.lock)
+            if self.token is None:
+                log.warning("Other worker is serving %s" % self.queue)
+                return
+
+        heartbeat = threading.Thread(target=self._heartbeat)
+        heartbeat.daemon = True
+        heartbeat.start()
+
+        try:
+            self.install()
+
+            orphans = True
+            idle_since = time.time()
+            while not self._lost.is_set():
+                tasks = self.take(orphans=orphans)
+                orphans = False
+                if not tasks:
+                    self.flush_progress(idle=True)
+                    if time.time() - idle_since > self.idle_timeout:
+                        break
+                    time.sleep(POLL_INTERVAL)
+                    continue
+
+                returncode, output = self.publish(tasks)
+                sys.stdout.write(output)
+                self.done(tasks, returncode, output)
+
+                idle_since = time.time()
+
+        finally:
+            self.flush_progress()
+            self._stop.set()
+            # Lock may have been taken over by another worker if this
+            # one had been considered stale.
+            release_lock(self.lock, self.token)
+
+    def flush_progress(self, idle=False):
+        """Write version progress buffered by publishes
+
+        Arguments:
+            idle (bool, optional): Only flush when flush interval passed
+
+        """
+        try:
+            from reveries import lib
+            lib.flush_progress(due_only=idle)
+        except Exception as e:
+            log.error("Failed to write publish progress: %s" % e)
+
+    def beat(self):
+        """Increase heartbeat in lock, return False if lock was taken"""
+        data = read_lock(self.lock)
+        if data is None or data.get("token") != self.token:
+            if os.path.exists(self.lock) or data is not None:
+                return False
+            # Being renamed by a waiter which checks staleness, the lock
+            # will be given back if our beat had changed, otherwise it's
+            # been taken over.
+            return True
+
+        self._beat = max(self._beat, data.get("beat", 0)) + 1
+        data["beat"] = self._beat
+        write_json(self.lock, data)
+        return True
+
+    def _heartbeat(self):
+        while not self._stop.wait(HEARTBEAT):
+            try:
+                alive = self.beat()
+            except (IOError, OSError):
+                continue
+            if not alive:
+                log.warning("Worker lock taken over, stop serving.")
+                self._lost.set()
+                break
+
+
+@contextlib.contextmanager
+def capture_output():
+    """Capture stdout, stderr and logging records into a buffer"""
+    buffer = six.StringIO()
+    handler = logging.StreamHandler(buffer)
+    handler.setFormatter(logging.Formatter("%(levelname)-8s %(message)s"))
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout = sys.stderr = buffer
+    try:
+        yield buffer
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+        root.removeHandler(handler)
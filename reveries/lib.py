@@ -1,11 +1,15 @@
 
 import os
 import sys
+import json
 import math
+import time
 import logging
+import threading
 import contextlib
 import datetime
 import uuid
+import pymongo
 import pyblish.util
 import avalon.io
 import avalon.api
@@ -78,31 +82,44 @@ def floor_dec(x, places):
     return math.floor(x * scale) / float(scale)
 
 
-def soft_mtime(path):
+def soft_mtime(path, stat_cache=None):
     """Return file modification time that floor at 4 decimal places
 
     File modification time thet retrieved by Python may loose some
     accuracy, so we chop it down to 4 decimal places and will suffice
     for our use case.
 
+    Args:
+        path (str): File path
+        stat_cache (StatCache, optional): Query from `reveries.statcache`
+            instead of file system
+
     """
-    mtime = os.path.getmtime(path)
+    mtime = (stat_cache or os.path).getmtime(path)
     return floor_dec(mtime, 4)
 
 
-def file_cmp(A, B):
+def file_cmp(A, B, stat_cache=None):
     """Comparing two file by size and modification time
 
     (NOTE) The file modification time (seconds) only take down to 4
            decimal places. See function `soft_mtime`.
 
+    Args:
+        A (str): File path
+        B (str): File path
+        stat_cache (StatCache, optional): Query from `reveries.statcache`
+            instead of file system
+
     """
+    getsize = (stat_cache or os.path).getsize
 
     def cmp_size(A, B):
-        return os.path.getsize(A) == os.path.getsize(B)
+        return getsize(A) == getsize(B)
 
     def cmp_mtime(A, B):
-        return soft_mtime(A) == soft_mtime(B)
+        return (soft_mtime(A, stat_cache) ==
+                soft_mtime(B, stat_cache))
 
     same_size = cmp_size(A, B)
     same_time = cmp_mtime(A, B)
@@ -110,6 +127,17 @@ def file_cmp(A, B):
     return same_size and same_time
 
 
+def user_cache_dir():
+    """Return Reveries cache dir path in user's local cache location"""
+    if os.name == "nt":
+        base = (os.environ.get("LOCALAPPDATA") or
+                os.path.expanduser("~/AppData/Local"))
+    else:
+        base = (os.environ.get("XDG_CACHE_HOME") or
+                os.path.expanduser("~/.cache"))
+    return os.path.join(base, "reveries")
+
+
 def iter_uri(path, sep):
     """Iter parents of node from its long name.
 
@@ -139,12 +167,17 @@ def iter_uri(path, sep):
         yield path
 
 
-def publish_remote(context=None):
+def publish_remote(context=None, plugins=None):
     """Perform a publish without pyblish GUI that will sys.exit on errors.
 
     Note: This function assumes Avalon has been installed prior to this.
           As such it does *not* trigger avalon.api.install().
 
+    Args:
+        context (pyblish.api.Context, optional): Context to publish
+        plugins (list, optional): Pre-discovered plugins, discover if not
+            provided.
+
     """
     log = logging.getLogger("Pyblish")
 
@@ -155,7 +188,7 @@ def publish_remote(context=None):
     # Start publish
 
     print("Starting pyblish.util.pyblish()..")
-    context = pyblish.util.publish(context)
+    context = pyblish.util.publish(context, plugins=plugins)
     print("Finished pyblish.util.publish(), checking for errors..")
 
     if not context:
@@ -224,32 +257,346 @@ def is_latest(representation):
         return False
 
 
+def find_outdated(representation_ids):
+    """Find representations that are not from latest version
+
+    Representations and their versions are fetched with one `$in` query
+    each, and the highest version number per subset is found by one
+    aggregation over the subsets, so the number of database round-trips
+    does not grow with the number of representations.
+
+    Args:
+        representation_ids (list): Representation ids, `str` or `ObjectId`
+
+    Returns:
+        set: Ids (`ObjectId`) of outdated representations
+        set: Ids (`ObjectId`) of representations missing in the database
+
+    """
+    ids = set(avalon.io.ObjectId(str(_id)) for _id in representation_ids)
+    if not ids:
+        return set(), set()
+
+    representations = avalon.io.find(
+        {"_id": {"$in": list(ids)}, "type": "representation"},
+        projection={"parent": True}
+    )
+    version_ids = dict()  # {version id: [representation id]}
+    for representation in representations:
+        version_ids.setdefault(representation["parent"],
+                               []).append(representation["_id"])
+
+    missing = ids.difference(*version_ids.values())
+    if not version_ids:
+        return set(), missing
+
+    versions = list(avalon.io.find(
+        {"_id": {"$in": list(version_ids)}, "type": "version"},
+        projection={"name": True, "parent": True}
+    ))
+    subset_ids = list(set(version["parent"] for version in versions))
+
+    pipeline = [
+        {"$match": {"type": "version", "parent": {"$in": subset_ids}}},
+        {"$group": {"_id": "$parent", "latest": {"$max": "$name"}}},
+    ]
+    latest = {doc["_id"]: doc["latest"]
+              for doc in project_collection().aggregate(pipeline)}
+
+    outdated = set()
+    for version in versions:
+        if version["name"] < latest.get(version["parent"], 0):
+            outdated.update(version_ids[version["_id"]])
+
+    return outdated, missing
+
+
 def any_outdated():
     """Return whether the current scene has any outdated content"""
-
-    checked = set()
     host = avalon.api.registered_host()
-    for container in host.ls():
-        representation = avalon.io.ObjectId(container["representation"])
-        if representation in checked:
-            continue
-
-        representation_doc = avalon.io.find_one(
-            {"_id": representation, "type": "representation"},
-            projection={"parent": True}
-        )
+    containers = list(host.ls())
 
-        if representation_doc and not is_latest(representation_doc):
-            return True
+    outdated, missing = find_outdated(
+        container["representation"] for container in containers
+    )
 
-        elif not representation_doc:
+    for container in containers:
+        if avalon.io.ObjectId(container["representation"]) in missing:
             log.debug("Container '{objectName}' has an invalid "
                       "representation, it is missing in the "
                       "database".format(**container))
 
-        checked.add(representation)
+    return bool(outdated)
+
+
+@avalon.io.auto_reconnect
+def project_collection():
+    """Return current project's database collection object"""
+    return avalon.io._database[avalon.api.Session["AVALON_PROJECT"]]
+
+
+class BulkWriter(object):
+    """Collect write operations and send them in one `bulk_write` call
+
+    Each `insert_one`, `insert_many`, `update_one` and `update_many` call
+    would be one database round-trip if sent on its own. They are queued
+    here and sent together on `flush`, the number of round-trips saved is
+    counted in `saved`.
+
+    Use `ordered=False` if none of the operations depends on each other,
+    so the server may apply them in parallel and continue on error.
+
+    Example:
+        >>> writer = BulkWriter(project_collection(), ordered=False)
+        >>> writer.update_many({"_id": a}, {"$set": {"data.time": t}})
+        >>> writer.update_many({"_id": b}, {"$set": {"data.time": t}})
+        >>> writer.flush()
+        >>> writer.saved
+        1
+
+    Args:
+        collection (pymongo.collection.Collection): Collection to write
+        ordered (bool, optional): Whether operations must be applied in
+            order and stop on first error. Default True.
+
+    """
+
+    def __init__(self, collection, ordered=True):
+        self.collection = collection
+        self.ordered = ordered
+        self.requests = list()
+        self.calls = 0
+        self.saved = 0
+
+    def __len__(self):
+        return len(self.requests)
+
+    def insert_one(self, document):
+        self.requests.append(pymongo.InsertOne(document))
+        self.calls += 1
+
+    def insert_many(self, documents):
+        documents = list(documents)
+        if documents:
+            self.requests += [pymongo.InsertOne(doc) for doc in documents]
+            self.calls += 1
+
+    def update_one(self, filter, update, upsert=False):
+        self.requests.append(pymongo.UpdateOne(filter, update, upsert=upsert))
+        self.calls += 1
+
+    def update_many(self, filter, update, upsert=False):
+        self.requests.append(pymongo.UpdateMany(filter, update, upsert=upsert))
+        self.calls += 1
+
+    def flush(self):
+        """Send all queued operations
+
+        Returns:
+            pymongo.results.BulkWriteResult: None if nothing queued
+
+        """
+        if not self.requests:
+            return None
+
+        result = self.collection.bulk_write(self.requests,
+                                            ordered=self.ordered)
+        self.saved += self.calls - 1
+        self.requests = list()
+        self.calls = 0
+
+        return result
+
+
+class ProgressCounter(object):
+    """Buffer version publish progress and write merged increments
+
+    Progressive publishes of the same version increase the version's
+    `data.progress.current` and set `data.time` on every run. Instead of
+    writing each of them, increments are summed up per version here and
+    sent in one `bulk_write` on `flush`, which is called by `add` if
+    `interval` seconds passed since last flush.
+
+    Increments that failed to write are put back and retried on next
+    flush, so the final count stays exact.
+
+    If `journal` is given, buffered increments are saved to that file on
+    every `add` and `flush`, and loaded back on init, so increments are
+    not lost if the process gets killed before flushing.
 
-    return False
+    Example:
+        >>> counter = ProgressCounter(project_collection(), interval=30)
+        >>> counter.add(version_id, 10, time=context.data["time"])
+        >>> counter.add(version_id, 10, time=context.data["time"])
+        >>> counter.flush()  # One update with {"$inc": 20}
+
+    Args:
+        collection (pymongo.collection.Collection): Collection to write
+        interval (float, optional): Seconds between flushes, flush on
+            every `add` if 0. Default 30.
+        journal (str, optional): File path to save buffered increments
+
+    """
+
+    def __init__(self, collection, interval=30, journal=None):
+        self.collection = collection
+        self.interval = interval
+        self.journal = journal
+        self.flushes = 0
+        self._pending = dict()  # {version id: [increment, time]}
+        self._writing = dict()  # Being flushed, kept for journal
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.time()
+
+        if journal and os.path.isfile(journal):
+            self._merge(self._load_journal())
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _merge(self, pending):
+        with self._lock:
+            for version_id, (increment, time_) in pending.items():
+                entry = self._pending.setdefault(version_id, [0, None])
+                entry[0] += increment
+                if time_ is not None:
+                    entry[1] = time_ if entry[1] is None else max(entry[1],
+                                                                  time_)
+
+    def _load_journal(self):
+        with open(self.journal, "r") as file:
+            saved = json.load(file)
+        log.info("Loaded %d buffered progress from %s"
+                 % (len(saved), self.journal))
+        return {bson.ObjectId(key): value for key, value in saved.items()}
+
+    def _save_journal(self):
+        if not self.journal:
+            return
+
+        with self._lock:
+            saved = dict()
+            for pending in (self._writing, self._pending):
+                for version_id, (increment, time_) in pending.items():
+                    entry = saved.setdefault(str(version_id), [0, None])
+                    entry[0] += increment
+                    if time_ is not None:
+                        entry[1] = max(entry[1] or time_, time_)
+
+            if not saved:
+                if os.path.isfile(self.journal):
+                    os.remove(self.journal)
+                return
+
+            tmp = "%s.%s.tmp" % (self.journal, uuid.uuid4().hex)
+            with open(tmp, "w") as file:
+                json.dump(saved, file)
+            try:
+                os.rename(tmp, self.journal)
+            except OSError:
+                # Windows can not rename onto existing file
+                os.remove(self.journal)
+                os.rename(tmp, self.journal)
+
+    def add(self, version_id, increment, time=None):
+        """Buffer progress increment of the version
+
+        Args:
+            version_id (ObjectId): Version document id
+            increment (int): Progress increment, could be 0
+            time (str, optional): Publish time to set to `data.time`,
+                the latest one is kept
+
+        """
+        self._merge({version_id: (increment, time)})
+        self._save_journal()
+        if self.due():
+            self.flush()
+
+    def due(self):
+        return time.time() - self._last_flush >= self.interval
+
+    def flush(self):
+        """Write buffered progress, return number of versions updated"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, dict()
+                self._writing = pending
+                self._last_flush = time.time()
+
+            if not pending:
+                return 0
+
+            items = list()
+            writer = BulkWriter(self.collection, ordered=False)
+            for version_id, (increment, time_) in pending.items():
+                update = dict()
+                if increment:
+                    update["$inc"] = {"data.progress.current": increment}
+                if time_ is not None:
+                    update["$set"] = {"data.time": time_}
+                if update:
+                    # Keep operation index for locating failed writes
+                    items.append((version_id, (increment, time_)))
+                    writer.update_many({"_id": version_id}, update)
+
+            try:
+                writer.flush()
+            except pymongo.errors.BulkWriteError as e:
+                # Only put back those failed, others have been written
+                failed = set(error["index"]
+                             for error in e.details["writeErrors"])
+                self._merge(dict(item for index, item in enumerate(items)
+                                 if index in failed))
+                raise
+            except Exception:
+                self._merge(pending)
+                raise
+            finally:
+                self._writing = dict()
+                self._save_journal()
+
+            self.flushes += 1
+            return len(items)
+
+
+_progress_counter = {"_": None}
+
+
+def progress_counter(interval=None, journal=None):
+    """Return progress counter of current process, create if not exists
+
+    Args:
+        interval (float, optional): Seconds between flushes, updated on
+            existing counter. Default 30 for new counter.
+        journal (str, optional): File path to save buffered increments,
+            only used when creating the counter.
+
+    """
+    counter = _progress_counter["_"]
+    if counter is None:
+        if interval is None:
+            interval = 30
+        counter = ProgressCounter(project_collection(),
+                                  interval=interval,
+                                  journal=journal)
+        _progress_counter["_"] = counter
+    elif interval is not None:
+        counter.interval = interval
+    return counter
+
+
+def flush_progress(due_only=False):
+    """Write buffered progress of current process if any
+
+    Args:
+        due_only (bool, optional): Only flush if flush interval passed
+
+    """
+    counter = _progress_counter["_"]
+    if counter is not None and (counter.due() or not due_only):
+        counter.flush()
 
 
 class pindict(dict):  # For experimental code style
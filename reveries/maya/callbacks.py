@@ -5,7 +5,7 @@ from maya.api import OpenMaya as om  # API 2.0
 from maya import cmds, OpenMaya
 from avalon import maya, api as avalon
 
-from .. import utils, plugins, lib
+from .. import utils, plugins, lib, doccache
 from .vendor import sticker
 
 from . import PYMEL_MOCK_FLAG, utils as maya_utils, lib as maya_lib, pipeline
@@ -35,6 +35,8 @@ def _pop_sceneinventory():
 def on_task_changed(_, *args):
     avalon.logger.info("Changing Task module..")
 
+    doccache.invalidate()
+
     utils.init_app_workdir()
     maya.pipeline._on_task_changed()
 
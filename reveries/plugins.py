@@ -1,10 +1,16 @@
 
 import os
+import sys
+import json
+import logging
 import pyblish.api
 import avalon.api
 import avalon.io
 
 
+log = logging.getLogger(__name__)
+
+
 def depended_plugins_succeed(plugin, instance):
     """Lookup context for depended plugins results
 
@@ -460,3 +466,191 @@ class HoudiniSelectInvalidContextAction(SelectInvalidContextAction):
     def deselect(self):
         import hou
         hou.clearAllSelected()
+
+
+class PluginIndex(object):
+    """On-disk index of pyblish plugin discovery
+
+    Full `pyblish.api.discover` imports every plugin module in search
+    paths, which costs seconds when there are hundreds of them. This index
+    maps plugin class names and orders to their module files, so only the
+    modules needed get imported.
+
+    The index is keyed by search paths and registered hosts, and is only
+    valid while no plugin file in those paths has been added, removed or
+    modified. Stale index is rebuilt from a full discovery.
+
+    Arguments:
+        paths (list, optional): Plugin search paths, default to
+            `pyblish.api.plugin_paths()`
+        index_file (str, optional): Index file path, default to
+            "plugin_index.json" in user's cache dir
+
+    """
+
+    def __init__(self, paths=None, index_file=None):
+        from . import lib
+
+        self.paths = [os.path.normpath(path)
+                      for path in (paths or pyblish.api.plugin_paths())]
+        self.index_file = index_file or os.path.join(lib.user_cache_dir(),
+                                                     "plugin_index.json")
+        self.key = json.dumps([self.paths,
+                               sorted(pyblish.api.registered_hosts())])
+
+    def signature(self):
+        """Return module file names and modification time in search paths"""
+        signature = list()
+        for path in self.paths:
+            if not os.path.isdir(path):
+                continue
+            for fname in sorted(os.listdir(path)):
+                if fname.startswith("_") or not fname.endswith(".py"):
+                    continue
+                abspath = os.path.join(path, fname)
+                if os.path.isfile(abspath):
+                    signature.append([abspath, os.path.getmtime(abspath)])
+        return signature
+
+    def _read(self):
+        try:
+            with open(self.index_file, "r") as file:
+                return json.load(file)
+        except (IOError, OSError, ValueError):
+            return dict()
+
+    def load(self):
+        """Return indexed entries, or None if index is stale or not exists
+
+        Returns:
+            dict: {class name: {"file": module file, "order": order}}
+
+        """
+        index = self._read().get(self.key)
+        if index is None or index["signature"] != self.signature():
+            return None
+        return index["plugins"]
+
+    def rebuild(self):
+        """Run full discovery and save index
+
+        Returns:
+            list: Discovered plugins
+
+        """
+        signature = self.signature()
+        plugins = pyblish.api.discover(paths=self.paths)
+
+        entries = dict()
+        for plugin in plugins:
+            module_file = getattr(plugin, "__module__", None)
+            if module_file and os.path.isfile(module_file):
+                entries[plugin.__name__] = {"file": module_file,
+                                            "order": plugin.order}
+
+        data = self._read()
+        data[self.key] = {"signature": signature, "plugins": entries}
+        try:
+            dirname = os.path.dirname(self.index_file)
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            tmp = "%s.%d.tmp" % (self.index_file, os.getpid())
+            with open(tmp, "w") as file:
+                json.dump(data, file)
+            if os.path.isfile(self.index_file):
+                os.remove(self.index_file)  # Windows won't replace
+            os.rename(tmp, self.index_file)
+        except (IOError, OSError) as e:
+            log.warning("Failed to save plugin index: %s" % e)
+
+        return plugins
+
+    def import_plugins(self, module_file):
+        """Import plugin module the same way as `pyblish.api.discover`"""
+        import types
+        import pyblish.plugin
+        from .vendor import six
+
+        name = os.path.splitext(os.path.basename(module_file))[0]
+        module = types.ModuleType(name)
+        module.__file__ = module_file
+
+        with open(module_file, "rb") as f:
+            six.exec_(f.read(), module.__dict__)
+        sys.modules[module_file] = module
+
+        plugins = pyblish.plugin.plugins_from_module(module)
+        for plugin in plugins:
+            plugin.__module__ = module_file
+
+        return plugins
+
+    def find(self, classname):
+        """Return plugin class by name, or None if not found"""
+        for plugin in pyblish.api.registered_plugins():
+            if plugin.__name__ == classname:
+                return plugin
+
+        entries = self.load()
+        if entries is not None and classname in entries:
+            try:
+                plugins = self.import_plugins(entries[classname]["file"])
+            except Exception as e:
+                log.warning("Failed to import indexed plugin: %s" % e)
+            else:
+                for plugin in plugins:
+                    if plugin.__name__ == classname:
+                        return plugin
+
+        log.info("Plugin index is stale, running full discovery..")
+        for plugin in self.rebuild():
+            if plugin.__name__ == classname:
+                return plugin
+
+    def by_order(self, minimum, maximum):
+        """Return plugins which `minimum <= order < maximum`, sorted"""
+        entries = self.load()
+        if entries is None:
+            log.info("Plugin index is stale, running full discovery..")
+            plugins = self.rebuild()
+
+        else:
+            names = set()
+            plugins = list()
+            for plugin in pyblish.api.registered_plugins():
+                names.add(plugin.__name__)
+                plugins.append(plugin)
+
+            files = sorted(set(entry["file"] for entry in entries.values()
+                               if minimum <= entry["order"] < maximum))
+            for module_file in files:
+                for plugin in self.import_plugins(module_file):
+                    if (plugin.__name__ not in names
+                            and entries.get(plugin.__name__,
+                                            {}).get("file") == module_file):
+                        names.add(plugin.__name__)
+                        plugins.append(plugin)
+
+            plugins.sort(key=lambda p: p.order)
+
+        return [plugin for plugin in plugins
+                if ("order" in plugin.__dict__ and
+                    minimum <= plugin.order < maximum)]
+
+
+def discover_plugin(classname, paths=None):
+    """Find pyblish plugin by class name through `PluginIndex`
+
+    Only the module which the plugin lives in will be imported if the
+    index is up to date.
+
+    Arguments:
+        classname (str): Plugin class name
+        paths (list, optional): Plugin search paths, default to
+            `pyblish.api.plugin_paths()`
+
+    Returns:
+        Plugin class, or None if not found
+
+    """
+    return PluginIndex(paths).find(classname)
@@ -0,0 +1,37 @@
+import sys
+import argparse
+import avalon.api
+import avalon.io
+from reveries import utils
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        prog="Backfill source keys",
+        description="Write `data.sourceKey` into version documents that "
+                    "were published before it exists, and ensure the "
+                    "index for source file lookup.")
+
+    parser.add_argument("projects",
+                        type=str,
+                        nargs="*",
+                        help="Project names, default all projects.")
+    parser.add_argument("-b", "--batch",
+                        type=int,
+                        default=1000,
+                        help="Documents updated per bulk write.")
+
+    args = parser.parse_args(sys.argv[1:])
+
+    avalon.io.install()
+
+    projects = args.projects or [project["name"] for project in
+                                 avalon.io.projects()]
+
+    for project in projects:
+        collection = avalon.io._database[project]
+        count = utils.backfill_source_keys(collection,
+                                           project,
+                                           batch_size=args.batch)
+        print("%s: %d versions updated." % (project, count))
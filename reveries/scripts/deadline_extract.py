@@ -2,18 +2,16 @@
 import os
 import sys
 import logging
-import json
 import pyblish.api
 import pyblish.lib
 
+from reveries.plugins import discover_plugin
+from reveries.filesys import dump as dumping
+
 
 def get_plugin(classname):
     # Find extractor plugin
-    Plugin = None
-    for P in pyblish.api.discover():
-        if P.__name__ == classname:
-            Plugin = P
-            break
+    Plugin = discover_plugin(classname)
 
     assert Plugin, "Pyblish plugin not found."
 
@@ -23,8 +21,7 @@ def get_plugin(classname):
 def deadline_extract():
     dumps = os.environ["PYBLISH_EXTRACTOR_DUMPS"].split(";")
     for path in dumps:
-        with open(path, "r") as file:
-            data = json.load(file)
+        data = dumping.load(path)
 
         args = data["args"]
         kwargs = data["kwargs"]
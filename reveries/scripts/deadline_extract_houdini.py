@@ -2,19 +2,17 @@
 import os
 import sys
 import logging
-import json
 import pyblish.api
 import pyblish.lib
 
+from reveries.plugins import discover_plugin
+from reveries.filesys import dump as dumping
+
 
 def get_plugin(classname):
     # Find extractor plugin
-    Plugin = None
-    for P in pyblish.api.discover():
-        if P.__name__ == classname:
-            print("Found Plugin: ", P)
-            Plugin = P
-            break
+    Plugin = discover_plugin(classname)
+    print("Found Plugin: ", Plugin)
 
     assert Plugin, "Pyblish plugin not found."
 
@@ -65,8 +63,7 @@ def deadline_extract():
     sys_args = _get_sys_args()
 
     for path in dumps:
-        with open(path, "r") as file:
-            data = json.load(file)
+        data = dumping.load(path)
 
         args = data["args"]
         kwargs = data["kwargs"]
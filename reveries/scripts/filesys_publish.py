@@ -27,10 +27,27 @@ if __name__ == "__main__":
                         type=str,
                         default="",
                         help="Deadline job id to be registered with.")
+    parser.add_argument("-w", "--worker",
+                        action="store_true",
+                        help="Run as progressive publish worker, serve "
+                             "tasks queued by post task script.")
+    parser.add_argument("-t", "--token",
+                        type=str,
+                        default=None,
+                        help="Worker lock token, given by whom created "
+                             "the lock.")
 
     data = dict()
     args = parser.parse_args(sys.argv[1:])
 
+    if args.worker:
+        from reveries.filesys import worker
+
+        worker.PublishWorker(args.dump,
+                             job_id=args.jobid,
+                             token=args.token).run()
+        sys.exit(0)
+
     if args.dump:
         data["_pyblishDumpFile"] = args.dump
 
@@ -1,8 +1,11 @@
 
 import os
+import time
 import logging
 import subprocess
 
+from reveries.filesys import worker as publish_worker
+
 log = logging.getLogger("APTS.publish_by_task")
 
 
@@ -12,6 +15,9 @@ def __main__(*args):
     This script will run publish on any task completed, if the subset of this
     task already been published, run file integration.
 
+    The publish is done by a long-lived worker process of the job, this
+    script only queues the task output and waits for the worker's result.
+
     (NOTE) Post task script will not run if task has error.
 
     Args:
@@ -38,27 +44,73 @@ def __main__(*args):
     log.info("Publish script:      %s" % script)
     log.info("Publish dump file:   %s" % dumpfile)
 
-    args = [
+    # Queue the outputs to the job's publish worker, which publishes
+    # finished tasks in batches with one warm pyblish session.
+    queue = publish_worker.queue_dir(dumpfile)
+    worker = [
         python,
         script,
         "--dump",
         dumpfile,
-        "--progress",
-        str(len(frames)),
-        "--update",
-        " ".join(files),
         "--jobid",
         job.JobId,
+        "--worker",
     ]
-    popen = subprocess.Popen(args,
-                             stdout=subprocess.PIPE,
-                             stderr=subprocess.STDOUT)
-    output, _ = popen.communicate()
-    print(output)
-    if popen.returncode != 0:
+
+    task_file = publish_worker.enqueue(queue, len(frames), files)
+    result = wait_result(queue, task_file, worker)
+
+    print(result["log"])
+    if result["returncode"] != 0:
         raise Exception("Publish failed, see log..")
 
 
+def ensure_worker(watch, args):
+    """Start publish worker if no live worker is serving the queue"""
+    token = watch.acquire()
+    if token is None:
+        return  # Worker alive or someone else just started one
+
+    args = args + ["--token", token]
+
+    log.info("Starting publish worker..")
+    if os.name == "nt":
+        DETACHED_PROCESS = 0x00000008
+        CREATE_NEW_PROCESS_GROUP = 0x00000200
+        subprocess.Popen(args,
+                         close_fds=True,
+                         creationflags=(DETACHED_PROCESS |
+                                        CREATE_NEW_PROCESS_GROUP))
+    else:
+        subprocess.Popen(args, close_fds=True, preexec_fn=os.setsid)
+
+
+def wait_result(queue, task_file, worker):
+    """Wait for the worker to publish the task and return the result"""
+    result_file = publish_worker.result_path(task_file)
+    watch = publish_worker.LockWatch(os.path.join(queue,
+                                                  publish_worker.LOCK))
+    start = time.time()
+
+    while not os.path.isfile(result_file):
+        if time.time() - start > publish_worker.RESULT_TIMEOUT:
+            raise Exception("Publish worker timeout.")
+        # Worker may quit on idle right before task been queued, or
+        # crashed.
+        ensure_worker(watch, worker)
+        time.sleep(publish_worker.POLL_INTERVAL)
+
+    result = publish_worker.read_json(result_file)
+
+    for path in (task_file, result_file):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    return result
+
+
 def get_output_files(job, frames):
     files = list()
 
@@ -0,0 +1,152 @@
+"""Compact descriptor of file sequence
+
+Instead of listing every file name of a sequence, a sequence could be
+described by file name pattern and frame set string:
+
+    {"fpattern": "beauty/beauty.%04d.exr", "frames": "1-100,102-200x2"}
+
+Frame set string is comma separated ranges, each range is either a single
+frame or `start-end` with optional step `xN`, holes are simply not in any
+range.
+
+File lists which accept sequence descriptor (e.g. `repr.*._hardlinks`)
+could mix file names and descriptors, use `iter_files` to expand them
+lazily.
+
+"""
+import re
+
+from .vendor import six
+
+
+_RANGE = re.compile(r"^(-?\d+)(?:-(-?\d+)(?:x(\d+))?)?$")
+
+
+def compress(frames):
+    """Return frame set string of frame numbers
+
+    Example:
+        >>> compress([1, 2, 3, 5, 7, 9, 10])
+        '1-3,5-9x2,10'
+
+    Arguments:
+        frames (iterable): Frame numbers
+
+    Returns:
+        str: Frame set string
+
+    """
+    frames = sorted(set(int(f) for f in frames))
+    ranges = list()
+
+    i = 0
+    while i < len(frames):
+        start = frames[i]
+        end = start
+        step = 1
+        j = i
+
+        if i + 1 < len(frames):
+            step = frames[i + 1] - start
+            j = i + 1
+            while (j + 1 < len(frames)
+                   and frames[j + 1] - frames[j] == step):
+                j += 1
+            if j - i < 2 and step != 1:
+                # Two frames with step, not worth a range
+                j = i
+                step = 1
+            end = frames[j]
+
+        if start == end:
+            ranges.append("%d" % start)
+        elif step == 1:
+            ranges.append("%d-%d" % (start, end))
+        else:
+            ranges.append("%d-%dx%d" % (start, end, step))
+
+        i = j + 1
+
+    return ",".join(ranges)
+
+
+def _parse(frames):
+    for part in frames.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        match = _RANGE.match(part)
+        if match is None:
+            raise ValueError("Invalid frame range: %r" % part)
+
+        start, end, step = match.groups()
+        start = int(start)
+        end = start if end is None else int(end)
+        step = int(step or 1)
+        yield start, end, step
+
+
+def expand(frames):
+    """Iterate frame numbers of frame set string
+
+    Arguments:
+        frames (str): Frame set string
+
+    Yields:
+        int: Frame number
+
+    """
+    for start, end, step in _parse(frames):
+        for frame in six.moves.range(start, end + 1, step):
+            yield frame
+
+
+def count(frames):
+    """Return frame count of frame set string without expanding it"""
+    return sum((end - start) // step + 1
+               for start, end, step in _parse(frames))
+
+
+def descriptor(fpattern, frames):
+    """Return sequence descriptor
+
+    Arguments:
+        fpattern (str): File name pattern, e.g. "beauty.%04d.exr"
+        frames (iterable or str): Frame numbers or frame set string
+
+    Returns:
+        dict: Sequence descriptor
+
+    """
+    if not isinstance(frames, six.string_types):
+        frames = compress(frames)
+    return {"fpattern": fpattern, "frames": frames}
+
+
+def is_descriptor(entry):
+    return isinstance(entry, dict) and "fpattern" in entry
+
+
+def iter_files(entries):
+    """Iterate file names from mixed file names and sequence descriptors
+
+    Arguments:
+        entries (list): File names or sequence descriptors
+
+    Yields:
+        str: File name
+
+    """
+    for entry in entries:
+        if is_descriptor(entry):
+            fpattern = entry["fpattern"]
+            for frame in expand(entry["frames"]):
+                yield fpattern % frame
+        else:
+            yield entry
+
+
+def count_files(entries):
+    """Return file count of mixed file names and sequence descriptors"""
+    return sum(count(entry["frames"]) if is_descriptor(entry) else 1
+               for entry in entries)
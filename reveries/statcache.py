@@ -0,0 +1,185 @@
+"""Publish scoped file stat cache
+
+Validators and extractors of the same publish often query the same files
+again and again (texture files for example), which are expensive round
+trips on network share. `StatCache` lists each directory once, and answer
+`isfile`, `isdir`, `exists`, `getmtime` and `getsize` like `os.path`:
+
+    >>> cache = statcache.get(context)
+    >>> cache.prefetch(["/textures/wood", "/textures/metal"])
+    >>> cache.isfile("/textures/wood/wood_diffuse.tif")
+    True
+
+Cache of a directory is dropped when files are written into it through
+`invalidate`, which `reveries.transfer` does for every file it writes, so
+publish that writes files will not read stale stat.
+
+"""
+import os
+import threading
+import multiprocessing.pool
+
+
+WORKERS = 8
+
+_current = {"_": None}
+
+
+def _listdir(dir_path):
+    """Return {name: entry}, entry has `is_dir`, `is_file` and `stat`"""
+    scandir = getattr(os, "scandir", None)
+    if scandir is None:
+        # Python 2
+        return {name: _Entry(os.path.join(dir_path, name))
+                for name in os.listdir(dir_path)}
+    return {entry.name: entry for entry in scandir(dir_path)}
+
+
+class _Entry(object):
+    """Minimal `os.DirEntry` for Python 2"""
+
+    def __init__(self, path):
+        self.path = path
+        self._stat = None
+
+    def stat(self):
+        if self._stat is None:
+            self._stat = os.stat(self.path)
+        return self._stat
+
+    def is_dir(self):
+        return os.path.isdir(self.path)
+
+    def is_file(self):
+        return os.path.isfile(self.path)
+
+
+class StatCache(object):
+    """Cache file stats by listing directory in bulk
+
+    Directory entries are listed with `os.scandir`, file stat is retrieved
+    on first query then cached (free on Windows, already fetched by the
+    listing).
+
+    """
+
+    def __init__(self):
+        self._dirs = dict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def _entries(self, dir_path):
+        key = self._key(dir_path)
+        with self._lock:
+            entries = self._dirs.get(key)
+            if entries is not None:
+                self.hits += 1
+                return entries
+            self.misses += 1
+
+        try:
+            entries = _listdir(dir_path)
+        except OSError:
+            entries = dict()  # Not exists or not a directory
+
+        with self._lock:
+            return self._dirs.setdefault(key, entries)
+
+    def _entry(self, path):
+        dir_path, name = os.path.split(os.path.abspath(path))
+        entries = self._entries(dir_path)
+        entry = entries.get(name)
+        if entry is None and os.path.normcase("A") == "a":
+            # Case insensitive file system
+            name = name.lower()
+            for key, value in entries.items():
+                if key.lower() == name:
+                    return value
+        return entry
+
+    def prefetch(self, dir_paths, workers=WORKERS):
+        """List directories concurrently"""
+        dir_paths = [path for path in set(dir_paths)
+                     if self._key(path) not in self._dirs]
+        if len(dir_paths) <= 1 or workers <= 1:
+            for path in dir_paths:
+                self._entries(path)
+            return
+
+        pool = multiprocessing.pool.ThreadPool(min(workers, len(dir_paths)))
+        try:
+            pool.map(self._entries, dir_paths)
+        finally:
+            pool.close()
+            pool.join()
+
+    def stat(self, path):
+        """Return `os.stat` result of path
+
+        Raises:
+            OSError: If the path not exists
+
+        """
+        entry = self._entry(path)
+        if entry is None:
+            raise OSError(2, "No such file or directory", path)
+        return entry.stat()
+
+    def exists(self, path):
+        return self._entry(path) is not None
+
+    def isfile(self, path):
+        entry = self._entry(path)
+        return entry is not None and entry.is_file()
+
+    def isdir(self, path):
+        entry = self._entry(path)
+        return entry is not None and entry.is_dir()
+
+    def getmtime(self, path):
+        return self.stat(path).st_mtime
+
+    def getsize(self, path):
+        return self.stat(path).st_size
+
+    def invalidate(self, path=None):
+        """Drop cache of the directory which contains the path
+
+        Arguments:
+            path (str, optional): File path, drop all if not given
+
+        """
+        with self._lock:
+            if path is None:
+                self._dirs.clear()
+            else:
+                dir_path = os.path.dirname(os.path.abspath(path))
+                self._dirs.pop(self._key(dir_path), None)
+                # The path itself may be a cached directory
+                self._dirs.pop(self._key(path), None)
+
+
+def get(context):
+    """Return stat cache of the publish context
+
+    The cache is created at first call and be set as current cache, so
+    `invalidate` could reach it without passing context around.
+
+    """
+    cache = context.data.get("_statCache")
+    if cache is None:
+        cache = StatCache()
+        context.data["_statCache"] = cache
+        _current["_"] = cache
+    return cache
+
+
+def invalidate(path):
+    """Drop cached stat of the file in current publish, if any"""
+    cache = _current["_"]
+    if cache is not None:
+        cache.invalidate(path)
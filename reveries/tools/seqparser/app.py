@@ -222,29 +222,38 @@ class Window(QtWidgets.QDialog):
                 minimum=0,
                 maximum=10,  # Don't know where is the end
         ) as progress:
-            # (TODO) Run in worker thread
-
-            for i, item in enumerate(command.ls_sequences(path,
-                                                          min_length)):
-                if progress.is_canceled():
-                    return
-
-                if i > max_sequence:
-                    # Prompt dialog asking continue the process or not
-                    respond = plugins.message_box_warning(
-                        title="Warning",
-                        message=("Found over %d sequences, do you wish to "
-                                 "continue ?" % max_sequence),
-                        optional=True
-                    )
-                    if respond:
-                        # Double it
-                        max_sequence += max_sequence
-                    else:
+            # Directories are scanned in worker threads, poll the results
+            # so the dialog keeps responsive.
+            cache = command.ScanCache(path, min_length)
+            cache.load()
+            scanner = command.SequenceScanner(path, min_length, cache=cache)
+            scanner.start()
+            try:
+                while not scanner.done:
+                    if progress.is_canceled():
                         return
 
-                sequences.append(item)
-                progress.bump()  # Also keep dialog responsive
+                    for item in scanner.poll(timeout=0.1):
+                        if len(sequences) > max_sequence:
+                            # Prompt dialog asking continue the process or
+                            # not
+                            respond = plugins.message_box_warning(
+                                title="Warning",
+                                message=("Found over %d sequences, do you "
+                                         "wish to continue ?" % max_sequence),
+                                optional=True
+                            )
+                            if respond:
+                                # Double it
+                                max_sequence += max_sequence
+                            else:
+                                return
+
+                        sequences.append(item)
+
+                    progress.bump()  # Also keep dialog responsive
+            finally:
+                scanner.cancel()
 
         self.add_sequences(sequences)
 
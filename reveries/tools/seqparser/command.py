@@ -1,18 +1,36 @@
 
 import os
+import re
 import json
+import time
+import hashlib
+import uuid
+import logging
+import threading
+import multiprocessing.pool
+from collections import defaultdict
 from avalon.vendor import clique
 
+from ...vendor.six.moves import queue
 
-def assemble(root, files, min_length=2):
 
-    patterns = [
-        clique.PATTERNS["frames"],
-        clique.DIGITS_PATTERN,
-    ]
+log = logging.getLogger(__name__)
+
+
+PATTERNS = [
+    clique.PATTERNS["frames"],
+    clique.DIGITS_PATTERN,
+]
+
+# Frame number between dots before extension, or the last digit run
+_FRAMES = re.compile(r"\.(?P<index>(?P<padding>0*)\d+)\.\D+\d?$")
+_LAST_DIGITS = re.compile(r"(?P<index>(?P<padding>0*)\d+)(?=\D*$)")
+
+
+def assemble(root, files, min_length=2):
 
     collections, remainder = clique.assemble(files,
-                                             patterns=patterns,
+                                             patterns=PATTERNS,
                                              minimum_items=min_length)
 
     assert len(collections) > 0, "No sequence found in %s" % root
@@ -42,42 +60,416 @@ def assemble(root, files, min_length=2):
     }
 
 
-def ls_sequences(path, min_length=2):
-
-    patterns = [
-        clique.PATTERNS["frames"],
-        clique.DIGITS_PATTERN,
-    ]
-
-    for root, dirs, files in os.walk(path):
-        collections, remainder = clique.assemble(files,
-                                                 patterns=patterns,
-                                                 minimum_items=min_length)
-        for collection in collections:
-            indexes = list(collection.indexes)
-
-            head = collection.head
-            padding = collection.padding
-            tail = collection.tail
-            start = indexes[0]
-            end = indexes[-1]
-
-            relative = os.path.relpath(root, path).replace("\\", "/")
-            relative = "" if relative == "." else (relative + "/")
-            frame_str = "%%0%dd" % padding
-            fpattern = "%s%s%s%s" % (relative, head, frame_str, tail)
-
-            yield {
-                "root": path.replace("\\", "/"),
-                "head": head,
-                "padding": padding,
-                "paddingStr": frame_str,
-                "tail": tail,
-                "fpattern": fpattern,
-                "start": start,
-                "end": end,
+def tokenize(fname):
+    """Split file name by frame number
+
+    Returns:
+        tuple: (head, tail, padding, frame), or None if no digit in name
+
+    """
+    match = _FRAMES.search(fname) or _LAST_DIGITS.search(fname)
+    if match is None:
+        return None
+
+    index = match.group("index")
+    padding = len(index) if match.group("padding") else 0
+
+    return (fname[:match.start("index")],
+            fname[match.end("index"):],
+            padding,
+            int(index))
+
+
+def assemble_fast(files, min_length=2):
+    """Assemble sequences by frame number tokens, without clique
+
+    Each file name is split once by its frame number (see `tokenize`), and
+    unpadded frames are merged into padded sequence that aligned on padding
+    width, like `clique.assemble` does.
+
+    Returns:
+        list: Sorted (head, tail, padding, frames) tuples, or None if any
+            file could not be sequenced this way and should be assembled
+            by `clique` instead.
+
+    """
+    groups = defaultdict(set)
+    for fname in files:
+        token = tokenize(fname)
+        if token is not None:
+            groups[token[:3]].add(token[3])
+
+    for (head, tail, padding), indexes in list(groups.items()):
+        if not padding or (head, tail, 0) not in groups:
+            continue
+
+        unpadded = groups[(head, tail, 0)]
+        aligned = set(i for i in unpadded if len(str(abs(i))) == padding)
+        indexes.update(aligned)
+        unpadded -= aligned
+        if not unpadded:
+            del groups[(head, tail, 0)]
+
+    collections = list()
+    for key, indexes in groups.items():
+        if len(indexes) < max(min_length, 2):
+            # Single frame could be split by other digits, e.g. version
+            return None
+        collections.append(key + (sorted(indexes),))
+
+    return sorted(collections)
+
+
+def assemble_dir(files, min_length=2):
+    """Assemble sequences in one directory
+
+    Returns:
+        list: Sorted (head, tail, padding, frames) tuples
+
+    """
+    collections = assemble_fast(files, min_length)
+    if collections is not None:
+        return collections
+
+    collections, _ = clique.assemble(files,
+                                     patterns=PATTERNS,
+                                     minimum_items=min_length)
+    return sorted((c.head, c.tail, c.padding, sorted(c.indexes))
+                  for c in collections)
+
+
+def list_dir(dir_path):
+    """Return file names and sub-directory names in directory
+
+    Symlinked directories are not returned, as `os.walk` won't enter them.
+
+    Returns:
+        tuple: (files, dirs)
+
+    """
+    files = list()
+    dirs = list()
+
+    scandir = getattr(os, "scandir", None)
+    if scandir is None:
+        # Python 2
+        for name in os.listdir(dir_path):
+            path = os.path.join(dir_path, name)
+            if not os.path.isdir(path):
+                files.append(name)
+            elif not os.path.islink(path):
+                dirs.append(name)
+    else:
+        for entry in scandir(dir_path):
+            if not entry.is_dir():
+                files.append(entry.name)
+            elif not entry.is_symlink():
+                dirs.append(entry.name)
+
+    return files, dirs
+
+
+def _to_item(path, dir_path, head, tail, padding, indexes):
+    relative = os.path.relpath(dir_path, path).replace("\\", "/")
+    relative = "" if relative == "." else (relative + "/")
+    frame_str = "%%0%dd" % padding
+    fpattern = "%s%s%s%s" % (relative, head, frame_str, tail)
+
+    return {
+        "root": path.replace("\\", "/"),
+        "head": head,
+        "padding": padding,
+        "paddingStr": frame_str,
+        "tail": tail,
+        "fpattern": fpattern,
+        "start": indexes[0],
+        "end": indexes[-1],
+    }
+
+
+class SequenceScanner(object):
+    """Find sequences in directory tree on a thread pool
+
+    Directories are listed with `os.scandir` concurrently, and sequences
+    found in each directory are streamed back as soon as that directory
+    is assembled.
+
+    Example:
+        >>> scanner = SequenceScanner("/renders/sh0100", min_length=2)
+        >>> for item in scanner:
+        ...     print(item["fpattern"])
+
+        Or poll with timeout to keep GUI responsive:
+
+        >>> scanner.start()
+        >>> while not scanner.done:
+        ...     for item in scanner.poll(timeout=0.1):
+        ...         print(item["fpattern"])
+
+    Arguments:
+        path (str): Root directory path
+        min_length (int, optional): Minimum frame count of a sequence
+        workers (int, optional): Thread pool size, default to
+            `SequenceScanner.WORKERS`
+        cache (ScanCache, optional): Skip re-assembling directories which
+            have not changed since cached
+
+    """
+
+    WORKERS = 8
+
+    def __init__(self, path, min_length=2, workers=None, cache=None):
+        self.path = path
+        self.min_length = min_length
+        self.workers = workers or self.WORKERS
+        self.cache = cache
+
+        self._pool = None
+        self._pending = 0
+        self._results = queue.Queue()
+
+    @property
+    def done(self):
+        return self._pool is None
+
+    def start(self):
+        if self._pool is not None:
+            return
+
+        self._pool = multiprocessing.pool.ThreadPool(self.workers)
+        self._submit(self.path)
+
+    def cancel(self):
+        """Stop scanning, directories in progress are discarded"""
+        if self._pool is None:
+            return
+
+        self._pool.terminate()
+        self._pool.join()
+        self._pool = None
+
+        if self.cache is not None:
+            self.cache.save(complete=False)
+
+    def poll(self, timeout=None):
+        """Return sequences of directories finished since last poll
+
+        Arguments:
+            timeout (float, optional): Seconds to wait for one directory
+                to finish, wait until one finished if None
+
+        Returns:
+            list: Sequence items
+
+        """
+        items = list()
+        if self._pool is None:
+            return items
+
+        try:
+            result = self._results.get(timeout=timeout)
+        except queue.Empty:
+            return items
+
+        while True:
+            items += self._collect(*result)
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+        if not self._pending:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+            if self.cache is not None:
+                self.cache.save()
+
+        return items
+
+    def __iter__(self):
+        self.start()
+        try:
+            while not self.done:
+                for item in self.poll():
+                    yield item
+        finally:
+            self.cancel()
+
+    def _submit(self, dir_path):
+        self._pending += 1
+        self._pool.apply_async(self._scan, (dir_path,))
+
+    def _scan(self, dir_path):
+        try:
+            # Stat before listing, so changes made during listing will
+            # invalidate the cache next time.
+            mtime = os.stat(dir_path).st_mtime
+            files, dirs = list_dir(dir_path)
+
+            collections = None
+            if self.cache is not None:
+                key = os.path.relpath(dir_path, self.path)
+                count = len(files) + len(dirs)
+                collections = self.cache.get(key, mtime, count)
+
+            if collections is None:
+                collections = assemble_dir(files, self.min_length)
+                if self.cache is not None:
+                    self.cache.set(key, mtime, count, collections)
+        except Exception as e:
+            self._results.put((dir_path, [], [], e))
+        else:
+            self._results.put((dir_path, dirs, collections, None))
+
+    def _collect(self, dir_path, dirs, collections, error):
+        self._pending -= 1
+
+        if error is not None:
+            log.warning("Failed to scan '%s': %s" % (dir_path, error))
+
+        for name in dirs:
+            self._submit(os.path.join(dir_path, name))
+
+        return [_to_item(self.path, dir_path, *collection)
+                for collection in collections]
+
+
+class ScanCache(object):
+    """Per-directory cache of assembled sequences
+
+    Each scanned directory's modification time and entry count are saved
+    with its assembled sequences into a cache file in user's cache dir,
+    keyed by root path, directories that have not changed since won't be
+    re-assembled. Nothing is written into the scanned tree, which would
+    change the directories being cached and may be read-only.
+
+    Arguments:
+        root (str): Scanning root directory path
+        min_length (int, optional): Minimum frame count of a sequence,
+            cache of different minimum length will be discarded
+        file_path (str, optional): Cache file path, default to a file
+            named by the hash of root path in "seqparser" under user's
+            cache dir
+
+    """
+
+    # Directories modified within this many seconds before scanning may
+    # still change within the mtime resolution, they are not cached.
+    RACY = 2
+
+    def __init__(self, root, min_length=2, file_path=None):
+        self.root = os.path.normcase(os.path.abspath(root))
+        self.file_path = file_path or self.default_path(self.root)
+        self.min_length = min_length
+        self.entries = dict()
+        self.visited = dict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_path(root):
+        from ... import lib
+
+        key = hashlib.sha1(root.encode("utf-8")).hexdigest()
+        return os.path.join(lib.user_cache_dir(), "seqparser", key + ".json")
+
+    def load(self):
+        try:
+            with open(self.file_path, "r") as fp:
+                data = json.load(fp)
+        except (IOError, OSError, ValueError):
+            return
+
+        if (data.get("root") == self.root
+                and data.get("minLength") == self.min_length):
+            self.entries = data["dirs"]
+
+    def get(self, key, mtime, count):
+        """Return cached sequences of directory, or None if changed"""
+        entry = self.entries.get(key)
+        with self._lock:
+            if (entry is not None
+                    and entry["mtime"] == mtime
+                    and entry["count"] == count):
+                self.visited[key] = entry
+                self.hits += 1
+                return entry["sequences"]
+
+            self.misses += 1
+            return None
+
+    def set(self, key, mtime, count, sequences):
+        if time.time() - mtime < self.RACY:
+            return
+
+        with self._lock:
+            self.visited[key] = {
+                "mtime": mtime,
+                "count": count,
+                "sequences": sequences,
             }
 
+    def save(self, complete=True):
+        """Write cache file, failure is ignored
+
+        Arguments:
+            complete (bool, optional): Whether the whole tree was scanned,
+                if True, directories not visited are removed from cache.
+
+        """
+        dirs = dict() if complete else dict(self.entries)
+        dirs.update(self.visited)
+
+        data = {
+            "root": self.root,
+            "minLength": self.min_length,
+            "dirs": dirs,
+        }
+        tmp = "%s.%s.tmp" % (self.file_path, uuid.uuid4().hex)
+        try:
+            dirname = os.path.dirname(self.file_path)
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            with open(tmp, "w") as fp:
+                json.dump(data, fp)
+            if os.path.isfile(self.file_path):
+                os.remove(self.file_path)  # Windows won't replace
+            os.rename(tmp, self.file_path)
+        except (IOError, OSError) as e:
+            log.debug("Failed to save sequence scan cache: %s" % e)
+            if os.path.isfile(tmp):
+                os.remove(tmp)
+            return
+
+        log.debug("Sequence scan cache saved, %d hits, %d misses."
+                  % (self.hits, self.misses))
+
+
+def ls_sequences(path, min_length=2, workers=None, use_cache=False):
+    """Yield sequences found in directory tree
+
+    Sequences are yielded as soon as their directory is scanned, see
+    `SequenceScanner`.
+
+    Arguments:
+        path (str): Root directory path
+        min_length (int, optional): Minimum frame count of a sequence
+        workers (int, optional): Thread pool size
+        use_cache (bool, optional): Use and update per-directory scan
+            cache, see `ScanCache`
+
+    """
+    cache = None
+    if use_cache:
+        cache = ScanCache(path, min_length)
+        cache.load()
+
+    for item in SequenceScanner(path, min_length, workers, cache):
+        yield item
+
 
 CACHE_FILE_NAME = ".sequences.json"
 
@@ -0,0 +1,281 @@
+import os
+import sys
+import time
+import uuid
+import errno
+import shutil
+import logging
+import threading
+import multiprocessing.pool
+
+from avalon.vendor import filelink
+from . import statcache
+
+
+log = logging.getLogger(__name__)
+
+
+COPY = "copy"
+HARDLINK = "hardlink"
+
+FICLONE = 0x40049409  # Linux ioctl for reflink (copy-on-write clone)
+
+
+def makedirs(dirname):
+    """Create directory if not exists, thread-safe"""
+    try:
+        os.makedirs(dirname)
+    except OSError as e:
+        if e.errno != errno.EEXIST or not os.path.isdir(dirname):
+            raise
+    else:
+        statcache.invalidate(dirname)
+
+
+def _reflink(src, dst):
+    """Clone file with copy-on-write, return False if not supported"""
+    if not sys.platform.startswith("linux"):
+        return False
+
+    import fcntl
+
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except (IOError, OSError):
+            return False
+    return True
+
+
+def _copy_file_range(src, dst):
+    """Copy file in kernel space, return False if not supported"""
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is None:
+        return False
+
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        remain = os.fstat(s.fileno()).st_size
+        try:
+            while remain > 0:
+                copied = copy_file_range(s.fileno(), d.fileno(), remain)
+                if copied == 0:
+                    break
+                remain -= copied
+        except OSError:
+            return False
+    return remain <= 0
+
+
+def fast_copy(src, dst):
+    """Copy file with metadata, by the fastest method available
+
+    Try reflink and `copy_file_range` before falling back to full copy
+    with `shutil.copy2`. None of these share data blocks that could be
+    modified later, so the destination is always an independent copy.
+
+    Returns:
+        str: Name of the method that was used
+
+    """
+    for method, func in (("reflink", _reflink),
+                         ("copy_file_range", _copy_file_range)):
+        if func(src, dst):
+            shutil.copystat(src, dst)
+            return method
+
+    shutil.copy2(src, dst)
+    return "copy2"
+
+
+class FileTransfer(object):
+    """Transfer files concurrently on a bounded thread pool
+
+    Jobs are deduplicated by destination, and every destination directory
+    is created only once before transferring.
+
+    Example:
+        >>> transfer = FileTransfer(workers=8)
+        >>> transfer.add("/stage/a.ma", "/publish/v001/a.ma", COPY)
+        >>> transfer.add("/render/b.exr", "/publish/v001/b.exr", HARDLINK)
+        >>> report = transfer.run()
+        >>> report["bytesPerSec"]
+        123456789.0
+
+    Arguments:
+        workers (int, optional): Thread pool size, default to
+            `FileTransfer.WORKERS`
+
+    """
+
+    WORKERS = 8
+
+    def __init__(self, workers=None):
+        self.workers = workers or self.WORKERS
+        self.jobs = list()
+        self._destinations = set()
+        self._lock = threading.Lock()
+
+    def add(self, src, dst, method=COPY):
+        """Queue one file transfer
+
+        Returns:
+            bool: False if the destination has already been queued
+
+        """
+        if dst in self._destinations:
+            log.warning("File transfered: %s" % dst)
+            return False
+
+        self._destinations.add(dst)
+        self.jobs.append((src, dst, method))
+        return True
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def run(self):
+        """Transfer all queued files
+
+        Raises:
+            OSError: If any of the file failed to transfer, after all other
+                files have been processed.
+
+        Returns:
+            dict: Transfer report, with total "files", "seconds", copied
+                "bytes" and "bytesPerSec", hardlinked "linkedFiles" and
+                "linkedBytes" which move no data, and "perFile" timings
+                of each transferred file, which is a list of (dst, method,
+                bytes, seconds).
+
+        """
+        start = time.time()
+
+        for dirname in set(os.path.dirname(dst) for _, dst, _ in self.jobs):
+            makedirs(dirname)
+
+        results = list()
+        errors = list()
+
+        def transfer(job):
+            try:
+                result = self._transfer(*job)
+            except Exception as e:
+                with self._lock:
+                    errors.append((job, e))
+            else:
+                if result is not None:
+                    with self._lock:
+                        results.append(result)
+
+        if self.workers <= 1 or len(self.jobs) <= 1:
+            for job in self.jobs:
+                transfer(job)
+        else:
+            pool = multiprocessing.pool.ThreadPool(min(self.workers,
+                                                       len(self.jobs)))
+            try:
+                pool.map(transfer, self.jobs, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+
+        for (src, dst, method), error in errors:
+            log.critical("Failed to %s %s -> %s: %s"
+                         % (method, src, dst, error))
+        if errors:
+            raise OSError("An unexpected error occurred.")
+
+        seconds = time.time() - start
+        linked = [result for result in results if result[1] == HARDLINK]
+        copied = sum(result[2] for result in results) - sum(
+            result[2] for result in linked)
+        return {
+            "files": len(results),
+            "bytes": copied,
+            "linkedFiles": len(linked),
+            "linkedBytes": sum(result[2] for result in linked),
+            "seconds": seconds,
+            "bytesPerSec": copied / seconds if seconds else 0.0,
+            "perFile": results,
+        }
+
+    def _transfer(self, src, dst, method):
+        start = time.time()
+
+        if method == HARDLINK:
+            if os.path.isfile(dst):
+                log.warning("File exists, skip creating hardlink: %s" % dst)
+                return None
+            filelink.create(src, dst, filelink.HARDLINK)
+        else:
+            method = fast_copy(src, dst)
+        statcache.invalidate(dst)
+
+        size = os.path.getsize(dst)
+        return dst, method, size, time.time() - start
+
+
+class ContentStore(object):
+    """Content-addressed file storage
+
+    Each file is stored once as a blob named by its C4 ID, and linked into
+    place with hardlinks, so the linked files must be treated as read-only.
+    The store should be on the same volume as the paths that linking to it.
+
+    Example:
+        >>> store = ContentStore("/projects/foo/.store")
+        >>> blob = store.add("/textures/wood.tx", "c45XyZ...")
+        >>> store.link("c45XyZ...", "/publish/v002/wood.tx")
+
+    Arguments:
+        root (str): Store root directory path
+
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def path_of(self, c4id):
+        """Return blob file path of C4 ID"""
+        return os.path.join(self.root, c4id[-2:], c4id)
+
+    def has(self, c4id):
+        return os.path.isfile(self.path_of(c4id))
+
+    def add(self, file_path, c4id):
+        """Copy file into store if the content is not stored yet
+
+        Arguments:
+            file_path (str): Source file path
+            c4id (str): C4 ID of the source file
+
+        Returns:
+            str: Blob file path
+
+        """
+        blob = self.path_of(c4id)
+        if os.path.isfile(blob):
+            return blob
+
+        makedirs(os.path.dirname(blob))
+
+        # Copy to a temporary name then rename, so a partially written
+        # blob never appears under its C4 ID.
+        tmp = "%s.%s.tmp" % (blob, uuid.uuid4().hex)
+        fast_copy(file_path, tmp)
+        try:
+            os.rename(tmp, blob)
+        except OSError:
+            # Stored by others in the meantime (Windows won't replace)
+            os.remove(tmp)
+            if not os.path.isfile(blob):
+                raise
+        statcache.invalidate(blob)
+
+        return blob
+
+    def link(self, c4id, dst):
+        """Hardlink stored blob to destination path"""
+        makedirs(os.path.dirname(dst))
+        filelink.create(self.path_of(c4id), dst, filelink.HARDLINK)
+        statcache.invalidate(dst)
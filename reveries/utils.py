@@ -1,23 +1,30 @@
 
 import os
+import io as _io
+import time
+import logging
+import sqlite3
 import tempfile
 import hashlib
 import codecs
+import threading
+import multiprocessing.pool
 import weakref
 import getpass
 import pymongo
 
-from distutils import dir_util, errors as distutils_err
-
 from avalon import io, Session
 
-import pyblish.api
 import avalon
 from pyblish_qml.ipc import formatting
 
+from . import lib, doccache
 from .plugins import message_box_error
 
 
+log = logging.getLogger(__name__)
+
+
 def stage_dir(prefix=None, dir=None):
     """Provide a temporary directory for staging
 
@@ -53,10 +60,9 @@ def get_timeline_data(project=None, asset_name=None, current_fps=None):
 
     """
     if project is None:
-        project = avalon.io.find_one({"type": "project"},
-                                     projection={"data": True})
+        project = doccache.project()
     asset_name = asset_name or avalon.Session["AVALON_ASSET"]
-    asset = avalon.io.find_one({"name": asset_name, "type": "asset"})
+    asset = doccache.asset(asset_name)
 
     assert asset is not None, ("Asset {!r} not found, this is a bug."
                                "".format(asset_name))
@@ -123,10 +129,9 @@ def get_resolution_data(project=None, asset_name=None):
 
     """
     if project is None:
-        project = avalon.io.find_one({"type": "project"},
-                                     projection={"data": True})
+        project = doccache.project()
     asset_name = asset_name or avalon.Session["AVALON_ASSET"]
-    asset = avalon.io.find_one({"name": asset_name, "type": "asset"})
+    asset = doccache.asset(asset_name)
 
     assert asset is not None, ("Asset {!r} not found, this is a bug."
                                "".format(asset_name))
@@ -157,10 +162,9 @@ def get_linear_unit_data(project=None, asset_name=None):
 
     """
     if project is None:
-        project = avalon.io.find_one({"type": "project"},
-                                     projection={"data": True})
+        project = doccache.project()
     asset_name = asset_name or avalon.Session["AVALON_ASSET"]
-    asset = avalon.io.find_one({"name": asset_name, "type": "asset"})
+    asset = doccache.asset(asset_name)
 
     assert asset is not None, ("Asset {!r} not found, this is a bug."
                                "".format(asset_name))
@@ -228,10 +232,323 @@ def publish_results_formatting(context):
     return formatted
 
 
-def hash_file(file_path):
-    hasher = AssetHasher()
-    hasher.add_file(file_path)
-    return hasher.digest()
+def hash_file(file_path, use_cache=True):
+    """Compute C4 ID of file
+
+    Arguments:
+        file_path (str): File path string
+        use_cache (bool, optional): Lookup and update the local hash cache,
+            see `get_hash_cache`. Default True.
+
+    """
+    cache = get_hash_cache() if use_cache else None
+    digest, = _map_file_digests([file_path], workers=1, cache=cache)
+    return _C4Hasher.c4id(digest)
+
+
+def hash_files(file_paths, workers=None, use_cache=True):
+    """Compute C4 ID of each file concurrently
+
+    Files are read with large buffers on a thread pool, `hashlib` releases
+    the GIL while digesting so this scales with the number of workers until
+    the disk is saturated.
+
+    Arguments:
+        file_paths (list): File path strings
+        workers (int, optional): Thread pool size, default to
+            `AssetHasher.WORKERS`
+        use_cache (bool, optional): Lookup and update the local hash cache,
+            see `get_hash_cache`. Default True.
+
+    Returns:
+        dict: C4 ID of each file, keyed by file path
+
+    """
+    file_paths = list(file_paths)
+    cache = get_hash_cache() if use_cache else None
+    digests = _map_file_digests(file_paths, workers, cache=cache)
+    return {path: _C4Hasher.c4id(digest)
+            for path, digest in zip(file_paths, digests)}
+
+
+def walk_files(dir_path, recursive=True, followlinks=True):
+    """Yield file paths under directory in a deterministic order
+
+    Every directory is visited only once, even if it is reachable through
+    more than one symlink. Entries are sorted by name so the output order
+    does not depend on the file system.
+
+    Arguments:
+        dir_path (str): Directory path string
+        recursive (bool, optional): Walk into sub-dir as well, default is
+            True
+        followlinks (bool, optional): Walk into directories pointed to by
+            symlinks, default is True
+
+    """
+    visited = set()
+    for root, dirs, files in os.walk(dir_path, followlinks=followlinks):
+        real = os.path.realpath(root)
+        if real in visited:
+            dirs[:] = []
+            continue
+        visited.add(real)
+
+        for name in sorted(files):
+            yield os.path.join(root, name)
+
+        if recursive:
+            dirs.sort()
+        else:
+            dirs[:] = []
+
+
+def _file_digest(file_path, buffer_size=None):
+    """Return SHA-512 digest of file content"""
+    buffer_size = buffer_size or AssetHasher.BUFFER_SIZE
+    hash_obj = hashlib.sha512()
+    _update_from_file(hash_obj, file_path, buffer_size)
+    return hash_obj.digest()
+
+
+def _update_from_file(hash_obj, file_path, buffer_size):
+    """Feed file content into hash object with one reusable buffer"""
+    buffer = bytearray(buffer_size)
+    with _io.open(file_path, "rb", buffering=0) as file:
+        while True:
+            size = file.readinto(buffer)
+            if not size:
+                break
+            hash_obj.update(buffer if size == buffer_size else buffer[:size])
+
+
+def _map_file_digests(file_paths, workers=None, cache=None):
+    """Return SHA-512 digests of files, in the same order of input"""
+    digests = dict()
+    signatures = dict()
+    if cache is not None:
+        digests, signatures = cache.lookup(file_paths)
+
+    missing = [path for path in set(file_paths) if path not in digests]
+
+    workers = workers or AssetHasher.WORKERS
+    if workers <= 1 or len(missing) <= 1:
+        hashed = [_file_digest(path) for path in missing]
+    else:
+        pool = multiprocessing.pool.ThreadPool(min(workers, len(missing)))
+        try:
+            hashed = pool.map(_file_digest, missing, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    digests.update(zip(missing, hashed))
+
+    if cache is not None and missing:
+        cache.store([(path, signatures[path], digests[path])
+                     for path in missing if signatures.get(path)])
+
+    return [digests[path] for path in file_paths]
+
+
+class HashCache(object):
+    """Local, on-disk cache of file content hash
+
+    Cached digest is returned only if the file's stat signature, which is
+    (size, mtime, inode), has not changed since it was hashed. Entries are
+    evicted by least recently used once the cache holds more than
+    `max_entries` files.
+
+    The cache is a SQLite database, safe to share between threads and
+    processes.
+
+    Arguments:
+        path (str, optional): Database file path, default to
+            `$REVERIES_HASH_CACHE` or "hash_cache.db" in user's cache dir.
+        max_entries (int, optional): Maximum number of cached files,
+            default to `HashCache.MAX_ENTRIES`
+
+    Example:
+        >>> cache = get_hash_cache()
+        >>> hash_file("/path/to/file")  # Hashed and cached
+        >>> hash_file("/path/to/file")  # Returned from cache
+        >>> cache.invalidate(["/path/to/file"])
+
+    """
+
+    MAX_ENTRIES = 500000
+    EVICT_INTERVAL = 1000  # Check cache size after this many stores
+
+    def __init__(self, path=None, max_entries=None):
+        path = path or os.environ.get("REVERIES_HASH_CACHE")
+        if not path:
+            path = os.path.join(lib.user_cache_dir(), "hash_cache.db")
+
+        dirname = os.path.dirname(path)
+        if dirname and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+        self.path = path
+        self.max_entries = max_entries or self.MAX_ENTRIES
+
+        self._lock = threading.Lock()
+        self._stored = 0
+        self._conn = sqlite3.connect(path,
+                                     timeout=30,
+                                     check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                " path TEXT PRIMARY KEY,"
+                " size INTEGER,"
+                " mtime REAL,"
+                " inode INTEGER,"
+                " digest BLOB,"
+                " used REAL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS hashes_used ON hashes (used)"
+            )
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    @staticmethod
+    def signature(file_path):
+        """Return (size, mtime, inode) of file, or None if not exists"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime, stat.st_ino
+
+    def lookup(self, file_paths):
+        """Lookup cached digest of files
+
+        Arguments:
+            file_paths (list): File path strings
+
+        Returns:
+            dict: Digest of unchanged files, keyed by file path
+            dict: Current stat signature of each file, keyed by file path
+
+        """
+        signatures = {path: self.signature(path) for path in file_paths}
+        keys = {path: self._key(path) for path in signatures}
+
+        rows = dict()
+        key_list = list(set(keys.values()))
+        with self._lock:
+            for i in range(0, len(key_list), 500):
+                chunk = key_list[i:i + 500]
+                cursor = self._conn.execute(
+                    "SELECT path, size, mtime, inode, digest FROM hashes"
+                    " WHERE path IN (%s)" % ",".join("?" * len(chunk)),
+                    chunk
+                )
+                for row in cursor:
+                    rows[row[0]] = row
+
+            digests = dict()
+            for path, signature in signatures.items():
+                row = rows.get(keys[path])
+                if signature and row and tuple(row[1:4]) == signature:
+                    digests[path] = bytes(row[4])
+
+            if digests:
+                now = time.time()
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE hashes SET used=? WHERE path=?",
+                        [(now, keys[path]) for path in digests]
+                    )
+
+        return digests, signatures
+
+    def store(self, entries):
+        """Save file digests into cache
+
+        Arguments:
+            entries (list): List of (file_path, signature, digest)
+
+        """
+        now = time.time()
+        rows = [(self._key(path),) + tuple(signature) +
+                (sqlite3.Binary(digest), now)
+                for path, signature, digest in entries]
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO hashes"
+                    " (path, size, mtime, inode, digest, used)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+
+            self._stored += len(rows)
+            if self._stored >= self.EVICT_INTERVAL:
+                self._stored = 0
+                self._evict()
+
+    def invalidate(self, file_paths=None):
+        """Remove files from cache, or all entries if no path given
+
+        Arguments:
+            file_paths (list, optional): File path strings
+
+        """
+        with self._lock:
+            with self._conn:
+                if file_paths is None:
+                    self._conn.execute("DELETE FROM hashes")
+                else:
+                    self._conn.executemany(
+                        "DELETE FROM hashes WHERE path=?",
+                        [(self._key(path),) for path in file_paths]
+                    )
+
+    def evict(self):
+        """Drop least recently used entries that exceed `max_entries`"""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        count, = self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()
+        exceeded = count - self.max_entries
+        if exceeded > 0:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM hashes WHERE path IN ("
+                    " SELECT path FROM hashes ORDER BY used LIMIT ?)",
+                    (exceeded,)
+                )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM hashes").fetchone()[0]
+
+
+_hash_cache = {"_": None, "failed": False}
+
+
+def get_hash_cache():
+    """Return the default `HashCache` of this session
+
+    Returns None if the cache database can not be opened, e.g. the user's
+    cache dir is not writable, hashing still works without cache.
+
+    """
+    if _hash_cache["_"] is None and not _hash_cache["failed"]:
+        try:
+            _hash_cache["_"] = HashCache()
+        except (OSError, IOError, sqlite3.Error) as e:
+            log.warning("Hash cache disabled: %s" % e)
+            _hash_cache["failed"] = True
+
+    return _hash_cache["_"]
 
 
 def plugins_by_range(base=1.5, offset=2, paths=None):
@@ -248,25 +565,24 @@ def plugins_by_range(base=1.5, offset=2, paths=None):
     Arguments:
         base (float): Center of range
         offset (float, optional): Amount of offset from base
+        paths (list, optional): Plugin search paths
+
+    Only modules of plugins in range will be imported if the plugin index
+    is up to date, see `reveries.plugins.PluginIndex`.
 
     """
+    from .plugins import PluginIndex
+
     _min = base - offset
     _max = base + offset
 
-    plugins = list()
-
-    for plugin in pyblish.api.discover(paths=paths):
-        if ("order" in plugin.__dict__ and
-                _min <= plugin.order < _max):
-
-            plugins.append(plugin)
-
-    return plugins
+    return PluginIndex(paths).by_order(_min, _max)
 
 
 class _C4Hasher(object):
 
-    CHUNK_SIZE = 4096 * 10  # magic number
+    BUFFER_SIZE = 1024 * 1024 * 4
+    WORKERS = 8
     PREFIX = "c4"
 
     def __init__(self):
@@ -278,7 +594,8 @@ class _C4Hasher(object):
         """
         self.hash_obj = hashlib.sha512()
 
-    def _b58encode(self, bytes):
+    @staticmethod
+    def _b58encode(bytes):
         """Base58 Encode bytes to string
         """
         b58chars = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
@@ -296,19 +613,25 @@ class _C4Hasher(object):
 
         return result
 
-    def digest(self):
-        """Return hash value of data added so far
+    @classmethod
+    def c4id(cls, digest):
+        """Return C4 ID string from SHA-512 digest bytes
         """
         c4_id_length = 90
-        b58_hash = self._b58encode(self.hash_obj.digest())
+        b58_hash = cls._b58encode(digest)
 
         padding = ""
         if len(b58_hash) < (c4_id_length - 2):
             padding = "1" * (c4_id_length - 2 - len(b58_hash))
 
-        c4id = self.PREFIX + padding + b58_hash
+        c4id = cls.PREFIX + padding + b58_hash
         return c4id
 
+    def digest(self):
+        """Return hash value of data added so far
+        """
+        return self.c4id(self.hash_obj.digest())
+
 
 class AssetHasher(_C4Hasher):
     """A data hasher for digital content creation
@@ -344,32 +667,33 @@ class AssetHasher(_C4Hasher):
             file_path (str): File path string
 
         """
-        chunk_size = self.CHUNK_SIZE
+        _update_from_file(self.hash_obj, file_path, self.BUFFER_SIZE)
 
-        with open(file_path, "rb") as file:
-            for chunk in iter(lambda: file.read(chunk_size), b""):
-                self.hash_obj.update(chunk)
-
-    def add_dir(self, dir_path, recursive=True, followlinks=True):
+    def add_dir(self, dir_path, recursive=True, followlinks=True,
+                workers=None, use_cache=True):
         """Add one directory to hasher
 
+        Each file is hashed on its own in a thread pool, and the digests are
+        added in the order of `walk_files`, so the result is deterministic
+        and does not depend on the number of workers.
+
         Arguments:
             dir_path (str): Directory path string
             recursive (bool, optional): Add sub-dir as well, default is True
             followlinks (bool, optional): Add directories pointed to by
                 symlinks, default is True
+            workers (int, optional): Thread pool size, default to
+                `AssetHasher.WORKERS`
+            use_cache (bool, optional): Lookup and update the local hash
+                cache, see `get_hash_cache`. Default True.
 
         """
-        for root, dirs, files in os.walk(dir_path, followlinks=followlinks):
-            for name in files:
-                self.add_file(os.path.join(root, name))
-
-            if not recursive:
-                continue
-
-            for name in dirs:
-                path = os.path.join(root, name)
-                self.add_dir(path, recursive=True, followlinks=followlinks)
+        file_paths = list(walk_files(dir_path,
+                                     recursive=recursive,
+                                     followlinks=followlinks))
+        cache = get_hash_cache() if use_cache else None
+        for digest in _map_file_digests(file_paths, workers, cache=cache):
+            self.hash_obj.update(digest)
 
 
 def get_representation_path_(representation, parents):
@@ -421,18 +745,44 @@ class AssetGraber(object):
     This is used for copying asset representation and all it's dependency
     assets from current project to another project.
 
+    Grabbing runs in two phases. First, the full dependency closure of
+    input representations is computed level by level with batched `$in`
+    queries, each document is visited only once. Then missing asset,
+    subset and version documents are inserted with `insert_many`, and
+    representation packages are copied on a thread pool, files that have
+    the same size and modification time in destination are skipped.
+    Representation documents are inserted after all packages copied.
+
+    Copied representations are recorded in a journal file, so if grabbing
+    is interrupted, running it again will resume from where it stopped,
+    since none of the representations exists in destination yet. The
+    journal is removed once grabbing completed.
+
     Example:
         >>> # Init with the name of the destination project
         >>> graber = AssetGraber("other_project")
         >>> # Input representation ID
         >>> graber.grab("5c6159dbed9f0d0509a34e27")
-        >>> # Grab another...
-        >>> graber.grab("5c6159dbed9f0d0509a34e38")
+        >>> # Grab many at once, shared dependencies are copied only once
+        >>> graber.grab_many(["5c6159dbed9f0d0509a34e38",
+        ...                   "5c6159dbed9f0d0509a34e49"])
+
+    Args:
+        project (str): Destination project name
+        workers (int, optional): Thread pool size of copying packages,
+            default to `AssetGraber.WORKERS`
+        journal (str, optional): Journal file path, default in Reveries
+            cache dir, named by destination project
 
     """
 
-    def __init__(self, project):
+    WORKERS = 8
+
+    def __init__(self, project, workers=None, journal=None):
         self.project = project
+        self.workers = workers or self.WORKERS
+        self.journal = journal or os.path.join(lib.user_cache_dir(),
+                                               "grab_%s.journal" % project)
 
         self.this_project = io.find_one({"type": "project"})
         self.that_project = None
@@ -448,12 +798,35 @@ class AssetGraber(object):
         Args:
             representation_id (str or ObjectId): representation id
 
+        """
+        self.grab_many([representation_id], overwrite)
+
+    def grab_many(self, representation_ids, overwrite=False):
+        """Copy representations to project
+
+        Args:
+            representation_ids (list): representation ids, `str` or
+                `ObjectId`
+            overwrite (bool, optional): Copy representation and it's
+                dependencies even it exists in destination project
+
         """
         if not self._connected:
             self._connect()
-        if isinstance(representation_id, str):
-            representation_id = io.ObjectId(representation_id)
-        self._copy_representations(representation_id, overwrite)
+
+        ids = set(io.ObjectId(str(_id)) for _id in representation_ids)
+        closure = self._closure(ids, overwrite)
+        packages = self._insert_documents(*closure)
+        self._copy_packages(packages)
+
+        # Representations are inserted only when all packages are copied,
+        # otherwise the uncopied ones would be skipped as existed when
+        # resuming.
+        representations = closure[0]
+        existed = set(self._that_docs(representations, {"_id": True}))
+        self._insert_many([doc for _id, doc in representations.items()
+                           if _id not in existed])
+        self._remove_journal()
 
     def _connect(self):
         timeout = int(Session["AVALON_TIMEOUT"])
@@ -463,159 +836,372 @@ class AssetGraber(object):
         self._collection = self._database[self.project]
         self._connected = True
 
-        that_project = self._find_one({"type": "project"})
+        that_project = self._collection.find_one({"type": "project"})
         if that_project is None:
             raise Exception("Project '%s' not exists." % self.project)
 
         self.that_project = that_project
 
-    def _insert_one(self, item):
-        assert isinstance(item, dict), "item must be of type <dict>"
-        return self._collection.insert_one(item)
+    def _this_docs(self, ids, projection=None):
+        if not ids:
+            return dict()
+        return {doc["_id"]: doc for doc in
+                io.find({"_id": {"$in": list(ids)}}, projection=projection)}
 
-    def _find_one(self, filter, projection=None, sort=None):
-        assert isinstance(filter, dict), "filter must be <dict>"
-        return self._collection.find_one(
-            filter=filter,
-            projection=projection,
-            sort=sort
-        )
+    def _that_docs(self, ids, projection=None):
+        if not ids:
+            return dict()
+        return {doc["_id"]: doc for doc in
+                self._collection.find({"_id": {"$in": list(ids)}},
+                                      projection=projection)}
 
-    def _update_one(self, filter, item):
-        return self._collection.update_one(filter, item)
+    def _insert_many(self, docs):
+        if docs:
+            self._collection.insert_many(docs)
 
-    def _copy_representations(self, representation_id, overwrite):
-        """Copy all documents and files of representation and dependencies"""
-        this = io
-        that = self
-        this_project = self.this_project
-        that_project = self.that_project
+    def _closure(self, representation_ids, overwrite):
+        """Collect documents of representations and their dependencies
 
-        # Representation
-        this_representation = this.find_one({"_id": representation_id})
-        that_representation = that._find_one({"_id": representation_id})
-        if not that_representation:
-            that._insert_one(this_representation)
-            that_representation = this_representation
+        Returns:
+            dict: Representations, keyed by id
+            dict: Versions, keyed by id
+            dict: Subsets, keyed by id
+            dict: Assets, keyed by id
 
-        elif not overwrite:
-            return
+        """
+        representations = dict()
+        versions = dict()
+        subsets = dict()
+        assets = dict()
+
+        frontier = set(representation_ids)
+        visited = set()
+        while frontier:
+            visited.update(frontier)
+            found = self._this_docs(frontier)
+            if overwrite:
+                existed = set()
+            else:
+                existed = set(self._that_docs(frontier, {"_id": True}))
+
+            level = [doc for _id, doc in found.items()
+                     if _id not in existed]
+            representations.update((doc["_id"], doc) for doc in level)
+
+            # Parents
+            versions.update(self._this_docs(
+                set(doc["parent"] for doc in level) - set(versions)))
+            subsets.update(self._this_docs(
+                set(doc["parent"] for doc in versions.values())
+                - set(subsets)))
+            assets.update(self._this_docs(
+                set(doc["parent"] for doc in subsets.values())
+                - set(assets)))
+
+            # Next level, dependencies
+            level_versions = [versions[doc["parent"]] for doc in level]
+            dependencies = set()
+            for version in level_versions:
+                dependencies.update(
+                    io.ObjectId(_id) for _id in
+                    version["data"].get("dependencies", {}))
+
+            frontier = set()
+            if dependencies:
+                frontier.update(doc["_id"] for doc in io.find(
+                    {"type": "representation",
+                     "parent": {"$in": list(dependencies)}},
+                    projection={"_id": True}))
+
+            # Textures that previous TexturePack version depends on
+            previous = [{"parent": versions[doc["parent"]]["parent"],
+                         "name": versions[doc["parent"]]["name"] - 1}
+                        for doc in level if doc["name"] == "TexturePack"]
+            if previous:
+                previous_versions = [doc["_id"] for doc in io.find(
+                    {"type": "version", "$or": previous},
+                    projection={"_id": True})]
+                frontier.update(doc["_id"] for doc in io.find(
+                    {"type": "representation",
+                     "name": "TexturePack",
+                     "parent": {"$in": previous_versions}},
+                    projection={"_id": True}))
+
+            frontier -= visited
+
+        return representations, versions, subsets, assets
+
+    def _insert_documents(self, representations, versions, subsets, assets):
+        """Insert missing parent documents of representations
+
+        Returns:
+            list: (representation, version, subset, this asset, that asset)
+
+        """
+        that_project = self.that_project
 
-        # Version
-        this_version = this.find_one({"_id": this_representation["parent"]})
-        that_version = that._find_one({"_id": that_representation["parent"]})
-        if not that_version:
-            that._insert_one(this_version)
-            that_version = this_version
-
-        # Subset
-        this_subset = this.find_one({"_id": this_version["parent"]})
-        that_subset = that._find_one({"_id": that_version["parent"]})
-        if not that_subset:
-            that._insert_one(this_subset)
-            that_subset = this_subset
-
-        # Asset
-        this_asset = this.find_one({"_id": this_subset["parent"]})
-        that_asset = that._find_one({"_id": that_subset["parent"]})
-        if not that_asset:
-
-            name_exists = that._find_one({"type": "asset",
-                                          "name": this_asset["name"]})
+        # Assets
+        that_assets = self._that_docs(assets)
+        missing = [doc for _id, doc in assets.items()
+                   if _id not in that_assets]
+
+        by_name = dict()
+        if missing:
+            by_name = {doc["name"]: doc for doc in self._collection.find(
+                {"type": "asset",
+                 "name": {"$in": [doc["name"] for doc in missing]}})}
+
+        remapped = dict()  # {this asset id: that asset id}
+        new_assets = list()
+        visual_parents = set()
+        for this_asset in missing:
+            name_exists = by_name.get(this_asset["name"])
             if name_exists:
-                that_asset = name_exists
-                # Update subset's parent
-                that._update_one(
-                    {"_id": that_subset["_id"]},
-                    {"$set": {"parent": that_asset["_id"]}}
-                )
+                that_assets[this_asset["_id"]] = name_exists
+                remapped[this_asset["_id"]] = name_exists["_id"]
             else:
                 that_asset = this_asset.copy()
                 that_asset["parent"] = that_project["_id"]
-                that._insert_one(that_asset)
+                that_assets[this_asset["_id"]] = that_asset
+                new_assets.append(that_asset)
 
                 # Asset Visual Parent
-                parent = this_asset["data"]["visualParent"]
+                parent = this_asset["data"].get("visualParent")
                 if parent:
-                    parent = io.ObjectId(parent)
-                    if not that._find_one({"_id": parent}):
-                        parent_ast = this.find_one({"_id": parent})
-                        parent_ast["parent"] = that_project["_id"]
-                        that._insert_one(parent_ast)
-
-        # Dependencies
-        for dependency in this_version["data"]["dependencies"]:
-            dependency = io.ObjectId(dependency)
-            for representation_ in this.find({"parent": dependency}):
-                self._copy_representations(representation_["_id"], overwrite)
-
-        # Copy package
-        src_package = get_representation_path_(
-            this_representation,
-            parents=[this_version, this_subset, this_asset, this_project]
-        )
+                    visual_parents.add(io.ObjectId(parent))
+
+        visual_parents -= set(that_assets)
+        visual_parents -= set(self._that_docs(visual_parents,
+                                              {"_id": True}))
+        for parent_ast in self._this_docs(visual_parents).values():
+            parent_ast["parent"] = that_project["_id"]
+            new_assets.append(parent_ast)
+
+        self._insert_many(new_assets)
+
+        # Subsets
+        existed = set(self._that_docs(subsets, {"_id": True}))
+        new_subsets = list()
+        for _id, subset in subsets.items():
+            parent = remapped.get(subset["parent"])
+            if _id not in existed:
+                if parent is not None:
+                    subset = dict(subset, parent=parent)
+                new_subsets.append(subset)
+            elif parent is not None:
+                # Update subset's parent
+                self._collection.update_one({"_id": _id},
+                                            {"$set": {"parent": parent}})
+        self._insert_many(new_subsets)
+
+        # Versions
+        existed = set(self._that_docs(versions, {"_id": True}))
+        self._insert_many([doc for _id, doc in versions.items()
+                           if _id not in existed])
+
+        packages = list()
+        for representation in representations.values():
+            version = versions[representation["parent"]]
+            subset = subsets[version["parent"]]
+            packages.append((representation,
+                             version,
+                             subset,
+                             assets[subset["parent"]],
+                             that_assets[subset["parent"]]))
+        return packages
+
+    def _read_journal(self):
+        try:
+            with open(self.journal, "r") as file:
+                return set(line.strip() for line in file if line.strip())
+        except (IOError, OSError):
+            return set()
 
+    def _copy_packages(self, packages):
+        """Copy representation packages concurrently"""
+        this_project = self.this_project
+        that_project = self.that_project
         that_root = that_project["data"].get("root")
-        if that_root:
-            that_representation["data"]["reprRoot"] = that_root
-        dst_package = get_representation_path_(
-            that_representation,
-            parents=[that_version, that_subset, that_asset, that_project]
-        )
 
-        self._copy_dir(src_package, dst_package)
+        done = self._read_journal()
+        if done:
+            print("Resuming, %d representations have been copied."
+                  % len(done))
+
+        jobs = list()
+        for representation, version, subset, asset, that_asset in packages:
+            if str(representation["_id"]) in done:
+                continue
+
+            # Copy package
+            src_package = get_representation_path_(
+                representation,
+                parents=[version, subset, asset, this_project]
+            )
+
+            that_representation = dict(representation)
+            that_representation["data"] = dict(representation["data"])
+            if that_root:
+                that_representation["data"]["reprRoot"] = that_root
+            dst_package = get_representation_path_(
+                that_representation,
+                parents=[version, subset, that_asset, that_project]
+            )
+
+            jobs.append((str(representation["_id"]),
+                         os.path.normpath(src_package),
+                         os.path.normpath(dst_package)))
+
+        if not jobs:
+            return
 
-        if this_representation["name"] == "TexturePack":
-            previous_version = this.find_one({
-                "type": "version",
-                "name": this_version["name"] - 1,
-                "parent": this_subset["_id"],
-            })
-            if previous_version:
-                previous_representation = this.find_one({
-                    "type": "representation",
-                    "name": "TexturePack",
-                    "parent": previous_version["_id"],
-                }, projection={"_id": True})
+        journal_dir = os.path.dirname(self.journal)
+        if not os.path.isdir(journal_dir):
+            os.makedirs(journal_dir)
 
-                self._copy_representations(previous_representation["_id"],
-                                           overwrite)
+        lock = threading.Lock()
+        errors = list()
 
-    def _copy_dir(self, src, dst):
-        """ Copy given source to destination"""
-        src = os.path.normpath(src)
-        dst = os.path.normpath(dst)
-        print("Copying: %s" % src)
-        print("     To: %s" % dst)
+        def copy(job):
+            representation_id, src, dst = job
+            try:
+                self._copy_dir(src, dst)
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+            else:
+                with lock:
+                    with open(self.journal, "a") as file:
+                        file.write(representation_id + "\n")
+
+        pool = multiprocessing.pool.ThreadPool(min(self.workers, len(jobs)))
         try:
-            dir_util.copy_tree(src, dst)
-        except distutils_err.DistutilsFileError as e:
-            message_box_error("Error", e)
-            raise e
+            pool.map(copy, jobs, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+        if errors:
+            message_box_error("Error", errors[0])
+            raise errors[0]
+
+    def _remove_journal(self):
+        try:
+            os.remove(self.journal)
+        except OSError:
+            pass
+
+    def _copy_dir(self, src, dst):
+        """Copy given source to destination, skip files that are the same"""
+        from . import transfer
+
+        if not os.path.isdir(src):
+            raise OSError("Package not exists: %s" % src)
+
+        copied = skipped = 0
+        for src_file in walk_files(src):
+            dst_file = os.path.join(dst, os.path.relpath(src_file, src))
+            if os.path.isfile(dst_file) and lib.file_cmp(src_file,
+                                                         dst_file):
+                skipped += 1
+                continue
+
+            transfer.makedirs(os.path.dirname(dst_file))
+            transfer.fast_copy(src_file, dst_file)
+            copied += 1
+
+        # One print per package, packages are copied concurrently
+        print("Copied: %s\n    To: %s\n    %d files copied, %d skipped"
+              % (src, dst, copied, skipped))
+
+
+SOURCE_KEY_INDEX = [("type", pymongo.ASCENDING),
+                    ("data.sourceKey", pymongo.ASCENDING)]
+
+_source_key_indexed = set()
+
+
+def ensure_source_key_index(collection):
+    """Create the index for `get_versions_from_sourcefile` if not exists
+
+    Only sent once per collection in current process.
+
+    Args:
+        collection (pymongo.collection.Collection): Project collection
+
+    """
+    if collection.full_name in _source_key_indexed:
+        return
+    collection.create_index(SOURCE_KEY_INDEX, background=True)
+    _source_key_indexed.add(collection.full_name)
+
+
+def source_key(source, project):
+    """Return normalized source path for indexed version lookup
+
+    The part after project name, with slashes unified and lower cased, so
+    the same file referenced from different roots or platforms gets the
+    same key.
+
+    Args:
+        source (str): A path string where subsets been published from
+        project (str): Project name
+
+    Returns:
+        str: Source key, stored as `version.data.sourceKey`
+
+    """
+    source = source.replace("\\", "/").split(project, 1)[-1]
+    return "/".join(part for part in source.split("/") if part).lower()
 
 
 def get_versions_from_sourcefile(source, project):
     """Get version documents by the source path
 
-    By matching the path with field `version.data.source` to query latest
-    versions.
+    By matching the path with field `version.data.sourceKey` to query
+    latest version of each subset on the server.
+
+    Version documents that were published before `sourceKey` existed are
+    matched by field `version.data.source` with regex, until they have been
+    backfilled with `backfill_source_keys`. The index is ensured on
+    integration by `ensure_source_key_index`.
 
     Args:
         source (str): A path string where subsets been published from
         project (str): Project name
 
     """
+    collection = lib.project_collection()
+    pipeline = [
+        {"$match": {"type": "version",
+                    "data.sourceKey": source_key(source, project)}},
+        {"$sort": {"name": -1}},
+        # (NOTE) Each version usually coming from different source file,
+        #        but let's not making this assumtion.
+        #        So here we filter out other versions that belongs to the
+        #        same subset.
+        {"$group": {"_id": "$parent", "version": {"$first": "$$ROOT"}}},
+    ]
+    subsets = set()
+    for doc in collection.aggregate(pipeline):
+        subsets.add(doc["_id"])
+        yield doc["version"]
+
+    # Same as what `backfill_source_keys` could migrate
+    not_migrated = collection.find_one({"type": "version",
+                                        "data.source": {"$nin": [None, ""]},
+                                        "data.sourceKey": None},
+                                       projection={"_id": True})
+    if not_migrated is None:
+        return
+
     source = source.split(project, 1)[-1].replace("\\", "/")
     source = {"$regex": "/*{}".format(source), "$options": "i"}
 
     cursor = io.find({"type": "version",
-                      "data.source": source},
+                      "data.source": source,
+                      "data.sourceKey": None},
                      sort=[("name", -1)])
-    # (NOTE) Each version usually coming from different source file, but
-    #        let's not making this assumtion.
-    #        So here we filter out other versions that belongs to the same
-    #        subset.
-    subsets = set()
     for version in cursor:
         if version["parent"] not in subsets:
             subsets.add(version["parent"])
@@ -626,6 +1212,44 @@ def get_versions_from_sourcefile(source, project):
             continue
 
 
+def backfill_source_keys(collection, project, batch_size=1000):
+    """Write `data.sourceKey` into version documents that don't have it
+
+    Also ensure the index that `get_versions_from_sourcefile` relies on.
+
+    Args:
+        collection (pymongo.collection.Collection): Project collection
+        project (str): Project name
+        batch_size (int, optional): Documents updated per `bulk_write`
+
+    Returns:
+        int: Number of version documents updated
+
+    """
+    ensure_source_key_index(collection)
+
+    cursor = collection.find({"type": "version",
+                              "data.sourceKey": None},
+                             projection={"data.source": True})
+    writer = lib.BulkWriter(collection, ordered=False)
+    count = 0
+    for version in cursor:
+        source = version.get("data", {}).get("source")
+        if not source:
+            continue
+
+        writer.update_many(
+            {"_id": version["_id"]},
+            {"$set": {"data.sourceKey": source_key(source, project)}}
+        )
+        count += 1
+        if len(writer) >= batch_size:
+            writer.flush()
+
+    writer.flush()
+    return count
+
+
 def overlay_clipinfo_on_image(image_path,
                               output_path,
                               project,
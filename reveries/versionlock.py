@@ -0,0 +1,244 @@
+"""Reserve publish version directories with lock files
+
+A version is reserved by creating lock file `.publish.lock` inside the
+version dir with `O_CREAT | O_EXCL`, so only one publish could win the
+same version number. The lock file contains owner metadata:
+
+    {"user": "...", "host": "...", "pid": 123, "token": "...", "time": 0.0}
+
+Lock which is older than expiry seconds is considered stale (publish
+crashed or killed) and could be taken over.
+
+Legacy lock file that only contains user name is supported, the file
+modification time is used as lock time.
+
+"""
+import os
+import re
+import json
+import time
+import uuid
+import socket
+import string
+
+
+LOCK = ".publish.lock"
+EXPIRY = 24 * 3600  # Seconds before a lock considered stale
+
+
+def _owner(user, token):
+    return {
+        "user": user,
+        "host": socket.gethostname(),
+        "pid": os.getpid(),
+        "token": token,
+        "time": time.time(),
+    }
+
+
+def read(lockfile):
+    """Return lock metadata, or None if not locked
+
+    Arguments:
+        lockfile (str): Lock file path
+
+    Returns:
+        dict: Lock owner metadata or None
+
+    """
+    try:
+        with open(lockfile, "r") as file:
+            content = file.read().strip()
+        mtime = os.path.getmtime(lockfile)
+    except (IOError, OSError):
+        return None
+
+    try:
+        data = json.loads(content)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        # Legacy lock, user name only
+        data = {"user": content}
+
+    data.setdefault("time", mtime)
+    return data
+
+
+def is_stale(data, expiry=EXPIRY):
+    return time.time() - data.get("time", 0) > expiry
+
+
+def is_mine(data, user):
+    """Is the lock owned by current process ?"""
+    if "token" not in data:
+        return data.get("user") == user  # Legacy lock
+    return (data.get("user") == user and
+            data.get("host") == socket.gethostname() and
+            data.get("pid") == os.getpid())
+
+
+def _create(lockfile, owner):
+    try:
+        fd = os.open(lockfile, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except OSError:
+        return False
+
+    try:
+        os.write(fd, json.dumps(owner).encode("utf-8"))
+    finally:
+        os.close(fd)
+    return True
+
+
+def _write(lockfile, owner):
+    tmp = "%s.%s.tmp" % (lockfile, owner["token"])
+    with open(tmp, "w") as file:
+        json.dump(owner, file)
+    try:
+        os.rename(tmp, lockfile)
+    except OSError:
+        # Windows can not rename onto existing file
+        os.remove(lockfile)
+        os.rename(tmp, lockfile)
+
+
+def _takeover(lockfile, stale):
+    """Remove stale lock, return False if other took it over first"""
+    moved = "%s.%s.stale" % (lockfile, uuid.uuid4().hex)
+    try:
+        os.rename(lockfile, moved)
+    except OSError:
+        return False
+
+    data = read(moved)
+    if data is not None and data.get("token") != stale.get("token"):
+        # Other has taken over and locked it again right before we
+        # renamed, give it back.
+        try:
+            os.rename(moved, lockfile)
+        except OSError:
+            pass
+        return False
+
+    try:
+        os.remove(moved)
+    except OSError:
+        pass
+    return True
+
+
+def acquire(lockfile, user, expiry=EXPIRY, force=False):
+    """Try to lock version dir, return lock token or None if failed
+
+    Arguments:
+        lockfile (str): Lock file path, version dir will be created
+        user (str): Lock owner name
+        expiry (int, optional): Seconds before other's lock considered
+            stale, default `EXPIRY`
+        force (bool, optional): Overwrite other's lock, e.g. version pinned
+
+    Returns:
+        str: Lock token for `release`, or None if locked by other
+
+    """
+    dirname = os.path.dirname(lockfile)
+    if not os.path.isdir(dirname):
+        try:
+            os.makedirs(dirname)
+        except OSError:
+            if not os.path.isdir(dirname):
+                raise
+
+    owner = _owner(user, uuid.uuid4().hex)
+
+    if _create(lockfile, owner):
+        return owner["token"]
+
+    data = read(lockfile)
+    if data is None:
+        # Released right after we tried
+        return owner["token"] if _create(lockfile, owner) else None
+
+    if force or is_mine(data, user):
+        _write(lockfile, owner)
+        return owner["token"]
+
+    if is_stale(data, expiry) and _takeover(lockfile, data):
+        return owner["token"] if _create(lockfile, owner) else None
+
+    return None
+
+
+def release(lockfile, token=None):
+    """Remove lock file if it is still owned by the token
+
+    Arguments:
+        lockfile (str): Lock file path
+        token (str, optional): Lock token returned by `acquire`, remove
+            lock regardless of owner if not given
+
+    Returns:
+        bool: True if lock removed
+
+    """
+    if token is not None:
+        data = read(lockfile)
+        if data is None or data.get("token") != token:
+            return False
+    try:
+        os.remove(lockfile)
+    except OSError:
+        return False
+    return True
+
+
+def locked_versions(version_template, template_data, user,
+                    expiry=EXPIRY):
+    """Return version numbers that are locked by other live publishes
+
+    Version dirs are listed from subset dir in one go, so next free version
+    could be found without probing one after another.
+
+    Arguments:
+        version_template (str): Version dir path template
+        template_data (dict): Template data, "version" not required
+        user (str): Current lock owner name, own locks are excluded
+        expiry (int, optional): Seconds before lock considered stale
+
+    Returns:
+        list: Locked version numbers, empty if version dir name template
+            is not parsable
+
+    """
+    parent, basename = os.path.split(version_template)
+    if "{version" in parent:
+        return []
+
+    pattern = ""
+    for literal, field, _, _ in string.Formatter().parse(basename):
+        pattern += re.escape(literal)
+        if field is None:
+            continue
+        if field != "version":
+            return []
+        pattern += r"(\d+)"
+    pattern = re.compile("^%s$" % pattern)
+
+    subset_dir = parent.format(**template_data)
+    try:
+        names = os.listdir(subset_dir)
+    except OSError:
+        return []
+
+    versions = list()
+    for name in names:
+        match = pattern.match(name)
+        if match is None:
+            continue
+        data = read(os.path.join(subset_dir, name, LOCK))
+        if data is None or is_mine(data, user) or is_stale(data, expiry):
+            continue
+        versions.append(int(match.group(1)))
+
+    return versions
@@ -0,0 +1,97 @@
+"""Benchmark `AssetHasher.add_dir` against the previous implementation
+
+Usage:
+    python tests/benchmarks/bench_asset_hasher.py [--files N] [--size MB]
+
+A synthetic tree is generated in a temporary directory, three levels deep,
+and removed after the run.
+
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from reveries.utils import AssetHasher  # noqa: E402
+
+
+class LegacyAssetHasher(AssetHasher):
+    """The single-threaded, 40KB chunked implementation before engine"""
+
+    CHUNK_SIZE = 4096 * 10
+
+    def add_file(self, file_path):
+        chunk_size = self.CHUNK_SIZE
+
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                self.hash_obj.update(chunk)
+
+    def add_dir(self, dir_path, recursive=True, followlinks=True):
+        for root, dirs, files in os.walk(dir_path, followlinks=followlinks):
+            for name in files:
+                self.add_file(os.path.join(root, name))
+
+            if not recursive:
+                continue
+
+            for name in dirs:
+                path = os.path.join(root, name)
+                self.add_dir(path, recursive=True, followlinks=followlinks)
+
+
+def make_tree(root, file_count, file_size):
+    block = os.urandom(1024 * 1024)
+    for index in range(file_count):
+        sub = os.path.join(root, "a%d" % (index % 4), "b%d" % (index % 3))
+        if not os.path.isdir(sub):
+            os.makedirs(sub)
+
+        with open(os.path.join(sub, "tex.%04d.tx" % index), "wb") as f:
+            remain = file_size
+            while remain > 0:
+                f.write(block[:remain])
+                remain -= len(block)
+
+
+def bench(hasher, root, **kwargs):
+    start = time.time()
+    hasher.add_dir(root, **kwargs)
+    hasher.digest()
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=64)
+    parser.add_argument("--size", type=float, default=16,
+                        help="Size of each file in MB")
+    parser.add_argument("--workers", type=int, default=AssetHasher.WORKERS)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_hasher_")
+    try:
+        make_tree(root, args.files, int(args.size * 1024 * 1024))
+        total = args.files * args.size
+
+        legacy = bench(LegacyAssetHasher(), root)
+        single = bench(AssetHasher(), root, workers=1)
+        pooled = bench(AssetHasher(), root, workers=args.workers)
+
+        print("Tree: %d files, %.1f MB" % (args.files, total))
+        for label, cost in [("legacy", legacy),
+                            ("engine (1 worker)", single),
+                            ("engine (%d workers)" % args.workers, pooled)]:
+            print("%-22s %8.3f sec  %8.1f MB/s" % (label, cost, total / cost))
+
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
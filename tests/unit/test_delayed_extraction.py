@@ -0,0 +1,159 @@
+
+import os
+import runpy
+import time
+import logging
+import threading
+
+from reveries import PLUGINS_DIR
+
+
+def _load(name):
+    path = os.path.join(PLUGINS_DIR, "global", "publish", name + ".py")
+    return runpy.run_path(path)
+
+
+class _Context(object):
+    def __init__(self, workers):
+        self.data = {
+            "results": [],
+            "projectDoc": {"data": {"delayedExtractionWorkers": workers}},
+        }
+
+
+class _Instance(object):
+    def __init__(self, name, context):
+        self.name = name
+        self.context = context
+        self.data = dict()
+
+    def __str__(self):
+        return self.name
+
+
+class _Recorder(object):
+    """Record extractor start/end and wait for peers to prove overlap"""
+
+    def __init__(self, peers):
+        self.lock = threading.Lock()
+        self.events = list()
+        self.running = set()
+        self.overlapped = set()
+        self.peers = peers
+
+    def extractor(self, name, order, thread_safe=True):
+        def extract():
+            with self.lock:
+                self.events.append(("start", name))
+                self.running.add(name)
+                peers = self.peers.get(name, set()) & self.running
+                if peers:
+                    self.overlapped.update(peers | {name})
+            deadline = time.time() + 2
+            while time.time() < deadline:
+                with self.lock:
+                    if name in self.overlapped or not self.peers.get(name):
+                        break
+                time.sleep(0.01)
+            with self.lock:
+                self.running.discard(name)
+                self.events.append(("end", name))
+        extract.__name__ = name
+        return {"func": extract, "order": order, "threadSafe": thread_safe}
+
+
+def _plugin(module, name):
+    plugin = module[name]()
+    plugin.log = logging.getLogger(name)
+    return plugin
+
+
+def test_thread_safe_extractors_concurrent_in_order():
+    runner = _plugin(_load("delayed_extraction_runner"),
+                     "DelayedExtractionRunner")
+
+    recorder = _Recorder({"a": {"b"}, "b": {"a"}})
+    instance = _Instance("model", _Context(workers=4))
+    instance.data.update({
+        "repr.A._delayRun": recorder.extractor("a", 1),
+        "repr.B._delayRun": recorder.extractor("b", 1),
+        "repr.C._delayRun": recorder.extractor("c", 2, thread_safe=False),
+    })
+
+    runner.process(instance)
+
+    assert recorder.overlapped == {"a", "b"}
+    # Next order starts after current order all finished
+    names = [name for _, name in recorder.events]
+    assert names[-2:] == ["c", "c"]
+    assert all(instance.data[key].get("done")
+               for key in instance.data)
+    assert "_delayedExtractionPool" not in instance.context.data
+
+
+def test_trailing_thread_safe_extractors_across_instances():
+    runner = _plugin(_load("delayed_extraction_runner"),
+                     "DelayedExtractionRunner")
+    waiter = _plugin(_load("delayed_extraction_wait"),
+                     "WaitDelayedExtraction")
+
+    recorder = _Recorder({"tex1": {"tex2"}, "tex2": {"tex1"}})
+    context = _Context(workers=4)
+    instances = list()
+    for name in ("tex1", "tex2"):
+        instance = _Instance(name, context)
+        instance.data.update({
+            "repr.Stage._delayRun": recorder.extractor("stage_" + name, 0),
+            "repr.TexturePack._delayRun": recorder.extractor(name, 1),
+        })
+        instances.append(instance)
+        runner.process(instance)
+
+    for instance in instances:
+        waiter.process(instance)
+
+    assert recorder.overlapped == {"tex1", "tex2"}
+    for name in ("tex1", "tex2"):
+        names = [n for _, n in recorder.events if n.endswith(name)]
+        assert names == ["stage_" + name, "stage_" + name, name, name]
+    assert all(instance.data[key].get("done")
+               for instance in instances for key in instance.data)
+    assert "_delayedExtractionPool" not in context.data
+
+
+def test_deferred_failure_reported_on_instance(caplog):
+    runner = _plugin(_load("delayed_extraction_runner"),
+                     "DelayedExtractionRunner")
+    waiter = _plugin(_load("delayed_extraction_wait"),
+                     "WaitDelayedExtraction")
+
+    def broken():
+        raise IOError("Disk full")
+
+    context = _Context(workers=2)
+    bad = _Instance("bad", context)
+    bad.data["repr.TexturePack._delayRun"] = {"func": broken,
+                                              "threadSafe": True}
+    runner.process(bad)
+    context.data["_delayedExtractionJobs"][0][1].wait()
+
+    recorder = _Recorder({})
+    good = _Instance("good", context)
+    good.data["repr.TexturePack._delayRun"] = recorder.extractor("good", 0)
+    runner.process(good)
+    # Atomicity held across background extraction
+    assert recorder.events == []
+
+    with caplog.at_level(logging.INFO):
+        try:
+            waiter.process(bad)
+        except Exception as e:
+            assert "Extraction failed" in str(e)
+        else:
+            raise AssertionError("Background failure not raised.")
+
+    records = [r for r in caplog.records
+               if r.name == "WaitDelayedExtraction"]
+    assert [r.levelno for r in records] == [logging.INFO, logging.CRITICAL]
+    assert "Disk full" in records[-1].getMessage()
+    assert "_delayedExtractionPool" not in context.data
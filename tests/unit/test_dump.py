@@ -0,0 +1,58 @@
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from reveries.filesys import dump as dumping
+
+
+class _Node(object):
+    def __str__(self):
+        return "|root|node"
+
+
+DATA = {
+    "name": "renderMain",
+    "frames": [1001, 1002, 1003],
+    "step": 1.5,
+    "publish": True,
+    "comment": u"\u5b8c\u6210",
+    "nested": {"none": None, "families": ["a", "b"]},
+}
+
+
+def _round_trip(ext):
+    root = tempfile.mkdtemp()
+    try:
+        path = os.path.join(root, ".instance" + ext)
+        data = dict(DATA, tags={"lookdev"}, node=_Node())
+
+        assert dumping.is_dump(path)
+        assert dumping.ext_of(path) == ext
+        dumping.dump(data, path)
+
+        loaded = dumping.load(path)
+        assert loaded == dict(DATA, tags=["lookdev"], node="|root|node")
+    finally:
+        shutil.rmtree(root)
+
+
+def test_json_round_trip():
+    _round_trip(dumping.JSON)
+
+
+def test_gzip_round_trip():
+    _round_trip(dumping.GZIP)
+
+
+def test_msgpack_round_trip():
+    pytest.importorskip("msgpack")
+    _round_trip(dumping.MSGPACK)
+
+
+def test_unknown_format():
+    assert not dumping.is_dump("/dumps/.instance.yaml")
+    with pytest.raises(ValueError):
+        dumping.dump(DATA, "/dumps/.instance.yaml")
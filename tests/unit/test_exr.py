@@ -0,0 +1,249 @@
+
+import os
+import struct
+import shutil
+import tempfile
+
+from reveries.vendor import parse_exr_header
+
+
+def _attr(name, attr_type, value):
+    return (name.encode() + b"\x00" + attr_type.encode() + b"\x00" +
+            struct.pack("<i", len(value)) + value)
+
+
+def _chlist(names, pixel_type=1):
+    data = b""
+    for name in sorted(names):
+        data += name.encode() + b"\x00"
+        data += struct.pack("<iB3Bii", pixel_type, 0, 0, 0, 0, 1, 1)
+    return data + b"\x00"
+
+
+def _header(width=8, height=4, compression=3, extra=b"", channels="RGB"):
+    box = struct.pack("<4i", 0, 0, width - 1, height - 1)
+    return (_attr("channels", "chlist", _chlist(channels)) +
+            _attr("compression", "compression", struct.pack("<B",
+                                                            compression)) +
+            _attr("dataWindow", "box2i", box) +
+            _attr("displayWindow", "box2i", box) +
+            _attr("lineOrder", "lineOrder", b"\x00") +
+            _attr("pixelAspectRatio", "float", struct.pack("<f", 1.0)) +
+            _attr("screenWindowCenter", "v2f", struct.pack("<2f", 0, 0)) +
+            _attr("screenWindowWidth", "float", struct.pack("<f", 1.0)) +
+            extra +
+            b"\x00")
+
+
+def _exr(headers, flags=0):
+    data = struct.pack("<iI", parse_exr_header.MAGIC, 2 | flags)
+    for header in headers:
+        data += header
+    if flags & parse_exr_header.MULTIPART_FLAG:
+        data += b"\x00"
+    return data
+
+
+def _write(root, name, data):
+    path = os.path.join(root, name)
+    with open(path, "wb") as file:
+        file.write(data)
+    return path
+
+
+def test_read_scanline_header():
+    root = tempfile.mkdtemp()
+    try:
+        extra = (_attr("owner", "string", b"reveries") +
+                 _attr("manifest", "idmanifest", b"\x01\x02"))
+        data = _exr([_header(extra=extra)])
+        path = _write(root, "beauty.1001.exr", data)
+
+        header = parse_exr_header.read_file_header(path)
+        assert header["version"] == 2
+        assert not header["tiled"]
+        assert not header["multipart"]
+        assert header["headerSize"] == len(data)
+        assert header["fileSize"] == len(data)
+
+        part = header["parts"][0]
+        assert sorted(part["channels"]) == ["B", "G", "R"]
+        # Pixel type is int, it was a tuple before the rewrite
+        assert part["channels"]["R"]["pixel_type"] == 1
+        assert part["compression"] == "ZIP_COMPRESSION"
+        assert part["dataWindow"] == {"xMin": 0, "yMin": 0,
+                                      "xMax": 7, "yMax": 3}
+        assert part["lineOrder"] == "INCREASING_Y"
+        assert part["screenWindowCenter"] == [0.0, 0.0]
+        assert part["owner"] == "reveries"
+        assert part["manifest"] == b"\x01\x02"  # Unknown type kept raw
+
+        assert parse_exr_header.read_exr_header(path) == part
+    finally:
+        shutil.rmtree(root)
+
+
+def test_read_multipart_header():
+    root = tempfile.mkdtemp()
+    try:
+        parts = [
+            _header(extra=(_attr("name", "string", name.encode()) +
+                           _attr("type", "string", b"scanlineimage")),
+                    channels=channels)
+            for name, channels in (("beauty", "RGBA"), ("depth", "Z"))
+        ]
+        data = _exr(parts, flags=parse_exr_header.MULTIPART_FLAG)
+        path = _write(root, "multi.exr", data)
+
+        header = parse_exr_header.read_file_header(path)
+        assert header["multipart"]
+        assert header["headerSize"] == len(data)
+        assert [part["name"] for part in header["parts"]] == ["beauty",
+                                                              "depth"]
+        assert sorted(header["parts"][1]["channels"]) == ["Z"]
+    finally:
+        shutil.rmtree(root)
+
+
+def test_read_header_larger_than_read_size():
+    root = tempfile.mkdtemp()
+    try:
+        comment = b"x" * (parse_exr_header.READ_SIZE * 2 + 7)
+        data = _exr([_header(extra=_attr("comments", "string", comment))])
+        path = _write(root, "large.exr", data + b"\x00" * 64)
+
+        header = parse_exr_header.read_file_header(path)
+        assert header["parts"][0]["comments"] == comment.decode()
+        assert header["headerSize"] == len(data)
+
+        # Small first read grows the same
+        small = parse_exr_header.read_file_header(path, read_size=16)
+        assert small == header
+    finally:
+        shutil.rmtree(root)
+
+
+def test_read_headers_with_bad_files():
+    root = tempfile.mkdtemp()
+    try:
+        data = _exr([_header()])
+        good = [_write(root, "good.%d.exr" % i, data) for i in range(10)]
+        truncated = _write(root, "truncated.exr", data[:len(data) // 2])
+        not_exr = _write(root, "not.exr", b"\x89PNG" + b"\x00" * 64)
+        missing = os.path.join(root, "missing.exr")
+
+        headers = parse_exr_header.read_headers(
+            good + [truncated, not_exr, missing], workers=4)
+
+        assert len(headers) == 13
+        for path in good:
+            assert headers[path]["parts"][0]["compression"] == \
+                "ZIP_COMPRESSION"
+        assert isinstance(headers[truncated], ValueError)
+        assert isinstance(headers[not_exr], ValueError)
+        assert isinstance(headers[missing], OSError)
+    finally:
+        shutil.rmtree(root)
+
+
+def _validator():
+    import runpy
+    from reveries import PLUGINS_DIR
+
+    return runpy.run_path(os.path.join(PLUGINS_DIR, "filesys", "publish",
+                                       "validate_exr_integrity.py"))
+
+
+def _with_chunks(header, chunks):
+    """Append offset table and chunks to header"""
+    offset = len(header) + 8 * len(chunks)
+    offsets = list()
+    for chunk in chunks:
+        offsets.append(offset)
+        offset += len(chunk)
+    return (header + struct.pack("<%dQ" % len(offsets), *offsets) +
+            b"".join(chunks))
+
+
+def _scanline_exr(height=40):
+    header = _exr([_header(width=8, height=height, compression=3)])
+    # ZIP compression, 16 scanlines per chunk
+    chunks = [struct.pack("<ii", y, 6) + b"pixels"
+              for y in range(0, height, 16)]
+    return _with_chunks(header, chunks)
+
+
+def _mipmap_exr():
+    tiles = struct.pack("<IIB", 4, 4, 1)  # MIPMAP_LEVELS, ROUND_DOWN
+    header = _exr([_header(width=8, height=4,
+                           extra=_attr("tiles", "tiledesc", tiles))],
+                  flags=parse_exr_header.TILED_FLAG)
+    # Level 0: 2x1 tiles, level 1 (4x2), 2 (2x1), 3 (1x1): 1 tile each
+    coords = [(0, 0, 0, 0), (1, 0, 0, 0),
+              (0, 0, 1, 1), (0, 0, 2, 2), (0, 0, 3, 3)]
+    chunks = [struct.pack("<4ii", *(coord + (4,))) + b"tile"
+              for coord in coords]
+    return _with_chunks(header, chunks)
+
+
+def test_chunk_count():
+    validator = _validator()
+
+    root = tempfile.mkdtemp()
+    try:
+        scanline = _write(root, "scanline.exr", _scanline_exr())
+        mipmap = _write(root, "mipmap.exr", _mipmap_exr())
+
+        header = parse_exr_header.read_file_header(scanline)
+        assert validator["chunk_count"](header, header["parts"][0]) == 3
+
+        header = parse_exr_header.read_file_header(mipmap)
+        assert header["tiled"]
+        assert validator["chunk_count"](header, header["parts"][0]) == 5
+
+        # Ripmap, 8x4 has 4 x levels and 3 y levels
+        part = dict(header["parts"][0])
+        part["tiles"] = dict(part["tiles"], levelMode=2)
+        expected = sum(-(-w // 4) * -(-h // 4)
+                       for w in (8, 4, 2, 1) for h in (4, 2, 1))
+        assert validator["chunk_count"](header, part) == expected
+    finally:
+        shutil.rmtree(root)
+
+
+def test_check_exr():
+    validator = _validator()
+    check_exr = validator["check_exr"]
+
+    root = tempfile.mkdtemp()
+    try:
+        scanline = _scanline_exr()
+        mipmap = _mipmap_exr()
+
+        path = _write(root, "scanline.exr", scanline)
+        assert check_exr(path)["compression"] == "ZIP_COMPRESSION"
+        path = _write(root, "mipmap.exr", mipmap)
+        assert "tiles" in check_exr(path)
+
+        def error_of(name, data):
+            try:
+                check_exr(_write(root, name, data))
+            except Exception as e:
+                return str(e)
+            raise AssertionError("%s not failed" % name)
+
+        # Half written, last chunk incomplete
+        assert "not matching" in error_of("half.exr", scanline[:-3])
+        assert "not matching" in error_of("tile.exr", mipmap[:-1])
+        # Offset table incomplete
+        header_size = parse_exr_header.read_file_header(path)["headerSize"]
+        assert "offset table" in error_of("table.exr",
+                                          mipmap[:header_size + 12])
+        # Unwritten chunk
+        unwritten = bytearray(scanline)
+        offset = len(scanline) - 3 * 8 - 3 * 14
+        unwritten[offset:offset + 8] = b"\x00" * 8
+        assert "Invalid chunk offset" in error_of("unwritten.exr",
+                                                  bytes(unwritten))
+    finally:
+        shutil.rmtree(root)
@@ -0,0 +1,104 @@
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+try:
+    import mock
+except ImportError:
+    import unittest.mock as mock
+
+from reveries.common import get_publish_files
+
+
+def test_get_files_many():
+    mongomock = pytest.importorskip("mongomock")
+    from bson import ObjectId
+
+    collection = mongomock.MongoClient().db.project
+    root = tempfile.mkdtemp()
+    try:
+        project = {
+            "name": "proj",
+            "config": {"template": {"publish": "{root}/{project}/{asset}/"
+                                               "{subset}/v{version:03d}/"
+                                               "{representation}"}},
+        }
+        asset = collection.insert_one({"type": "asset",
+                                       "name": "sh01",
+                                       "silo": "shots"}).inserted_id
+
+        def insert_version(subset_name, versions):
+            subset = collection.insert_one({"type": "subset",
+                                            "name": subset_name,
+                                            "parent": asset}).inserted_id
+            for name, data in versions:
+                version = collection.insert_one({"type": "version",
+                                                 "name": name,
+                                                 "data": data,
+                                                 "parent": subset})
+            return subset, version.inserted_id
+
+        def insert_repr(version, data):
+            collection.insert_one({"type": "representation",
+                                   "name": "exr",
+                                   "data": data,
+                                   "parent": version})
+
+        def publish_dir(subset, version):
+            path = os.path.join(root, "proj", "sh01", subset,
+                                "v%03d" % version, "exr")
+            os.makedirs(path)
+            return path.replace("\\", "/")
+
+        frames = {"fpattern": "beauty.%04d.exr", "frames": "1-4"}
+
+        # Manifest, files are not listed
+        complete, version = insert_version("renderA", [(1, {}), (2, {})])
+        insert_repr(version, {"fileManifest": [frames, "beauty.json"]})
+
+        # Progressive publish, only integrated files returned
+        progress = {"progress": {"current": 2, "total": 4}}
+        partial, version = insert_version("renderB", [(1, progress)])
+        insert_repr(version, {"fileManifest": [frames]})
+        partial_dir = publish_dir("renderB", 1)
+        for frame in (1, 3):
+            open(partial_dir + "/beauty.%04d.exr" % frame, "w").close()
+
+        # Published before manifest exists
+        legacy, version = insert_version("renderC", [(1, {})])
+        insert_repr(version, {})
+        legacy_dir = publish_dir("renderC", 1)
+        open(legacy_dir + "/beauty.0001.exr", "w").close()
+
+        no_version = collection.insert_one({"type": "subset",
+                                            "name": "renderD",
+                                            "parent": asset}).inserted_id
+
+        with mock.patch.object(get_publish_files.io, "find",
+                               collection.find, create=True), \
+                mock.patch.object(get_publish_files.io, "ObjectId",
+                                  ObjectId, create=True), \
+                mock.patch.object(get_publish_files.api, "registered_root",
+                                  return_value=root, create=True), \
+                mock.patch("reveries.lib.project_collection",
+                           return_value=collection), \
+                mock.patch("reveries.doccache.project",
+                           return_value=project):
+            files = get_publish_files.get_files_many(
+                [complete, str(partial), legacy, no_version, complete]
+            )
+
+        expected_dir = root.replace("\\", "/") + "/proj/sh01/renderA/v002/exr"
+        assert files == {
+            str(complete): {"exr": [expected_dir + "/beauty.%04d.exr" % i
+                                    for i in range(1, 5)]
+                            + [expected_dir + "/beauty.json"]},
+            str(partial): {"exr": [partial_dir + "/beauty.0001.exr",
+                                   partial_dir + "/beauty.0003.exr"]},
+            str(legacy): {"exr": [legacy_dir + "/beauty.0001.exr"]},
+        }
+    finally:
+        shutil.rmtree(root)
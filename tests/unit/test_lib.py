@@ -0,0 +1,73 @@
+import pytest
+
+try:
+    import mock
+except ImportError:
+    import unittest.mock as mock
+
+import reveries.lib
+
+
+def test_bulk_writer():
+    mongomock = pytest.importorskip("mongomock")
+
+    collection = mongomock.MongoClient().db.collection
+    collection.insert_many([{"_id": i, "count": 0} for i in range(3)])
+
+    writer = reveries.lib.BulkWriter(collection, ordered=False)
+    writer.insert_one({"_id": "a"})
+    writer.insert_many([{"_id": "b"}, {"_id": "c"}])
+    writer.insert_many([])
+    for i in range(3):
+        writer.update_many({"_id": i}, {"$inc": {"count": i}})
+
+    # Nothing written before flush
+    assert collection.count_documents({}) == 3
+    assert len(writer) == 6
+
+    writer.flush()
+
+    assert collection.count_documents({}) == 6
+    assert [doc["count"] for doc in collection.find({"count": {"$gt": 0}},
+                                                    sort=[("_id", 1)])] \
+        == [1, 2]
+    # 5 separated calls sent in one round-trip
+    assert writer.saved == 4
+    assert len(writer) == 0
+
+    # Flush nothing
+    assert writer.flush() is None
+    assert writer.saved == 4
+
+
+def test_find_outdated():
+    mongomock = pytest.importorskip("mongomock")
+    from bson import ObjectId
+
+    collection = mongomock.MongoClient().db.project
+
+    def insert(type, parent, name=None):
+        return collection.insert_one({"type": type,
+                                      "parent": parent,
+                                      "name": name}).inserted_id
+
+    subset_a = insert("subset", None)
+    subset_b = insert("subset", None)
+    version_a1 = insert("version", subset_a, 1)
+    insert("version", subset_a, 2)
+    version_b1 = insert("version", subset_b, 1)
+
+    repr_a1 = insert("representation", version_a1)
+    repr_b1 = insert("representation", version_b1)
+    repr_gone = ObjectId()
+
+    with mock.patch("avalon.io.find", collection.find), \
+            mock.patch("avalon.io.ObjectId", ObjectId), \
+            mock.patch("reveries.lib.project_collection",
+                       return_value=collection):
+        outdated, missing = reveries.lib.find_outdated(
+            [str(repr_a1), repr_b1, repr_gone]
+        )
+
+    assert outdated == {repr_a1}
+    assert missing == {repr_gone}
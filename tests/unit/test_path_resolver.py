@@ -0,0 +1,80 @@
+
+import pytest
+
+try:
+    import mock
+except ImportError:
+    import unittest.mock as mock
+
+from reveries.common import path_resolver
+
+
+def test_resolve_many():
+    mongomock = pytest.importorskip("mongomock")
+
+    collection = mongomock.MongoClient().db.project
+
+    def insert(type, name, parent=None):
+        return collection.insert_one({"type": type,
+                                      "name": name,
+                                      "parent": parent}).inserted_id
+
+    asset = insert("asset", "BoxB")
+    subset = insert("subset", "assetPrim", asset)
+    version_1 = insert("version", 1, subset)
+    version_2 = insert("version", 2, subset)
+    repr_1 = insert("representation", "USD", version_1)
+    insert("representation", "USD", version_2)
+
+    root = "/proj/Proj/Avalon/Set/BoxB"
+    v001 = root + "/publish/assetPrim/v001/USD/asset_prim.usda"
+    missing = root + "/publish/assetPrim/v003/USD/asset_prim.usda"
+    work = root + "/work/modeling/maya/scenes/box.ma"
+
+    project = {"name": "Proj"}
+    queries = list()
+
+    def find(*args, **kwargs):
+        queries.append(args[0]["type"])
+        return collection.find(*args, **kwargs)
+
+    with mock.patch.object(path_resolver.io, "find", find,
+                           create=True), \
+            mock.patch.object(path_resolver.io, "find_one",
+                              mock.Mock(side_effect=AssertionError),
+                              create=True), \
+            mock.patch.object(path_resolver.api, "registered_root",
+                              return_value="/proj", create=True), \
+            mock.patch("reveries.lib.project_collection",
+                       return_value=collection), \
+            mock.patch("reveries.doccache.project",
+                       return_value=project), \
+            mock.patch.dict(path_resolver._resolved, clear=True):
+
+        resolvers = path_resolver.resolve_many([v001, missing, work, v001])
+
+        assert sorted(resolvers) == sorted([v001, missing, work])
+        assert queries == ["asset", "subset", "version", "representation"]
+
+        resolver = resolvers[v001]
+        # Memoized, no more query
+        assert resolver.get_representation_id() == repr_1
+        assert resolver.get_version_id() == version_1
+        assert resolver.get_asset_id() == asset
+        assert resolver.get_latest_version_name() == "v002"
+        assert not resolver.is_latest_version()
+
+        assert resolvers[missing].current_version_id == ""
+        assert resolvers[missing].latest_version_name == "v002"
+        assert not resolvers[work].is_publish_file()
+
+        # Memoized across calls, except the one not found
+        del queries[:]
+        resolvers = path_resolver.resolve_many([v001, work, missing])
+        assert resolvers[v001].get_representation_id() == repr_1
+        assert queries == ["asset", "subset", "version"]
+
+        del queries[:]
+        path_resolver.resolve_many([v001], ttl=0)
+        path_resolver.resolve_many([v001])
+        assert queries == []
@@ -0,0 +1,59 @@
+
+import os
+import shutil
+import tempfile
+
+import pyblish.api
+
+from reveries import plugins
+
+
+def test_plugin_index_invalidated_by_mtime(monkeypatch):
+    root = tempfile.mkdtemp()
+    try:
+        plugin_dir = os.path.join(root, "publish")
+        os.makedirs(plugin_dir)
+        module_file = os.path.join(plugin_dir, "collect_foo.py")
+        with open(module_file, "w") as file:
+            file.write("# plugin")
+        os.utime(module_file, (1000000000, 1000000000))
+
+        class CollectFoo(object):
+            __module__ = module_file
+            order = 0
+
+        discovered = list()
+
+        def discover(paths=None):
+            discovered.append(paths)
+            return [CollectFoo]
+
+        monkeypatch.setattr(pyblish.api, "discover", discover,
+                            raising=False)
+
+        index_file = os.path.join(root, "cache", "plugin_index.json")
+        index = plugins.PluginIndex([plugin_dir], index_file=index_file)
+
+        assert index.load() is None
+        assert index.rebuild() == [CollectFoo]
+        assert index.load() == {"CollectFoo": {"file": module_file,
+                                               "order": 0}}
+
+        # Index is shared by new instances of the same paths
+        index = plugins.PluginIndex([plugin_dir], index_file=index_file)
+        assert index.load() is not None
+        assert len(discovered) == 1
+
+        # Modified plugin invalidates index
+        os.utime(module_file, (1000000010, 1000000010))
+        assert index.load() is None
+        index.rebuild()
+        assert len(discovered) == 2
+        assert index.load() is not None
+
+        # So does new plugin file
+        with open(os.path.join(plugin_dir, "validate_foo.py"), "w") as file:
+            file.write("# plugin")
+        assert index.load() is None
+    finally:
+        shutil.rmtree(root)
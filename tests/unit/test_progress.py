@@ -0,0 +1,129 @@
+import random
+import multiprocessing.pool
+
+import pytest
+
+import reveries.lib
+
+
+def test_progress_counter_concurrent_tasks():
+    mongomock = pytest.importorskip("mongomock")
+    collection = mongomock.MongoClient().db.col
+    versions = [collection.insert_one({"data": {"progress": {"current": 0}}
+                                       }).inserted_id for _ in range(3)]
+
+    counter = reveries.lib.ProgressCounter(collection, interval=0.001)
+    tasks = [(random.choice(versions), random.randint(0, 10), "%04d" % i)
+             for i in range(500)]
+
+    def complete(task):
+        version_id, progress, time = task
+        counter.add(version_id, progress, time=time)
+
+    pool = multiprocessing.pool.ThreadPool(32)
+    pool.map(complete, tasks, chunksize=1)
+    pool.close()
+    pool.join()
+    counter.flush()  # Job end
+
+    assert len(counter) == 0
+    assert counter.flushes < len(tasks)
+    for version_id in versions:
+        doc = collection.find_one({"_id": version_id})
+        expected = sum(t[1] for t in tasks if t[0] == version_id)
+        assert doc["data"]["progress"]["current"] == expected
+        assert doc["data"]["time"] == max(t[2] for t in tasks
+                                          if t[0] == version_id)
+
+
+def test_progress_counter_retry_failed_write():
+    mongomock = pytest.importorskip("mongomock")
+    collection = mongomock.MongoClient().db.col
+    version_id = collection.insert_one({"data": {}}).inserted_id
+
+    class Unstable(object):
+        failed = False
+
+        def bulk_write(self, requests, ordered):
+            if not self.failed:
+                self.failed = True
+                raise IOError("Connection lost")
+            return collection.bulk_write(requests, ordered=ordered)
+
+    counter = reveries.lib.ProgressCounter(Unstable(), interval=60)
+    counter.add(version_id, 5)
+    counter.add(version_id, 7)
+
+    with pytest.raises(IOError):
+        counter.flush()
+    counter.add(version_id, 1)
+    counter.flush()
+
+    doc = collection.find_one({"_id": version_id})
+    assert doc["data"]["progress"]["current"] == 13
+
+
+def test_progress_counter_journal(tmpdir):
+    mongomock = pytest.importorskip("mongomock")
+    collection = mongomock.MongoClient().db.col
+    version_id = collection.insert_one({"data": {}}).inserted_id
+    journal = str(tmpdir.join("progress.journal"))
+
+    counter = reveries.lib.ProgressCounter(collection, interval=60,
+                                           journal=journal)
+    counter.add(version_id, 5, time="0001")
+    counter.add(version_id, 2, time="0002")
+    del counter  # Killed before flush
+
+    counter = reveries.lib.ProgressCounter(collection, interval=60,
+                                           journal=journal)
+    counter.add(version_id, 1)
+    counter.flush()
+    assert not tmpdir.join("progress.journal").exists()
+
+    doc = collection.find_one({"_id": version_id})
+    assert doc["data"] == {"progress": {"current": 8}, "time": "0002"}
+
+
+def test_progress_counter_retry_partial_failure():
+    mongomock = pytest.importorskip("mongomock")
+    pymongo = pytest.importorskip("pymongo")
+    collection = mongomock.MongoClient().db.col
+    versions = [collection.insert_one({"data": {}}).inserted_id
+                for _ in range(3)]
+
+    class Partial(object):
+        failed = False
+
+        def bulk_write(self, requests, ordered):
+            if not self.failed:
+                self.failed = True
+                # Second operation failed, others written
+                collection.bulk_write(requests[:1] + requests[2:])
+                raise pymongo.errors.BulkWriteError(
+                    {"writeErrors": [{"index": 1}]})
+            return collection.bulk_write(requests, ordered=ordered)
+
+    counter = reveries.lib.ProgressCounter(Partial(), interval=60)
+    counter.add(versions[0], 0)  # Nothing to write, skipped
+    counter.add(versions[1], 3)
+    counter.add(versions[2], 4)
+
+    with pytest.raises(pymongo.errors.BulkWriteError):
+        counter.flush()
+    counter.flush()
+
+    progress = [collection.find_one({"_id": _id})["data"].get("progress")
+                for _id in versions]
+    assert progress == [None, {"current": 3}, {"current": 4}]
+
+
+def test_progress_counter_interval_updated(monkeypatch):
+    monkeypatch.setattr(reveries.lib, "project_collection", lambda: None)
+    monkeypatch.setitem(reveries.lib._progress_counter, "_", None)
+
+    counter = reveries.lib.progress_counter(interval=30)
+    assert reveries.lib.progress_counter(interval=5) is counter
+    assert counter.interval == 5
+    reveries.lib.progress_counter()
+    assert counter.interval == 5
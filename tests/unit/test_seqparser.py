@@ -0,0 +1,63 @@
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+
+def _make_tree(root):
+    """Render root holds frames directly, and AOVs in sub-directories"""
+    dirs = [root,
+            os.path.join(root, "diffuse"),
+            os.path.join(root, "specular")]
+    for dir_path in dirs:
+        if not os.path.isdir(dir_path):
+            os.makedirs(dir_path)
+        name = os.path.basename(dir_path)
+        for frame in range(1001, 1006):
+            path = os.path.join(dir_path, "%s.%04d.exr" % (name, frame))
+            open(path, "w").close()
+    # Not racy
+    for dir_path in dirs:
+        os.utime(dir_path, (1000000000, 1000000000))
+    return dirs
+
+
+def test_scan_cache_hits_unchanged_tree():
+    pytest.importorskip("avalon.vendor.Qt", exc_type=ImportError)
+    from reveries.tools.seqparser import command
+
+    root = tempfile.mkdtemp()
+    try:
+        render = os.path.join(root, "render")
+        dirs = _make_tree(render)
+        cache_file = os.path.join(root, "cache", "scan.json")
+
+        def scan():
+            cache = command.ScanCache(render, file_path=cache_file)
+            cache.load()
+            items = list(command.SequenceScanner(render, cache=cache))
+            return cache, sorted(item["fpattern"] for item in items)
+
+        cache, first = scan()
+        assert cache.misses == len(dirs)
+        assert len(first) == len(dirs)
+        # Nothing written into scanned tree
+        assert os.stat(render).st_mtime == 1000000000
+        assert sorted(os.listdir(render)) == sorted(
+            ["diffuse", "specular"] +
+            ["render.%04d.exr" % f for f in range(1001, 1006)])
+
+        cache, second = scan()
+        assert cache.hits == len(dirs)
+        assert cache.misses == 0
+        assert second == first
+
+        # Changed directory is re-assembled
+        open(os.path.join(dirs[1], "diffuse.1006.exr"), "w").close()
+        cache, third = scan()
+        assert cache.misses == 1
+        assert cache.hits == len(dirs) - 1
+    finally:
+        shutil.rmtree(root)
@@ -0,0 +1,29 @@
+
+from reveries import sequence
+
+
+def test_frame_set_round_trip():
+    frames = [1, 2, 3, 5, 7, 9, 10, 20, 22]
+
+    frame_set = sequence.compress(frames)
+    assert frame_set == "1-3,5-9x2,10,20,22"
+    assert list(sequence.expand(frame_set)) == frames
+    assert sequence.count(frame_set) == len(frames)
+
+    assert sequence.compress(range(-3, 1001)) == "-3-1000"
+    assert list(sequence.expand("-3--1")) == [-3, -2, -1]
+
+
+def test_iter_files():
+    entries = [
+        "beauty.json",
+        sequence.descriptor("beauty.%04d.exr", [1, 2, 4]),
+    ]
+
+    assert list(sequence.iter_files(entries)) == [
+        "beauty.json",
+        "beauty.0001.exr",
+        "beauty.0002.exr",
+        "beauty.0004.exr",
+    ]
+    assert sequence.count_files(entries) == 4
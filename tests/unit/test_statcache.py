@@ -0,0 +1,37 @@
+
+import os
+import shutil
+import tempfile
+
+from reveries import statcache, transfer
+
+
+class _Context(object):
+    def __init__(self):
+        self.data = dict()
+
+
+def test_stat_cache_invalidated_by_transfer():
+    root = tempfile.mkdtemp()
+    try:
+        src = os.path.join(root, "src.txt")
+        dst = os.path.join(root, "out", "dst.txt")
+        with open(src, "w") as file:
+            file.write("texture")
+
+        cache = statcache.get(_Context())
+        cache.prefetch([root, os.path.dirname(dst)])
+
+        assert cache.isfile(src)
+        assert cache.getsize(src) == os.path.getsize(src)
+        assert not cache.exists(dst)
+
+        engine = transfer.FileTransfer()
+        engine.add(src, dst, transfer.COPY)
+        engine.run()
+
+        assert cache.isfile(dst)
+        assert cache.isdir(os.path.dirname(dst))
+        assert cache.misses == 4
+    finally:
+        shutil.rmtree(root)
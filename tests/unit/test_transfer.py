@@ -0,0 +1,137 @@
+
+import os
+import shutil
+import tempfile
+
+from reveries import transfer
+
+
+def _write(path, content, mtime=None):
+    dirname = os.path.dirname(path)
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    with open(path, "w") as file:
+        file.write(content)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_fast_copy_fallback(monkeypatch):
+    root = tempfile.mkdtemp()
+    try:
+        src = os.path.join(root, "src.ma")
+        _write(src, "maya ascii", mtime=1000000000)
+
+        calls = list()
+
+        def unsupported(name):
+            def func(src, dst):
+                calls.append(name)
+                return False
+            return func
+
+        monkeypatch.setattr(transfer, "_reflink", unsupported("reflink"))
+        monkeypatch.setattr(transfer, "_copy_file_range",
+                            unsupported("copy_file_range"))
+
+        dst = os.path.join(root, "copy2.ma")
+        assert transfer.fast_copy(src, dst) == "copy2"
+        assert calls == ["reflink", "copy_file_range"]
+
+        def copy_file_range(src, dst):
+            shutil.copyfile(src, dst)
+            return True
+
+        monkeypatch.setattr(transfer, "_copy_file_range", copy_file_range)
+        dst = os.path.join(root, "range.ma")
+        assert transfer.fast_copy(src, dst) == "copy_file_range"
+
+        for method in ("copy2", "range"):
+            dst = os.path.join(root, "%s.ma" % method)
+            with open(dst) as file:
+                assert file.read() == "maya ascii"
+            assert os.path.getmtime(dst) == os.path.getmtime(src)
+    finally:
+        shutil.rmtree(root)
+
+
+def test_file_transfer():
+    root = tempfile.mkdtemp()
+    try:
+        jobs = list()
+        for i in range(20):
+            src = os.path.join(root, "stage", "f.%04d.exr" % i)
+            dst = os.path.join(root, "publish", "v001", "f.%04d.exr" % i)
+            _write(src, "frame %d" % i, mtime=1000000000 + i)
+            jobs.append((src, dst))
+
+        engine = transfer.FileTransfer(workers=4)
+        for i, (src, dst) in enumerate(jobs):
+            method = transfer.HARDLINK if i % 2 else transfer.COPY
+            assert engine.add(src, dst, method)
+        assert not engine.add(jobs[0][0], jobs[0][1])
+        assert len(engine) == 20
+
+        report = engine.run()
+
+        assert report["files"] == 20
+        assert report["linkedFiles"] == 10
+        # Hardlinks move no data
+        assert report["bytes"] == sum(os.path.getsize(src)
+                                      for src, _ in jobs[::2])
+        assert report["linkedBytes"] == sum(os.path.getsize(src)
+                                            for src, _ in jobs[1::2])
+        for src, dst in jobs:
+            assert os.path.getmtime(dst) == os.path.getmtime(src)
+
+        # Existing hardlink is skipped, not failed
+        engine = transfer.FileTransfer()
+        engine.add(jobs[1][0], jobs[1][1], transfer.HARDLINK)
+        assert engine.run()["files"] == 0
+
+        # Errors raised after all jobs processed
+        engine = transfer.FileTransfer()
+        engine.add(os.path.join(root, "missing"), os.path.join(root, "a"))
+        engine.add(jobs[0][0], os.path.join(root, "b"))
+        try:
+            engine.run()
+        except OSError:
+            pass
+        else:
+            raise AssertionError("Missing source file not raised.")
+        assert os.path.isfile(os.path.join(root, "b"))
+    finally:
+        shutil.rmtree(root)
+
+
+def test_content_store_deduplicate():
+    root = tempfile.mkdtemp()
+    try:
+        store = transfer.ContentStore(os.path.join(root, ".store"))
+        wood = os.path.join(root, "textures", "wood.tx")
+        copy = os.path.join(root, "textures", "wood_copy.tx")
+        _write(wood, "wood", mtime=1000000000)
+        _write(copy, "wood")
+
+        assert not store.has("c4wood")
+        blob = store.add(wood, "c4wood")
+        assert store.has("c4wood")
+        assert blob == store.path_of("c4wood")
+        assert os.path.getmtime(blob) == os.path.getmtime(wood)
+
+        # Same content is stored once
+        assert store.add(copy, "c4wood") == blob
+        blobs = [name for _, _, names in os.walk(store.root)
+                 for name in names]
+        assert blobs == ["c4wood"]
+
+        v001 = os.path.join(root, "publish", "v001", "wood.tx")
+        v002 = os.path.join(root, "publish", "v002", "wood.tx")
+        store.link("c4wood", v001)
+        store.link("c4wood", v002)
+
+        for path in (v001, v002):
+            assert os.path.samefile(path, blob)
+        assert os.stat(blob).st_nlink == 3
+    finally:
+        shutil.rmtree(root)
@@ -9,6 +9,7 @@ except ImportError:
 
 import reveries
 import reveries.utils
+import reveries.doccache
 
 
 def test_stage_dir():
@@ -45,12 +46,14 @@ def test_get_timeline_data(find_one):
     # Only poject has time data
     PROJECT_DATA = (100, 999, 1, 24)
     find_one.side_effect = make_side_effect(PROJECT_DATA)
+    reveries.doccache.invalidate()
     data = reveries.utils.get_timeline_data()
     assert data == PROJECT_DATA
 
     # Asset has time data, should use asset data
     ASSET_DATA = (200, 400, 10, 30)
     find_one.side_effect = make_side_effect(PROJECT_DATA, ASSET_DATA)
+    reveries.doccache.invalidate()
     data = reveries.utils.get_timeline_data()
     assert data == ASSET_DATA
 
@@ -82,6 +85,8 @@ def test_get_resolution_data(find_one):
             }}
 
     find_one.side_effect = side_effect
+    reveries.doccache.invalidate()
+    stats = reveries.doccache.stats()
 
     # Test default value
     data = reveries.utils.get_resolution_data(asset_name="defaultShot")
@@ -91,6 +96,10 @@ def test_get_resolution_data(find_one):
     data = reveries.utils.get_resolution_data(asset_name="TestShot")
     assert data == (960, 540)
 
+    # Project document is cached
+    assert find_one.call_count == 3
+    assert reveries.doccache.stats()["hits"] == stats["hits"] + 1
+
 
 @mock.patch('pyblish_qml.ipc.formatting.format_result')
 def test_publish_results_formatting(format_result):
@@ -106,6 +115,8 @@ def test_publish_results_formatting(format_result):
     assert formatted == list(map(fake_format, results))
 
 
+@mock.patch('reveries.lib.user_cache_dir', tempfile.mkdtemp)
+@mock.patch.dict('reveries.utils._hash_cache', {"_": None, "failed": False})
 def test_hash_file():
     prefix = "test_hash"
     wdir = tempfile.mkdtemp(prefix=prefix)
@@ -122,8 +133,10 @@ ZrAkZzsWcbWtDg5oQstpDuni4Hirj75GEmTc1sFT"""
     assert hash_val == empty_file_hash_val.replace("\n", "")
 
 
+@mock.patch('reveries.lib.user_cache_dir', tempfile.mkdtemp)
+@mock.patch('reveries.plugins.PluginIndex.load', return_value=None)
 @mock.patch('pyblish.api.discover')
-def test_plugins_by_range(discover):
+def test_plugins_by_range(discover, load):
 
     def plugin_mock(order):
         Plugin = type("Plugin", (object,), dict())
@@ -140,6 +153,8 @@ def test_plugins_by_range(discover):
     assert [p.order for p in found] == [1, 1.2, 1.8, 2.2]
 
 
+@mock.patch('reveries.lib.user_cache_dir', tempfile.mkdtemp)
+@mock.patch.dict('reveries.utils._hash_cache', {"_": None, "failed": False})
 def test_asset_hasher():
 
     # Hashing non-empty file\
@@ -212,3 +227,215 @@ def test_get_representation_path_(registered_root):
 
     assert path == ("ROOT/Blockbuster/Maya/Asset/Hero/publish/"
                     "modelDefault/v005/MayaBinary")
+
+
+@mock.patch('reveries.lib.user_cache_dir', tempfile.mkdtemp)
+@mock.patch.dict('reveries.utils._hash_cache', {"_": None, "failed": False})
+def test_asset_hasher_dir_engine():
+    wdir = tempfile.mkdtemp(prefix="test_hash")
+    for sub in ("a", "a/b", "c"):
+        os.makedirs(os.path.join(wdir, sub))
+        for name in ("foo", "bar"):
+            with open(os.path.join(wdir, sub, name), "w") as f:
+                f.write(sub + name)
+
+    # Nested files are walked once, in a deterministic order
+    walked = list(reveries.utils.walk_files(wdir))
+    relpaths = [os.path.relpath(p, wdir).replace("\\", "/") for p in walked]
+    assert relpaths == ["a/bar", "a/foo",
+                        "a/b/bar", "a/b/foo",
+                        "c/bar", "c/foo"]
+
+    top = list(reveries.utils.walk_files(os.path.join(wdir, "a"),
+                                         recursive=False))
+    assert len(top) == 2
+
+    # Result does not depend on the number of workers
+    digests = set()
+    for workers in (1, 4):
+        hasher = reveries.utils.AssetHasher()
+        hasher.add_dir(wdir, workers=workers)
+        digests.add(hasher.digest())
+    assert len(digests) == 1
+
+    # Same C4 ID as hashing single file
+    hashed = reveries.utils.hash_files(walked, workers=4)
+    for path in walked:
+        assert hashed[path] == reveries.utils.hash_file(path)
+
+
+def test_hash_cache():
+    wdir = tempfile.mkdtemp(prefix="test_hash")
+    cache = reveries.utils.HashCache(path=os.path.join(wdir, "cache.db"),
+                                     max_entries=2)
+    files = list()
+    for name in ("a", "b", "c"):
+        path = os.path.join(wdir, name)
+        with open(path, "w") as f:
+            f.write(name)
+        files.append(path)
+
+    with mock.patch.dict(reveries.utils._hash_cache, {"_": cache}):
+        expected = reveries.utils.hash_file(files[0], use_cache=False)
+        assert reveries.utils.hash_file(files[0]) == expected
+        assert len(cache) == 1
+
+        # Cached value is returned while stat signature unchanged
+        with mock.patch("reveries.utils._file_digest") as file_digest:
+            assert reveries.utils.hash_file(files[0]) == expected
+            assert not file_digest.called
+
+        # Changed file is rehashed
+        with open(files[0], "w") as f:
+            f.write("changed")
+        assert reveries.utils.hash_file(files[0]) != expected
+
+        # Invalidate
+        cache.invalidate([files[0]])
+        assert len(cache) == 0
+
+        # LRU eviction
+        reveries.utils.hash_files(files)
+        assert len(cache) == 3
+        cache.evict()
+        assert len(cache) == 2
+
+
+def test_get_versions_from_sourcefile():
+    import pytest
+    mongomock = pytest.importorskip("mongomock")
+
+    collection = mongomock.MongoClient().db.project
+    source = "{root}/Proj/Avalon/Work/Char/boy/scenes/Boy_v01.ma"
+
+    def insert(parent, name, key=True):
+        data = {"source": source}
+        if key:
+            data["sourceKey"] = reveries.utils.source_key(source, "Proj")
+        return collection.insert_one({"type": "version",
+                                      "parent": parent,
+                                      "name": name,
+                                      "data": data}).inserted_id
+
+    insert("subsetA", 1)
+    latest_a = insert("subsetA", 2)
+    latest_b = insert("subsetB", 1, key=False)  # Not migrated
+
+    query = "Q:\\Proj\\Avalon\\work\\char\\Boy\\scenes\\boy_v01.ma"
+
+    with mock.patch("avalon.io.find", collection.find), \
+            mock.patch("reveries.lib.project_collection",
+                       return_value=collection):
+        versions = reveries.utils.get_versions_from_sourcefile(query,
+                                                               "Proj")
+        assert sorted(v["_id"] for v in versions) == sorted([latest_a,
+                                                             latest_b])
+
+        assert reveries.utils.backfill_source_keys(collection, "Proj") == 1
+        assert collection.count_documents(
+            {"data.sourceKey": "avalon/work/char/boy/scenes/boy_v01.ma"}
+        ) == 3
+
+    # Version without source can not be migrated, no more regex scan
+    collection.insert_one({"type": "version", "parent": "subsetC",
+                           "name": 1, "data": {}})
+    with mock.patch("avalon.io.find") as find, \
+            mock.patch("reveries.lib.project_collection",
+                       return_value=collection):
+        versions = reveries.utils.get_versions_from_sourcefile(query,
+                                                               "Proj")
+        assert len(list(versions)) == 2
+        assert not find.called
+
+    index = dict(reveries.utils.SOURCE_KEY_INDEX)
+    assert any(dict(info["key"]) == index
+               for info in collection.index_information().values())
+
+
+def test_asset_graber_resume():
+    import shutil
+    import pytest
+    mongomock = pytest.importorskip("mongomock")
+    from bson import ObjectId
+
+    client = mongomock.MongoClient()
+    this, that = client.db.this, client.db.that
+    root = tempfile.mkdtemp()
+
+    def insert(collection, doc):
+        doc.setdefault("data", {})
+        return collection.insert_one(doc).inserted_id
+
+    project = insert(this, {"type": "project", "name": "this"})
+    insert(that, {"type": "project", "name": "that"})
+    asset = insert(this, {"type": "asset", "name": "boy", "parent": project})
+
+    # Model <- Rig <- Look, each version depends on previous one
+    representations = list()
+    dependencies = {}
+    for name in ("model", "rig", "look"):
+        subset = insert(this, {"type": "subset", "name": name,
+                               "parent": asset})
+        version = insert(this, {"type": "version", "name": 1,
+                                "parent": subset,
+                                "data": {"dependencies": dependencies}})
+        representations.append(insert(this, {"type": "representation",
+                                             "name": "mayaBinary",
+                                             "parent": version}))
+        dependencies = {str(version): {"count": 1}}
+
+    for _id in representations:
+        package = os.path.join(root, "this", str(_id))
+        os.makedirs(package)
+        with open(os.path.join(package, "scene.mb"), "w") as file:
+            file.write(str(_id))
+
+    def path_of(representation, parents):
+        return os.path.join(root, parents[-1]["name"],
+                            str(representation["_id"]))
+
+    copy_dir = reveries.utils.AssetGraber._copy_dir
+    interrupt = {representations[0]}
+
+    def interruptible_copy_dir(graber, src, dst):
+        if ObjectId(os.path.basename(src)) in interrupt:
+            raise OSError("Interrupted")
+        return copy_dir(graber, src, dst)
+
+    def graber():
+        graber = reveries.utils.AssetGraber(
+            "that", workers=2, journal=os.path.join(root, "grab.journal"))
+        graber._collection = that
+        graber.that_project = that.find_one({"type": "project"})
+        graber._connected = True
+        return graber
+
+    try:
+        with mock.patch("avalon.io.find", this.find), \
+                mock.patch("avalon.io.find_one", this.find_one), \
+                mock.patch("avalon.io.ObjectId", ObjectId), \
+                mock.patch("reveries.utils.get_representation_path_",
+                           path_of), \
+                mock.patch("reveries.utils.message_box_error"), \
+                mock.patch.object(reveries.utils.AssetGraber, "_copy_dir",
+                                  interruptible_copy_dir):
+
+            with pytest.raises(OSError):
+                graber().grab(representations[-1])
+
+            # Nothing registered before all packages copied
+            assert that.count_documents({"type": "representation"}) == 0
+            assert not os.path.isdir(os.path.join(
+                root, "that", str(representations[0])))
+
+            interrupt.clear()
+            graber().grab(representations[-1])
+
+        for _id in representations:
+            assert that.find_one({"_id": _id}) is not None
+            copied = os.path.join(root, "that", str(_id), "scene.mb")
+            with open(copied) as file:
+                assert file.read() == str(_id)
+        assert not os.path.exists(os.path.join(root, "grab.journal"))
+    finally:
+        shutil.rmtree(root)
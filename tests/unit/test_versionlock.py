@@ -0,0 +1,59 @@
+
+import os
+import json
+import time
+import shutil
+import tempfile
+import multiprocessing.pool
+
+from reveries import versionlock
+
+
+def test_acquire_concurrently():
+    root = tempfile.mkdtemp()
+    try:
+        lockfile = os.path.join(root, "v001", versionlock.LOCK)
+
+        def acquire(user):
+            return versionlock.acquire(lockfile, user)
+
+        pool = multiprocessing.pool.ThreadPool(8)
+        tokens = pool.map(acquire, ["user%d" % i for i in range(16)])
+        pool.close()
+        pool.join()
+
+        tokens = [t for t in tokens if t is not None]
+        assert len(tokens) == 1
+        assert versionlock.read(lockfile)["token"] == tokens[0]
+
+        assert not versionlock.release(lockfile, "other")
+        assert versionlock.release(lockfile, tokens[0])
+        assert not os.path.exists(lockfile)
+    finally:
+        shutil.rmtree(root)
+
+
+def test_stale_lock_and_locked_versions():
+    root = tempfile.mkdtemp()
+    try:
+        template = os.path.join(root, "{subset}", "v{version:0>3}")
+        data = {"subset": "modelDefault"}
+
+        for version, age in [(1, 0), (2, versionlock.EXPIRY + 1)]:
+            lockfile = os.path.join(template.format(version=version, **data),
+                                    versionlock.LOCK)
+            os.makedirs(os.path.dirname(lockfile))
+            with open(lockfile, "w") as file:
+                json.dump({"user": "other",
+                           "token": "t%d" % version,
+                           "time": time.time() - age}, file)
+
+        locked = versionlock.locked_versions(template, data, "me")
+        assert locked == [1]
+
+        stale = os.path.join(template.format(version=2, **data),
+                             versionlock.LOCK)
+        assert versionlock.acquire(stale, "me") is not None
+        assert versionlock.read(stale)["user"] == "me"
+    finally:
+        shutil.rmtree(root)
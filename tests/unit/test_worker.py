@@ -0,0 +1,157 @@
+
+import os
+import time
+import runpy
+import logging
+import shutil
+import tempfile
+import multiprocessing.pool
+
+from reveries import PLUGINS_DIR
+from reveries.filesys import worker
+
+
+def _worker(dump_file):
+    publish_worker = worker.PublishWorker(dump_file)
+    publish_worker.token = worker.create_lock(publish_worker.lock) or "w2"
+    return publish_worker
+
+
+def test_enqueue_take_result():
+    root = tempfile.mkdtemp()
+    try:
+        dump_file = os.path.join(root, "publish.dump")
+        queue = worker.queue_dir(dump_file)
+
+        task_files = [worker.enqueue(queue, 1, ["f.%04d.exr" % i])
+                      for i in range(20)]
+
+        workers = [_worker(dump_file), _worker(dump_file)]
+        pool = multiprocessing.pool.ThreadPool(2)
+        taken = pool.map(lambda w: w.take(), workers)
+        pool.close()
+        pool.join()
+
+        # Each task is claimed by one worker only
+        claimed = [task for tasks in taken for task in tasks]
+        assert len(claimed) == len(task_files)
+        assert sum(task["progress"] for _, task in claimed) == 20
+        assert workers[0].take() == []
+
+        for publish_worker, tasks in zip(workers, taken):
+            publish_worker.done(tasks, 0, "published")
+
+        for task_file in task_files:
+            result = worker.read_json(worker.result_path(task_file))
+            assert result == {"returncode": 0, "log": "published"}
+
+        names = os.listdir(queue)
+        assert not [name for name in names if worker.TAKEN in name]
+        assert workers[1].take(orphans=True) == []
+    finally:
+        shutil.rmtree(root)
+
+
+def test_orphan_tasks_reclaimed():
+    root = tempfile.mkdtemp()
+    try:
+        dump_file = os.path.join(root, "publish.dump")
+        queue = worker.queue_dir(dump_file)
+        task_file = worker.enqueue(queue, 3, ["f.0001.exr"])
+
+        dead = _worker(dump_file)
+        assert len(dead.take()) == 1  # Then crashed
+
+        alive = worker.PublishWorker(dump_file, token="alive")
+        assert alive.take() == []
+        tasks = alive.take(orphans=True)
+        assert [task for _, task in tasks] == [{"progress": 3,
+                                                "files": ["f.0001.exr"]}]
+
+        alive.done(tasks, 0, "")
+        assert os.path.isfile(worker.result_path(task_file))
+    finally:
+        shutil.rmtree(root)
+
+
+def test_lock_takeover():
+    root = tempfile.mkdtemp()
+    try:
+        lock = os.path.join(root, worker.LOCK)
+        token = worker.create_lock(lock)
+        assert token is not None
+        assert worker.create_lock(lock) is None
+
+        publish_worker = worker.PublishWorker(os.path.join(root, "dump"))
+        publish_worker.lock = lock
+        publish_worker.token = token
+
+        watches = [worker.LockWatch(lock, stale=0.2) for _ in range(8)]
+        assert [watch.acquire() for watch in watches] == [None] * 8
+
+        # Worker keeps beating, never stale
+        for _ in range(3):
+            time.sleep(0.1)
+            assert publish_worker.beat()
+            assert [watch.acquire() for watch in watches] == [None] * 8
+
+        # Worker stopped beating, only one waiter takes it over
+        time.sleep(0.3)
+        pool = multiprocessing.pool.ThreadPool(8)
+        tokens = pool.map(lambda watch: watch.acquire(), watches)
+        pool.close()
+        pool.join()
+
+        tokens = [t for t in tokens if t is not None]
+        assert len(tokens) == 1
+        assert worker.read_lock(lock)["token"] == tokens[0]
+
+        # Old worker finds out and stop serving
+        assert not publish_worker.beat()
+        assert not worker.release_lock(lock, token)
+        assert worker.release_lock(lock, tokens[0])
+    finally:
+        shutil.rmtree(root)
+
+
+def test_batched_progress_counted_per_task():
+    path = os.path.join(PLUGINS_DIR, "filesys", "publish",
+                        "remove_outdated_progress.py")
+    plugin = runpy.run_path(path)["RemoveOutdatedProgress"]()
+    plugin.log = logging.getLogger("RemoveOutdatedProgress")
+
+    root = tempfile.mkdtemp()
+    try:
+        stage = os.path.join(root, "stage").replace("\\", "/")
+        publish = os.path.join(root, "publish", "exr").replace("\\", "/")
+        os.makedirs(publish)
+        # Frame 1 was published then re-rendered
+        open(os.path.join(publish, "f.0001.exr"), "w").close()
+
+        tasks = [
+            {"progress": 1, "files": [stage + "/f.0001.exr"]},
+            {"progress": 2, "files": [stage + "/f.0002.exr",
+                                      stage + "/f.0003.exr"]},
+            # Requeued, same outputs
+            {"progress": 2, "files": [stage + "/f.0002.exr",
+                                      stage + "/f.0003.exr"]},
+            {"progress": 1, "files": [stage + "/f.0004.exr"]},
+        ]
+
+        class Instance(object):
+            data = {
+                "publishPathTemplate": root + "/publish/{representation}",
+                "publishPathTemplateData": {},
+                "repr.exr._stage": stage,
+                "_progressiveStep": 6,
+                "_progressiveOutput": [file for task in tasks
+                                       for file in task["files"]],
+                "_progressiveTasks": tasks,
+            }
+
+        plugin.process(Instance)
+
+        assert Instance.data["_progressiveStep"] == 3
+        assert os.listdir(publish) == []
+    finally:
+        shutil.rmtree(root)